@@ -36,7 +36,8 @@ options:
   name:
     description:
       - Name of the table.
-    required: true
+      - Required unless I(tables) is given.
+    required: false
   hash_key_name:
     description:
       - Name of the hash key.
@@ -79,6 +80,40 @@ options:
     required: false
     default: []
     version_added: "2.1"
+  tables:
+    description:
+      - List of tables to manage in one task, instead of I(name). Each item is a dictionary of table options
+        (C(name), C(state), C(hash_key_name), C(hash_key_type), C(range_key_name), C(range_key_type),
+        C(read_capacity), C(write_capacity), C(indexes)); options not given default to the module options.
+      - All tables are described concurrently once and only the tables which differ are created, updated or deleted.
+    required: false
+    default: null
+    version_added: "2.2"
+  concurrency:
+    description:
+      - Maximum number of API calls to make at the same time.
+    required: false
+    default: 4
+    version_added: "2.2"
+  max_concurrent_updates:
+    description:
+      - Maximum number of tables being created, updated or deleted at the same time. DynamoDB limits the number of
+        tables of an account in the CREATING, UPDATING or DELETING state; further changes wait for a table to settle.
+    required: false
+    default: 10
+    version_added: "2.2"
+  wait:
+    description:
+      - Wait until the created or updated tables and their global indexes are ACTIVE and deleted tables are gone.
+    required: false
+    default: false
+    version_added: "2.2"
+  wait_timeout:
+    description:
+      - How long to wait, in seconds, for tables to settle.
+    required: false
+    default: 600
+    version_added: "2.2"
 extends_documentation_fragment:
     - aws
     - ec2
@@ -123,6 +158,24 @@ EXAMPLES = '''
     name: my-table
     region: us-east-1
     state: absent
+
+# Provision several tables and wait until they are all ACTIVE
+- dynamodb_table:
+    region: us-east-1
+    hash_key_name: id
+    read_capacity: 5
+    write_capacity: 5
+    wait: yes
+    tables:
+      - name: users
+      - name: sessions
+        read_capacity: 50
+        write_capacity: 50
+      - name: events
+        range_key_name: create_time
+        range_key_type: NUMBER
+      - name: old-table
+        state: absent
 '''
 
 RETURN = '''
@@ -131,6 +184,11 @@ table_status:
     returned: success
     type: string
     sample: ACTIVE
+tables:
+    description: With tables, the result of each table, with table_name, state, changed and table_status.
+    returned: when tables is given
+    type: list
+    sample: [{"table_name": "users", "state": "present", "changed": true, "table_status": "ACTIVE"}]
 '''
 
 try:
@@ -152,107 +210,263 @@ try:
 except ImportError:
     HAS_BOTO = False
 
+import random
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
 DYNAMO_TYPE_DEFAULT = 'STRING'
 INDEX_REQUIRED_OPTIONS = ['name', 'type', 'hash_key_name']
 INDEX_OPTIONS = INDEX_REQUIRED_OPTIONS + ['hash_key_type', 'range_key_name', 'range_key_type', 'includes', 'read_capacity', 'write_capacity']
 INDEX_TYPE_OPTIONS = ['all', 'global_all', 'global_include', 'global_keys_only', 'include', 'keys_only']
 
 
-def create_or_update_dynamo_table(connection, module):
-    table_name = module.params.get('name')
-    hash_key_name = module.params.get('hash_key_name')
-    hash_key_type = module.params.get('hash_key_type')
-    range_key_name = module.params.get('range_key_name')
-    range_key_type = module.params.get('range_key_type')
-    read_capacity = module.params.get('read_capacity')
-    write_capacity = module.params.get('write_capacity')
-    all_indexes = module.params.get('indexes')
+TABLE_OPTIONS = ['name', 'state', 'hash_key_name', 'hash_key_type', 'range_key_name', 'range_key_type',
+                 'read_capacity', 'write_capacity', 'indexes']
 
-    for index in all_indexes:
-        validate_index(index, module)
 
-    schema = get_schema_param(hash_key_name, hash_key_type, range_key_name, range_key_type)
+def run_concurrently(get_connection, func, items, concurrency):
+    """
+    Calls func(connection, item) for every item on a thread pool and returns
+    (result, error) tuples in the order of the items.
+    """
+    def run(item):
+        try:
+            return func(get_connection(), item), None
+        except (BotoServerError, AnsibleAWSError, NoAuthHandlerFound):
+            return None, traceback.format_exc()
 
-    throughput = {
-        'read': read_capacity,
-        'write': write_capacity
-    }
+    if len(items) <= 1 or concurrency <= 1:
+        return [run(item) for item in items]
 
-    indexes, global_indexes = get_indexes(all_indexes)
+    pool = ThreadPool(min(concurrency, len(items)))
+    try:
+        return pool.map(run, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def get_table_specs(module):
+    # In tables mode the module options are the defaults of every table
+    defaults = dict((option, module.params.get(option)) for option in TABLE_OPTIONS)
+    if not module.params.get('tables'):
+        return [defaults]
+
+    specs = []
+    for table in module.params.get('tables'):
+        for key in table:
+            if key not in TABLE_OPTIONS:
+                module.fail_json(msg='%s is not a valid option for a table' % key)
+        if 'name' not in table:
+            module.fail_json(msg='name is a required option for a table')
+        spec = dict(defaults)
+        spec.update(table)
+        specs.append(spec)
+    return specs
+
+
+def validate_table_spec(spec, module):
+    if spec['state'] == 'present':
+        if not spec['hash_key_name']:
+            module.fail_json(msg='hash_key_name is required to create table %s' % spec['name'])
+        for index in spec['indexes']:
+            validate_index(index, module)
+
+
+def describe_table(connection, table_name):
+    # A single describe call populates the table; returns the table and its
+    # description, or (None, None) if the table does not exist
+    table = Table(table_name, connection=connection)
+    try:
+        description = table.describe()
+    except JSONResponseError, e:
+        if e.message and e.message.startswith('Requested resource not found'):
+            return None, None
+        raise e
+    return table, description
 
-    result = dict(
-        region=module.params.get('region'),
-        table_name=table_name,
-        hash_key_name=hash_key_name,
-        hash_key_type=hash_key_type,
-        range_key_name=range_key_name,
-        range_key_type=range_key_type,
-        read_capacity=read_capacity,
-        write_capacity=write_capacity,
-        indexes=all_indexes,
-    )
 
-    try:
-        table = Table(table_name, connection=connection)
+def describe_tables(get_connection, module, table_names):
+    outcomes = run_concurrently(get_connection, describe_table, table_names, module.params.get('concurrency'))
+    snapshots = dict()
+    for table_name, (snapshot, error) in zip(table_names, outcomes):
+        if error:
+            module.fail_json(msg='Failed to describe dynamo table %s due to error: %s' % (table_name, error))
+        snapshots[table_name] = snapshot
+    return snapshots
 
 
-        if dynamo_table_exists(table):
-            result['changed'] = update_dynamo_table(table, throughput=throughput, check_mode=module.check_mode, global_indexes=global_indexes)
-        else:
-            if not module.check_mode:
-                Table.create(table_name, connection=connection, schema=schema, throughput=throughput, indexes=indexes, global_indexes=global_indexes)
-            result['changed'] = True
+def get_table_status(description):
+    if description is None:
+        return None
+    return description['Table']['TableStatus']
 
-        if not module.check_mode:
-            result['table_status'] = table.describe()['Table']['TableStatus']
 
-    except BotoServerError:
-        result['msg'] = 'Failed to create/update dynamo table due to error: ' + traceback.format_exc()
-        module.fail_json(**result)
-    else:
-        module.exit_json(**result)
+def is_table_settled(spec, table, description):
+    if spec['state'] == 'absent':
+        return table is None
+    if table is None:
+        return False
+    return get_table_status(description) == 'ACTIVE' and \
+        all(index.get('IndexStatus', 'ACTIVE') == 'ACTIVE'
+            for index in description['Table'].get('GlobalSecondaryIndexes', []))
+
+
+def get_table_params(spec):
+    schema = get_schema_param(spec['hash_key_name'], spec['hash_key_type'], spec['range_key_name'], spec['range_key_type'])
+    throughput = {
+        'read': spec['read_capacity'],
+        'write': spec['write_capacity']
+    }
+    indexes, global_indexes = get_indexes(spec['indexes'])
+    return schema, throughput, indexes, global_indexes
+
+
+def table_needs_change(spec, table):
+    # Computed from the describe snapshot only, no further API calls
+    if spec['state'] == 'absent':
+        return table is not None
+    if table is None:
+        return True
 
+    schema, throughput, indexes, global_indexes = get_table_params(spec)
+    removed_indexes, added_indexes, index_throughput_changes = get_changed_global_indexes(table, global_indexes)
+    return has_throughput_changed(table, throughput) or \
+        bool(removed_indexes or added_indexes or index_throughput_changes)
+
+
+def apply_table_changes(connection, spec, table):
+    if spec['state'] == 'absent':
+        table.connection = connection
+        return table.delete()
+
+    schema, throughput, indexes, global_indexes = get_table_params(spec)
+    if table is None:
+        Table.create(spec['name'], connection=connection, schema=schema, throughput=throughput, indexes=indexes, global_indexes=global_indexes)
+        return True
 
-def delete_dynamo_table(connection, module):
-    table_name = module.params.get('name')
+    table.connection = connection
+    return update_dynamo_table(table, throughput=throughput, global_indexes=global_indexes)
+
+
+def ensure_tables(get_connection, module, specs):
+    """
+    Describes all tables once, then creates, updates or deletes those which
+    differ, keeping at most max_concurrent_updates tables in a transitional
+    state at a time. A single backoff loop polls the tables in flight until
+    they settle, when waiting or when more changes are queued than allowed.
+    """
+    concurrency = module.params.get('concurrency')
+    max_updates = module.params.get('max_concurrent_updates')
+    wait = module.params.get('wait')
+    wait_timeout = module.params.get('wait_timeout')
+
+    snapshots = describe_tables(get_connection, module, [spec['name'] for spec in specs])
+    results = dict()
+    for spec in specs:
+        table, description = snapshots[spec['name']]
+        results[spec['name']] = dict(changed=table_needs_change(spec, table))
+        if spec['state'] == 'present':
+            results[spec['name']]['table_status'] = get_table_status(description)
+
+    pending = [spec for spec in specs if results[spec['name']]['changed']]
+    if module.check_mode:
+        return results
+
+    in_flight = []
+    deadline = time.time() + wait_timeout
+    delay = 1
+    while pending or in_flight:
+        slots = max(max_updates - len(in_flight), 0)
+        batch, pending = pending[:slots], pending[slots:]
+        outcomes = run_concurrently(get_connection, lambda connection, spec: apply_table_changes(connection, spec, snapshots[spec['name']][0]),
+                                    batch, concurrency)
+        for spec, (changed, error) in zip(batch, outcomes):
+            if error:
+                module.fail_json(msg='Failed to update dynamo table %s due to error: %s' % (spec['name'], error),
+                                 tables=results)
+            results[spec['name']]['changed'] = bool(changed)
+            in_flight.append(spec)
+
+        if not pending and not wait:
+            break
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            module.fail_json(msg='Timed out waiting for dynamo tables %s' %
+                             ', '.join(spec['name'] for spec in in_flight + pending), tables=results)
+        time.sleep(min(delay + random.uniform(0, delay), remaining))
+        delay = min(delay * 2, 20)
+
+        polled = describe_tables(get_connection, module, [spec['name'] for spec in in_flight])
+        settled = []
+        for spec in in_flight:
+            table, description = polled[spec['name']]
+            if spec['state'] == 'present':
+                results[spec['name']]['table_status'] = get_table_status(description)
+            if is_table_settled(spec, table, description):
+                settled.append(spec)
+        in_flight = [spec for spec in in_flight if spec not in settled]
+
+    # report the status the tables we did not wait for have moved to
+    unsettled = [spec['name'] for spec in in_flight if spec['state'] == 'present']
+    if unsettled:
+        polled = describe_tables(get_connection, module, unsettled)
+        for table_name in unsettled:
+            results[table_name]['table_status'] = get_table_status(polled[table_name][1])
+
+    return results
+
+
+def create_or_update_dynamo_table(get_connection, module):
+    spec = get_table_specs(module)[0]
 
     result = dict(
         region=module.params.get('region'),
-        table_name=table_name,
+        table_name=spec['name'],
+        hash_key_name=spec['hash_key_name'],
+        hash_key_type=spec['hash_key_type'],
+        range_key_name=spec['range_key_name'],
+        range_key_type=spec['range_key_type'],
+        read_capacity=spec['read_capacity'],
+        write_capacity=spec['write_capacity'],
+        indexes=spec['indexes'],
     )
 
-    try:
-        table = Table(table_name, connection=connection)
+    result.update(ensure_tables(get_connection, module, [spec])[spec['name']])
+    if module.check_mode:
+        result.pop('table_status', None)
+    module.exit_json(**result)
 
-        if dynamo_table_exists(table):
-            if not module.check_mode:
-                table.delete()
-            result['changed'] = True
 
-        else:
-            result['changed'] = False
+def delete_dynamo_table(get_connection, module):
+    spec = get_table_specs(module)[0]
 
-    except BotoServerError:
-        result['msg'] = 'Failed to delete dynamo table due to error: ' + traceback.format_exc()
-        module.fail_json(**result)
-    else:
-        module.exit_json(**result)
+    result = dict(
+        region=module.params.get('region'),
+        table_name=spec['name'],
+    )
 
+    result.update(ensure_tables(get_connection, module, [spec])[spec['name']])
+    module.exit_json(**result)
 
-def dynamo_table_exists(table):
-    try:
-        table.describe()
-        return True
 
-    except JSONResponseError, e:
-        if e.message and e.message.startswith('Requested resource not found'):
-            return False
-        else:
-            raise e
+def ensure_dynamo_tables(get_connection, module):
+    specs = get_table_specs(module)
+    results = ensure_tables(get_connection, module, specs)
+
+    tables = []
+    for spec in specs:
+        table_result = dict(table_name=spec['name'], state=spec['state'])
+        table_result.update(results[spec['name']])
+        tables.append(table_result)
+
+    module.exit_json(changed=any(table['changed'] for table in tables), region=module.params.get('region'), tables=tables)
 
 
 def update_dynamo_table(table, throughput=None, check_mode=False, global_indexes=None):
-    table.describe()  # populate table details
+    # table must have been populated by describe()
     throughput_changed = False
     global_indexes_changed = False
     if has_throughput_changed(table, throughput):
@@ -311,8 +525,6 @@ def get_schema_param(hash_key_name, hash_key_type, range_key_name, range_key_typ
 
 
 def get_changed_global_indexes(table, global_indexes):
-    table.describe()
-
     table_index_info = dict((index.name, index.schema()) for index in table.global_indexes)
     table_index_objects = dict((index.name, index) for index in table.global_indexes)
     set_index_info = dict((index.name, index.schema()) for index in global_indexes)
@@ -375,19 +587,26 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(dict(
         state=dict(default='present', choices=['present', 'absent']),
-        name=dict(required=True, type='str'),
-        hash_key_name=dict(required=True, type='str'),
+        name=dict(type='str'),
+        tables=dict(type='list'),
+        hash_key_name=dict(type='str'),
         hash_key_type=dict(default='STRING', type='str', choices=['STRING', 'NUMBER', 'BINARY']),
         range_key_name=dict(type='str'),
         range_key_type=dict(default='STRING', type='str', choices=['STRING', 'NUMBER', 'BINARY']),
         read_capacity=dict(default=1, type='int'),
         write_capacity=dict(default=1, type='int'),
         indexes=dict(default=[], type='list'),
+        concurrency=dict(default=4, type='int'),
+        max_concurrent_updates=dict(default=10, type='int'),
+        wait=dict(default=False, type='bool'),
+        wait_timeout=dict(default=600, type='int'),
     ))
 
     module = AnsibleModule(
         argument_spec=argument_spec,
-        supports_check_mode=True)
+        supports_check_mode=True,
+        required_one_of=[['name', 'tables']],
+        mutually_exclusive=[['name', 'tables']])
 
     if not HAS_BOTO:
         module.fail_json(msg='boto required for this module')
@@ -396,16 +615,32 @@ def main():
     if not region:
         module.fail_json(msg='region must be specified')
 
+    # every thread of the pool opens its own connection
+    threads = threading.local()
+
+    def get_connection():
+        if not hasattr(threads, 'connection'):
+            threads.connection = connect_to_aws(boto.dynamodb2, region, **aws_connect_params)
+        return threads.connection
+
     try:
-        connection = connect_to_aws(boto.dynamodb2, region, **aws_connect_params)
+        get_connection()
     except (NoAuthHandlerFound, AnsibleAWSError), e:
         module.fail_json(msg=str(e))
 
+    if module.params.get('max_concurrent_updates') < 1:
+        module.fail_json(msg='max_concurrent_updates must be at least 1')
+
+    for spec in get_table_specs(module):
+        validate_table_spec(spec, module)
+
     state = module.params.get('state')
-    if state == 'present':
-        create_or_update_dynamo_table(connection, module)
+    if module.params.get('tables'):
+        ensure_dynamo_tables(get_connection, module)
+    elif state == 'present':
+        create_or_update_dynamo_table(get_connection, module)
     elif state == 'absent':
-        delete_dynamo_table(connection, module)
+        delete_dynamo_table(get_connection, module)
 
 
 # import module snippets
@@ -56,6 +56,20 @@ options:
       - a hash/dictionary of tags to add to the new copied AMI; '{"key":"value"}' and '{"key":"value","key":"value"}'
     required: false
     default: null
+  dest_regions:
+    description:
+      - a list of regions to copy the AMI to, instead of the region of the connection. All the copies are
+        started at once and tracked together; each copy is tagged as soon as it is ready. The image id, state
+        and the number of seconds each copy took are returned per region in C(images).
+    required: false
+    default: null
+    version_added: "2.2"
+  concurrency:
+    description:
+      - the maximum number of regions to send API calls to at the same time with dest_regions
+    required: false
+    default: 10
+    version_added: "2.2"
 
 author: Amir Moulavi <amir.moulavi@gmail.com>
 extends_documentation_fragment:
@@ -75,11 +89,30 @@ EXAMPLES = '''
     tags: '{"Name":"SuperService-new-AMI", "type":"SuperService"}'
     wait: yes
   register: image_id
+
+# Push a golden image to several regions at once
+- local_action:
+    module: ec2_ami_copy
+    source_region: eu-west-1
+    source_image_id: ami-xxxxxxx
+    name: SuperService-new-AMI
+    dest_regions:
+      - us-east-1
+      - us-west-2
+      - ap-southeast-1
+      - ap-northeast-1
+    tags:
+      Name: SuperService-new-AMI
+    wait: yes
+    wait_timeout: 3600
+  register: copies
 '''
 
 
+import random
 import sys
 import time
+from multiprocessing.pool import ThreadPool
 
 try:
     import boto
@@ -89,12 +122,12 @@ try:
 except ImportError:
     HAS_BOTO = False
 
-def copy_image(module, ec2):
+def copy_image(module, connections):
     """
-    Copies an AMI
+    Copies an AMI to one or more regions
 
     module : AnsibleModule object
-    ec2: authenticated ec2 connection object
+    connections: dict of destination region to authenticated ec2 connection object
     """
 
     source_region = module.params.get('source_region')
@@ -104,25 +137,104 @@ def copy_image(module, ec2):
     tags = module.params.get('tags')
     wait_timeout = int(module.params.get('wait_timeout'))
     wait = module.params.get('wait')
+    concurrency = module.params.get('concurrency')
+
+    params = {'source_region': source_region,
+              'source_image_id': source_image_id,
+              'name': name,
+              'description': description
+    }
+
+    def start_copy(region):
+        try:
+            return connections[region].copy_image(**params).image_id, None
+        except boto.exception.BotoServerError, e:
+            return None, "%s: %s" % (e.error_code, e.error_message)
+
+    # Start all the copies at once, the copies then run side by side in EC2
+    regions = sorted(connections)
+    started = time.time()
+    copies = dict()
+    errors = []
+    for region, (image_id, error) in zip(regions, run_concurrently(start_copy, regions, concurrency)):
+        if error:
+            errors.append(error if len(regions) == 1 else "%s: %s" % (region, error))
+        else:
+            copies[region] = image_id
+    if errors:
+        module.fail_json(msg="; ".join(errors), image_ids=copies, changed=bool(copies))
+
+    images = track_copies(module, connections, copies, started, wait, wait_timeout, tags, concurrency)
 
+    if not module.params.get('dest_regions'):
+        image = images[regions[0]]
+        module.exit_json(msg="AMI copy operation complete", image_id=image['image_id'], state=image['state'], changed=True)
+
+    module.exit_json(msg="AMI copy operation complete", images=images, changed=True)
+
+
+def run_concurrently(func, items, concurrency):
+    if len(items) <= 1 or concurrency <= 1:
+        return [func(item) for item in items]
+
+    pool = ThreadPool(min(concurrency, len(items)))
     try:
-        params = {'source_region': source_region,
-                  'source_image_id': source_image_id,
-                  'name': name,
-                  'description': description
-        }
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
 
-        image_id = ec2.copy_image(**params).image_id
-    except boto.exception.BotoServerError, e:
-        module.fail_json(msg="%s: %s" % (e.error_code, e.error_message))
 
-    img = wait_until_image_is_recognized(module, ec2, wait_timeout, image_id, wait)
+# get the image, or None while the copy is not yet recognized by EC2
+def get_copied_image(ec2, image_id):
+    try:
+        return ec2.get_image(image_id), None
+    except boto.exception.EC2ResponseError, e:
+        # This exception we expect initially right after registering the copy with EC2 API
+        if 'InvalidAMIID.NotFound' in e.error_code:
+            return None, None
+        return None, str(e)
 
-    img = wait_until_image_is_copied(module, ec2, wait_timeout, img, image_id, wait)
 
-    register_tags_if_any(module, ec2, tags, image_id)
+def track_copies(module, connections, copies, started, wait, wait_timeout, tags, concurrency):
+    """
+    Polls all the copies in one loop, backing off exponentially with jitter,
+    until each image is available (or, without wait, recognized by EC2).
+    Each image is tagged as soon as it is ready. Returns the image id, state
+    and the seconds the copy took, per region.
+    """
 
-    module.exit_json(msg="AMI copy operation complete", image_id=image_id, state=img.state, changed=True)
+    deadline = time.time() + wait_timeout
+    pending = sorted(copies)
+    images = dict()
+    delay = 1
+    while pending:
+        polled = run_concurrently(lambda region: get_copied_image(connections[region], copies[region]),
+                                  pending, concurrency)
+        still_pending = []
+        for region, (img, error) in zip(pending, polled):
+            if error:
+                # On any other exception we should fail
+                module.fail_json(
+                    msg="Error while trying to find the new image in %s. Using wait=yes and/or a longer wait_timeout may help: %s" % (region, error),
+                    images=images, changed=True)
+            if img is None or (wait and img.state != 'available'):
+                still_pending.append(region)
+                continue
+            register_tags_if_any(module, connections[region], tags, copies[region])
+            images[region] = dict(image_id=copies[region], state=img.state, seconds=int(time.time() - started))
+        pending = still_pending
+
+        if pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                # waiting took too long
+                module.fail_json(msg="timed out waiting for image to be copied to %s" % ", ".join(pending),
+                                 images=images, changed=True)
+            time.sleep(min(delay + random.uniform(0, delay), remaining))
+            delay = min(delay * 2, 30)
+
+    return images
 
 
 # register tags to the copied AMI in dest_region
@@ -134,36 +246,6 @@ def register_tags_if_any(module, ec2, tags, image_id):
             module.fail_json(msg=str(e))
 
 
-# wait here until the image is copied (i.e. the state becomes available
-def wait_until_image_is_copied(module, ec2, wait_timeout, img, image_id, wait):
-    wait_timeout = time.time() + wait_timeout
-    while wait and wait_timeout > time.time() and (img is None or img.state != 'available'):
-        img = ec2.get_image(image_id)
-        time.sleep(3)
-    if wait and wait_timeout <= time.time():
-        # waiting took too long
-        module.fail_json(msg="timed out waiting for image to be copied")
-    return img
-
-
-# wait until the image is recognized.
-def wait_until_image_is_recognized(module, ec2, wait_timeout, image_id, wait):
-    for i in range(wait_timeout):
-        try:
-            return ec2.get_image(image_id)
-        except boto.exception.EC2ResponseError, e:
-            # This exception we expect initially right after registering the copy with EC2 API
-            if 'InvalidAMIID.NotFound' in e.error_code and wait:
-                time.sleep(1)
-            else:
-                # On any other exception we should fail
-                module.fail_json(
-                    msg="Error while trying to find the new image. Using wait=yes and/or a longer wait_timeout may help: " + str(
-                        e))
-    else:
-        module.fail_json(msg="timed out waiting for image to be recognized")
-
-
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(dict(
@@ -173,7 +255,9 @@ def main():
         description=dict(default=""),
         wait=dict(type='bool', default=False),
         wait_timeout=dict(default=1200),
-        tags=dict(type='dict')))
+        tags=dict(type='dict'),
+        dest_regions=dict(type='list'),
+        concurrency=dict(type='int', default=10)))
 
     module = AnsibleModule(argument_spec=argument_spec)
 
@@ -194,7 +278,16 @@ def main():
     if not region:        
         module.fail_json(msg="region must be specified")
 
-    copy_image(module, ec2)
+    connections = {region: ec2}
+    if module.params.get('dest_regions'):
+        connections = dict()
+        for dest_region in module.params.get('dest_regions'):
+            try:
+                connections[dest_region] = connect_to_aws(boto.ec2, dest_region, **boto_params)
+            except (boto.exception.NoAuthHandlerFound, AnsibleAWSError), e:
+                module.fail_json(msg=str(e))
+
+    copy_image(module, connections)
 
 
 # import module snippets
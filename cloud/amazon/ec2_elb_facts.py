@@ -28,6 +28,18 @@ options:
     required: false
     default: null
     aliases: ['elb_ids', 'ec2_elbs']
+  regions:
+    description:
+      - A list of regions to gather facts from instead of I(region). The regions are queried concurrently and the results are merged into one list, with a C(region) key added to each item, and also returned indexed by region and name in C(elbs_by_region). With I(names), a region holding none of the names returns no ELBs instead of failing.
+    required: false
+    default: null
+    version_added: "2.2"
+  concurrency:
+    description:
+      - Maximum number of regions to query at the same time when I(regions) is used.
+    required: false
+    default: 4
+    version_added: "2.2"
 extends_documentation_fragment:
     - aws
     - ec2
@@ -70,8 +82,25 @@ EXAMPLES = '''
     msg: "{{ item.dns_name }}"
   with_items: elb_facts.elbs
 
+# Gather facts about all ELBs in several regions at once
+- action:
+    module: ec2_elb_facts
+    regions:
+    - us-east-1
+    - us-west-2
+    - eu-west-1
+  register: elb_facts
+
+- action:
+    module: debug
+    msg: "{{ elb_facts.elbs_by_region['us-east-1']['frontend-prod-elb'].dns_name }}"
+
 '''
 
+import random
+import time
+from multiprocessing.pool import ThreadPool
+
 import xml.etree.ElementTree as ET
 
 try:
@@ -82,6 +111,67 @@ except ImportError:
     HAS_BOTO = False
 
 
+THROTTLING_ERRORS = ('Throttling', 'RequestLimitExceeded')
+
+
+def call_with_backoff(call, retries=8):
+    # Throttled calls are retried with jittered exponential backoff, so that
+    # many regions can be queried at once without failing on rate limits
+    delay = 2
+    for attempt in range(retries):
+        try:
+            return call()
+        except BotoServerError as e:
+            if e.error_code not in THROTTLING_ERRORS or attempt == retries - 1:
+                raise
+        time.sleep(delay + random.uniform(0, delay))
+        delay = min(delay * 2, 60)
+
+
+def collect_regions(connections, collect, concurrency):
+    # Each region is queried on its own connection in a worker thread, so the
+    # run time approaches that of the slowest region rather than the sum
+    def run(region):
+        try:
+            return region, collect(connections[region]), None
+        except BotoServerError as e:
+            return region, None, e
+
+    regions = sorted(connections)
+    if len(regions) == 1:
+        return [run(regions[0])]
+
+    pool = ThreadPool(max(1, min(concurrency, len(regions))))
+    try:
+        return pool.map(run, regions)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def exit_with_region_facts(module, key, id_key, results, error_message):
+    errors = [(region, error) for region, facts, error in results if error]
+    if errors:
+        if not module.params.get('regions'):
+            module.fail_json(msg=error_message(errors[0][1]))
+        module.fail_json(msg="; ".join("%s: %s" % (region, error_message(error)) for region, error in errors))
+
+    if not module.params.get('regions'):
+        module.exit_json(**{key: results[0][1]})
+
+    # Merge the regions into one list and index it by region and id
+    merged = []
+    by_region = {}
+    for region, facts, error in results:
+        by_region[region] = {}
+        for fact in facts:
+            fact['region'] = region
+            merged.append(fact)
+            by_region[region][fact[id_key]] = fact
+
+    module.exit_json(**{key: merged, key + '_by_region': by_region})
+
+
 def get_error_message(xml_string):
 
     root = ET.fromstring(xml_string)
@@ -153,7 +243,7 @@ def get_elb_info(connection,elb):
     if elb.vpc_id:
         elb_info['vpc_id'] = elb.vpc_id
     if elb.instances:
-        instance_health = connection.describe_instance_health(elb.name)
+        instance_health = call_with_backoff(lambda: connection.describe_instance_health(elb.name))
         elb_info['instances_inservice'] = [inst.instance_id for inst in instance_health if inst.state == 'InService']
         elb_info['instances_inservice_count'] = len(elb_info['instances_inservice'])
         elb_info['instances_outofservice'] = [inst.instance_id for inst in instance_health if inst.state == 'OutOfService']
@@ -165,28 +255,34 @@ def get_elb_info(connection,elb):
     return elb_info
 
 
-def list_elb(connection, module):
+def list_elb(connections, module):
     elb_names = module.params.get("names")
     if not elb_names:
         elb_names = None
 
-    try:
-        all_elbs = connection.get_all_load_balancers(elb_names)
-    except BotoServerError as e:
-        module.fail_json(msg = "%s: %s" % (e.error_code, e.error_message))
-
-    elb_array = []
-    for elb in all_elbs:
-        elb_array.append(get_elb_info(connection,elb))
+    def collect(connection):
+        try:
+            all_elbs = call_with_backoff(lambda: connection.get_all_load_balancers(elb_names))
+        except BotoServerError as e:
+            # a region only holds some of the names, if any: keep those
+            if e.error_code != 'LoadBalancerNotFound' or not module.params.get('regions'):
+                raise
+            all_elbs = [elb for elb in call_with_backoff(connection.get_all_load_balancers)
+                        if elb.name in elb_names]
+        return [get_elb_info(connection, elb) for elb in all_elbs]
 
-    module.exit_json(elbs=elb_array)
+    results = collect_regions(connections, collect, module.params.get("concurrency"))
+    exit_with_region_facts(module, 'elbs', 'name', results,
+                           lambda e: "%s: %s" % (e.error_code, e.error_message))
 
 
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            names={'default': None, 'type': 'list'}
+            names={'default': None, 'type': 'list'},
+            regions={'default': None, 'type': 'list'},
+            concurrency={'default': 4, 'type': 'int'},
         )
     )
 
@@ -197,15 +293,18 @@ def main():
 
     region, ec2_url, aws_connect_params = get_aws_connection_info(module)
 
-    if region:
+    regions = module.params.get('regions') or [region]
+    if not all(regions):
+        module.fail_json(msg="region must be specified")
+
+    connections = {}
+    for region in regions:
         try:
-            connection = connect_to_aws(boto.ec2.elb, region, **aws_connect_params)
+            connections[region] = connect_to_aws(boto.ec2.elb, region, **aws_connect_params)
         except (boto.exception.NoAuthHandlerFound, AnsibleAWSError), e:
             module.fail_json(msg=str(e))
-    else:
-        module.fail_json(msg="region must be specified")
 
-    list_elb(connection, module)
+    list_elb(connections, module)
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.ec2 import *
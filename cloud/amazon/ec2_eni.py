@@ -39,7 +39,7 @@ options:
     default: null
   subnet_id:
     description:
-      - ID of subnet in which to create the ENI. Only required when state=present.
+      - ID of subnet in which to create the ENI. Only required when state=present, unless attachments is used.
     required: true
   description:
     description:
@@ -86,6 +86,15 @@ options:
       - The number of secondary IP addresses to assign to the network interface. This option is mutually exclusive of secondary_private_ip_addresses
     required: false
     version_added: 2.2
+  attachments:
+    description:
+      - A list of existing interfaces to attach, each a dict with C(eni_id), C(instance_id) and optionally
+        C(device_index) (default 0) and C(delete_on_termination). All the interfaces are looked up with one
+        call, attached, and then waited for together. Interfaces attached to another instance or device index
+        are only moved when force_detach is set. The interfaces are returned in C(interfaces).
+    required: false
+    default: null
+    version_added: 2.2
 extends_documentation_fragment:
     - aws
     - ec2
@@ -164,8 +173,24 @@ EXAMPLES = '''
     eni_id: {{ "eni.interface.id" }}
     delete_on_termination: true
 
+# Attach the interfaces of several appliances in one pass
+- ec2_eni:
+    state: present
+    attachments:
+      - eni_id: eni-xxxxxxx1
+        instance_id: i-xxxxxxx1
+        device_index: 1
+      - eni_id: eni-xxxxxxx2
+        instance_id: i-xxxxxxx1
+        device_index: 2
+      - eni_id: eni-xxxxxxx3
+        instance_id: i-xxxxxxx2
+        device_index: 1
+        delete_on_termination: true
+
 '''
 
+import random
 import time
 import re
 
@@ -177,6 +202,7 @@ try:
 except ImportError:
     HAS_BOTO = False
 
+ATTACHMENT_OPTIONS = ['eni_id', 'instance_id', 'device_index', 'delete_on_termination']
 
 def get_eni_info(interface):
 
@@ -210,21 +236,71 @@ def get_eni_info(interface):
     return interface_info
 
 
-def wait_for_eni(eni, status):
+class EniLookup(object):
+    """
+    Caches the interfaces and subnets fetched during a run, so that each is
+    only requested from the API once.
+    """
+
+    def __init__(self, connection, vpc_connection):
+        self.connection = connection
+        self.vpc_connection = vpc_connection
+        self.enis = dict()
+        self.enis_by_subnet = dict()
+        self.vpc_ids = dict()
+
+    def get_enis(self, eni_ids):
+        missing = [eni_id for eni_id in eni_ids if eni_id not in self.enis]
+        if missing:
+            for eni in self.connection.get_all_network_interfaces(missing):
+                self.enis[eni.id] = eni
+        return [self.enis[eni_id] for eni_id in eni_ids if eni_id in self.enis]
+
+    def get_eni(self, eni_id):
+        return self.get_enis([eni_id])[0]
+
+    def get_subnet_enis(self, subnet_id):
+        if subnet_id not in self.enis_by_subnet:
+            enis = self.connection.get_all_network_interfaces(filters={'subnet-id': subnet_id})
+            for eni in enis:
+                self.enis[eni.id] = eni
+            self.enis_by_subnet[subnet_id] = enis
+        return self.enis_by_subnet[subnet_id]
+
+    def get_vpc_id(self, subnet_id):
+        if subnet_id not in self.vpc_ids:
+            self.vpc_ids[subnet_id] = self.vpc_connection.get_all_subnets(subnet_ids=[subnet_id])[0].vpc_id
+        return self.vpc_ids[subnet_id]
+
+
+def wait_for_enis(connection, statuses):
+    """
+    Waits until every interface reaches its status in statuses, a dict of
+    interface id to "attached" or "detached". All the pending interfaces
+    are polled with a single call per round, backing off exponentially
+    with jitter between rounds.
+    """
+
+    pending = dict(statuses)
+    delay = 1
+    while pending:
+        time.sleep(delay + random.uniform(0, delay))
+        delay = min(delay * 2, 15)
+        for eni in connection.get_all_network_interfaces(pending.keys()):
+            # If the status is detached we just need attachment to disappear
+            if eni.attachment is None:
+                if pending[eni.id] == "detached":
+                    del pending[eni.id]
+            else:
+                if pending[eni.id] == "attached" and eni.attachment.status == "attached":
+                    del pending[eni.id]
 
-    while True:
-        time.sleep(3)
-        eni.update()
-        # If the status is detached we just need attachment to disappear
-        if eni.attachment is None:
-            if status == "detached":
-                break
-        else:
-            if status == "attached" and eni.attachment.status == "attached":
-                break
 
+def wait_for_eni(eni, status):
+    wait_for_enis(eni.connection, {eni.id: status})
 
-def create_eni(connection, vpc_id, module):
+
+def create_eni(connection, lookup, vpc_id, module):
 
     instance_id = module.params.get("instance_id")
     if instance_id == 'None':
@@ -239,7 +315,7 @@ def create_eni(connection, vpc_id, module):
     changed = False
 
     try:
-        eni = compare_eni(connection, module)
+        eni = compare_eni(lookup, module)
         if eni is None:
             eni = connection.create_network_interface(subnet_id, private_ip_address, description, security_groups)
             if instance_id is not None:
@@ -274,7 +350,7 @@ def create_eni(connection, vpc_id, module):
     module.exit_json(changed=changed, interface=get_eni_info(eni))
 
 
-def modify_eni(connection, vpc_id, module):
+def modify_eni(connection, lookup, vpc_id, module):
 
     eni_id = module.params.get("eni_id")
     instance_id = module.params.get("instance_id")
@@ -295,8 +371,7 @@ def modify_eni(connection, vpc_id, module):
 
     try:
         # Get the eni with the eni_id specified
-        eni_result_set = connection.get_all_network_interfaces(eni_id)
-        eni = eni_result_set[0]
+        eni = lookup.get_eni(eni_id)
         if description is not None:
             if eni.description != description:
                 connection.modify_network_interface_attribute(eni.id, "description", description)
@@ -351,14 +426,13 @@ def modify_eni(connection, vpc_id, module):
     module.exit_json(changed=changed, interface=get_eni_info(eni))
 
 
-def delete_eni(connection, module):
+def delete_eni(lookup, module):
 
     eni_id = module.params.get("eni_id")
     force_detach = module.params.get("force_detach")
 
     try:
-        eni_result_set = connection.get_all_network_interfaces(eni_id)
-        eni = eni_result_set[0]
+        eni = lookup.get_eni(eni_id)
 
         if force_detach is True:
             if eni.attachment is not None:
@@ -381,7 +455,7 @@ def delete_eni(connection, module):
             module.fail_json(msg=e.message)
 
 
-def compare_eni(connection, module):
+def compare_eni(lookup, module):
 
     eni_id = module.params.get("eni_id")
     subnet_id = module.params.get('subnet_id')
@@ -390,7 +464,11 @@ def compare_eni(connection, module):
     security_groups = module.params.get('security_groups')
 
     try:
-        all_eni = connection.get_all_network_interfaces(eni_id)
+        # Only interfaces of the subnet can match
+        if eni_id is not None:
+            all_eni = lookup.get_enis([eni_id])
+        else:
+            all_eni = lookup.get_subnet_enis(subnet_id)
 
         for eni in all_eni:
             remote_security_groups = get_sec_group_list(eni.groups)
@@ -413,13 +491,68 @@ def get_sec_group_list(groups):
     return remote_security_groups
 
 
-def _get_vpc_id(conn, subnet_id):
+def attach_enis(connection, lookup, module):
+
+    attachments = module.params.get("attachments")
+    force_detach = module.params.get("force_detach")
+    changed = False
+
+    for attachment in attachments:
+        for key in attachment:
+            if key not in ATTACHMENT_OPTIONS:
+                module.fail_json(msg="%s is not a valid option for an attachment" % key)
+        for key in ('eni_id', 'instance_id'):
+            if key not in attachment:
+                module.fail_json(msg="%s is a required option for an attachment" % key)
+        attachment['device_index'] = int(attachment.get('device_index', 0))
+        if attachment.get('delete_on_termination') is not None:
+            attachment['delete_on_termination'] = module.boolean(attachment['delete_on_termination'])
 
     try:
-        return conn.get_all_subnets(subnet_ids=[subnet_id])[0].vpc_id
+        # Fetch all the interfaces at once
+        eni_ids = [attachment['eni_id'] for attachment in attachments]
+        enis = dict((eni.id, eni) for eni in lookup.get_enis(eni_ids))
+
+        to_detach = []
+        to_attach = []
+        for attachment in attachments:
+            eni = enis[attachment['eni_id']]
+            if eni.attachment is not None:
+                if eni.attachment.instance_id == attachment['instance_id'] and \
+                        int(eni.attachment.device_index) == attachment['device_index']:
+                    continue
+                if not force_detach:
+                    module.fail_json(msg="Interface %s is attached to instance %s, use force_detach to move it" %
+                                     (eni.id, eni.attachment.instance_id))
+                to_detach.append(eni)
+            to_attach.append((eni, attachment))
+
+        # Issue all the calls first and then wait for all the interfaces together
+        for eni in to_detach:
+            eni.detach(force_detach)
+        wait_for_enis(connection, dict((eni.id, "detached") for eni in to_detach))
+
+        for eni, attachment in to_attach:
+            eni.attach(attachment['instance_id'], attachment['device_index'])
+            changed = True
+        wait_for_enis(connection, dict((eni.id, "attached") for eni, attachment in to_attach))
+
+        if changed:
+            enis = dict((eni.id, eni) for eni in connection.get_all_network_interfaces(eni_ids))
+
+        for attachment in attachments:
+            delete_on_termination = attachment.get('delete_on_termination')
+            eni = enis[attachment['eni_id']]
+            if delete_on_termination is not None and eni.attachment.delete_on_termination != delete_on_termination:
+                connection.modify_network_interface_attribute(eni.id, "deleteOnTermination", delete_on_termination, eni.attachment.id)
+                eni.attachment.delete_on_termination = delete_on_termination
+                changed = True
+
     except BotoServerError as e:
         module.fail_json(msg=e.message)
 
+    module.exit_json(changed=changed, interfaces=[get_eni_info(enis[eni_id]) for eni_id in eni_ids])
+
 
 def main():
     argument_spec = ec2_argument_spec()
@@ -437,13 +570,17 @@ def main():
             source_dest_check = dict(default=None, type='bool'),
             delete_on_termination = dict(default=None, type='bool'),
             secondary_private_ip_addresses = dict(default=None, type='list'),
-            secondary_private_ip_address_count = dict(default=None, type='int')
+            secondary_private_ip_address_count = dict(default=None, type='int'),
+            attachments = dict(default=None, type='list')
         )
     )
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           mutually_exclusive = [
+                               ['attachments', 'eni_id'],
+                               ['attachments', 'instance_id'],
+                           ],
                            required_if = ([
-                               ('state', 'present', ['subnet_id']),
                                ('state', 'absent', ['eni_id']),
                            ])
                            )
@@ -464,16 +601,26 @@ def main():
 
     state = module.params.get("state")
     eni_id = module.params.get("eni_id")
+    lookup = EniLookup(connection, vpc_connection)
 
-    if state == 'present':
+    if module.params.get("attachments"):
+        if state != 'present':
+            module.fail_json(msg="attachments can only be used with state=present")
+        attach_enis(connection, lookup, module)
+    elif state == 'present':
         subnet_id = module.params.get("subnet_id")
-        vpc_id = _get_vpc_id(vpc_connection, subnet_id)
+        if not subnet_id:
+            module.fail_json(msg="state is present but the following are missing: subnet_id")
+        try:
+            vpc_id = lookup.get_vpc_id(subnet_id)
+        except BotoServerError as e:
+            module.fail_json(msg=e.message)
         if eni_id is None:
-            create_eni(connection, vpc_id, module)
+            create_eni(connection, lookup, vpc_id, module)
         else:
-            modify_eni(connection, vpc_id, module)
+            modify_eni(connection, lookup, vpc_id, module)
     elif state == 'absent':
-        delete_eni(connection, module)
+        delete_eni(lookup, module)
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.ec2 import *
@@ -26,6 +26,36 @@ options:
       - A dict of filters to apply. Each dict item consists of a filter key and a filter value. See U(http://docs.aws.amazon.com/AWSEC2/latest/APIReference/API_DescribeInstances.html) for possible filters.
     required: false
     default: null
+  fields:
+    description:
+      - Only gather these facts for each instance, for example C(['private_ip_address', 'tags']). The instance C(id) is always returned. By default all facts are gathered.
+    required: false
+    default: null
+    version_added: "2.2"
+  page_size:
+    description:
+      - Retrieve the instances in pages of this many (5 to 1000) and follow the pagination token until all instances have been retrieved. By default all instances are requested in a single call.
+    required: false
+    default: null
+    version_added: "2.2"
+  regions:
+    description:
+      - A list of regions to gather facts from instead of I(region). The regions are queried concurrently and the instances of all regions are returned in one list; the C(region) fact tells them apart.
+    required: false
+    default: null
+    version_added: "2.2"
+  concurrency:
+    description:
+      - Maximum number of regions to query at the same time when I(regions) is used.
+    required: false
+    default: 4
+    version_added: "2.2"
+  dest:
+    description:
+      - Write the instance facts to this file, one JSON document per line (JSON Lines), as they are retrieved instead of returning them. Only C(count) and C(dest) are returned.
+    required: false
+    default: null
+    version_added: "2.2"
 author:
     - "Michael Schuett (@michaeljs1990)"
 extends_documentation_fragment:
@@ -56,8 +86,29 @@ EXAMPLES = '''
       vpc-id: vpc-123456
       instance-type: t2.small
 
+# Gather the address and tags of every instance in three regions, 1000 at a time
+- ec2_remote_facts:
+    regions:
+      - us-east-1
+      - us-west-2
+      - eu-west-1
+    page_size: 1000
+    fields:
+      - private_ip_address
+      - tags
+      - region
+
+# Export the facts of every instance to a JSON Lines file
+- ec2_remote_facts:
+    page_size: 1000
+    dest: /tmp/instances.jsonl
+
 '''
 
+import json
+import threading
+from multiprocessing.pool import ThreadPool
+
 try:
     import boto.ec2
     from boto.exception import BotoServerError
@@ -65,73 +116,174 @@ try:
 except ImportError:
     HAS_BOTO = False
 
-def get_instance_info(instance):
-
-    # Get groups
+def get_groups(instance):
     groups = []
     for group in instance.groups:
         groups.append({ 'id': group.id, 'name': group.name }.copy())
+    return groups
+
 
-    # Get interfaces
+def get_interfaces(instance):
     interfaces = []
     for interface in instance.interfaces:
         interfaces.append({ 'id': interface.id, 'mac_address': interface.mac_address }.copy())
+    return interfaces
+
 
+def get_source_dest_check(instance):
     # If an instance is terminated, sourceDestCheck is no longer returned
     try:
-        source_dest_check = instance.sourceDestCheck
+        return instance.sourceDestCheck
     except AttributeError:
-        source_dest_check = None
-
-    instance_info = { 'id': instance.id,
-                    'kernel': instance.kernel,
-                    'instance_profile': instance.instance_profile,
-                    'root_device_type': instance.root_device_type,
-                    'private_dns_name': instance.private_dns_name,
-                    'public_dns_name': instance.public_dns_name,
-                    'ebs_optimized': instance.ebs_optimized,
-                    'client_token': instance.client_token,
-                    'virtualization_type': instance.virtualization_type,
-                    'architecture': instance.architecture,
-                    'ramdisk': instance.ramdisk,
-                    'tags': instance.tags,
-                    'key_name': instance.key_name,
-                    'source_destination_check': source_dest_check,
-                    'image_id': instance.image_id,
-                    'groups': groups,
-                    'interfaces': interfaces,
-                    'spot_instance_request_id': instance.spot_instance_request_id,
-                    'requester_id': instance.requester_id,
-                    'monitoring_state': instance.monitoring_state,
-                    'placement': {
-                                  'tenancy': instance._placement.tenancy,
-                                  'zone': instance._placement.zone
-                                 },
-                    'ami_launch_index': instance.ami_launch_index,
-                    'launch_time': instance.launch_time,
-                    'hypervisor': instance.hypervisor,
-                    'region': instance.region.name,
-                    'persistent': instance.persistent,
-                    'private_ip_address': instance.private_ip_address,
-                    'state': instance._state.name,
-                    'vpc_id': instance.vpc_id,
-                  }
+        return None
+
+
+# Each fact is only materialized when it is requested through fields
+INSTANCE_FIELDS = {
+    'id': lambda instance: instance.id,
+    'kernel': lambda instance: instance.kernel,
+    'instance_profile': lambda instance: instance.instance_profile,
+    'root_device_type': lambda instance: instance.root_device_type,
+    'private_dns_name': lambda instance: instance.private_dns_name,
+    'public_dns_name': lambda instance: instance.public_dns_name,
+    'ebs_optimized': lambda instance: instance.ebs_optimized,
+    'client_token': lambda instance: instance.client_token,
+    'virtualization_type': lambda instance: instance.virtualization_type,
+    'architecture': lambda instance: instance.architecture,
+    'ramdisk': lambda instance: instance.ramdisk,
+    'tags': lambda instance: instance.tags,
+    'key_name': lambda instance: instance.key_name,
+    'source_destination_check': get_source_dest_check,
+    'image_id': lambda instance: instance.image_id,
+    'groups': get_groups,
+    'interfaces': get_interfaces,
+    'spot_instance_request_id': lambda instance: instance.spot_instance_request_id,
+    'requester_id': lambda instance: instance.requester_id,
+    'monitoring_state': lambda instance: instance.monitoring_state,
+    'placement': lambda instance: {
+                                   'tenancy': instance._placement.tenancy,
+                                   'zone': instance._placement.zone
+                                  },
+    'ami_launch_index': lambda instance: instance.ami_launch_index,
+    'launch_time': lambda instance: instance.launch_time,
+    'hypervisor': lambda instance: instance.hypervisor,
+    'region': lambda instance: instance.region.name,
+    'persistent': lambda instance: instance.persistent,
+    'private_ip_address': lambda instance: instance.private_ip_address,
+    'state': lambda instance: instance._state.name,
+    'vpc_id': lambda instance: instance.vpc_id,
+}
+
+
+def get_instance_info(instance, fields=None):
+
+    if not fields:
+        fields = INSTANCE_FIELDS.keys()
+
+    instance_info = dict((field, INSTANCE_FIELDS[field](instance)) for field in fields)
+    instance_info['id'] = instance.id
 
     return instance_info
 
 
-def list_ec2_instances(connection, module):
+def iter_instances(connection, filters, page_size=None):
+    # Follow nextToken page by page so only one page of boto objects is held
+    # in memory at a time
+    next_token = None
+    while True:
+        reservations = connection.get_all_reservations(filters=filters,
+                                                       max_results=page_size,
+                                                       next_token=next_token)
+        for reservation in reservations:
+            for instance in reservation.instances:
+                yield instance
+
+        next_token = getattr(reservations, 'next_token', None)
+        if not page_size or not next_token:
+            break
+
+
+def collect_region(region, connect, filters, fields, page_size, writer):
+    # Runs in a worker thread, so errors are handed back instead of failing
+    # the module from here
+    try:
+        connection = connect(region)
+        instances = []
+        for instance in iter_instances(connection, filters, page_size):
+            info = get_instance_info(instance, fields)
+            if writer:
+                writer(info)
+            else:
+                instances.append(info)
+        return instances, None
+    except (BotoServerError, AnsibleAWSError, boto.exception.NoAuthHandlerFound), e:
+        return None, "%s: %s" % (region, getattr(e, 'message', None) or str(e))
+
+
+class JSONLinesWriter(object):
+
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, info):
+        line = json.dumps(info, default=str) + '\n'
+        with self.lock:
+            self.f.write(line)
+            self.count += 1
+
+
+def list_ec2_instances(connect, module, regions):
 
     filters = module.params.get("filters")
-    instance_dict_array = []
+    fields = module.params.get("fields")
+    page_size = module.params.get("page_size")
+    concurrency = module.params.get("concurrency")
+    dest = module.params.get("dest")
+
+    if fields:
+        unknown = [field for field in fields if field not in INSTANCE_FIELDS]
+        if unknown:
+            module.fail_json(msg="Unknown fields: %s. Valid fields are: %s" %
+                             (", ".join(unknown), ", ".join(sorted(INSTANCE_FIELDS))))
+
+    f = None
+    writer = None
+    if dest:
+        try:
+            f = open(dest, 'w')
+        except IOError, e:
+            module.fail_json(msg="Failed to open %s: %s" % (dest, str(e)))
+        writer = JSONLinesWriter(f)
+
+    def collect(region):
+        return collect_region(region, connect, filters, fields, page_size, writer)
 
     try:
-        all_instances = connection.get_only_instances(filters=filters)
-    except BotoServerError as e:
-        module.fail_json(msg=e.message)
+        if len(regions) == 1:
+            results = [collect(regions[0])]
+        else:
+            pool = ThreadPool(max(1, min(concurrency, len(regions))))
+            try:
+                results = pool.map(collect, regions)
+            finally:
+                pool.close()
+                pool.join()
+    finally:
+        if f:
+            f.close()
 
-    for instance in all_instances:
-        instance_dict_array.append(get_instance_info(instance))
+    errors = [error for instances, error in results if error]
+    if errors:
+        module.fail_json(msg="Failed to gather instance facts: %s" % "; ".join(errors))
+
+    if writer:
+        module.exit_json(count=writer.count, dest=dest)
+
+    instance_dict_array = []
+    for instances, error in results:
+        instance_dict_array.extend(instances)
 
     module.exit_json(instances=instance_dict_array)
 
@@ -140,7 +292,12 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            filters = dict(default=None, type='dict')
+            filters = dict(default=None, type='dict'),
+            fields = dict(default=None, type='list'),
+            page_size = dict(default=None, type='int'),
+            regions = dict(default=None, type='list'),
+            concurrency = dict(default=4, type='int'),
+            dest = dict(default=None, type='path'),
         )
     )
 
@@ -151,15 +308,20 @@ def main():
 
     region, ec2_url, aws_connect_params = get_aws_connection_info(module)
 
-    if region:
-        try:
-            connection = connect_to_aws(boto.ec2, region, **aws_connect_params)
-        except (boto.exception.NoAuthHandlerFound, AnsibleAWSError), e:
-            module.fail_json(msg=str(e))
-    else:
-        module.fail_json(msg="region must be specified")
+    page_size = module.params.get('page_size')
+    if page_size is not None and not 5 <= page_size <= 1000:
+        module.fail_json(msg="page_size must be between 5 and 1000")
+
+    regions = module.params.get('regions')
+    if not regions:
+        if not region:
+            module.fail_json(msg="region must be specified")
+        regions = [region]
+
+    def connect(region):
+        return connect_to_aws(boto.ec2, region, **aws_connect_params)
 
-    list_ec2_instances(connection, module)
+    list_ec2_instances(connect, module, regions)
 
 # import module snippets
 from ansible.module_utils.basic import *
@@ -22,6 +22,12 @@ description:
 version_added: "2.0"
 author: Robert Estelle (@erydo), Rob White (@wimnat)
 options:
+  concurrency:
+    description:
+      - "Maximum number of route and subnet association changes to send to the API at the same time."
+    required: false
+    default: 4
+    version_added: "2.2"
   lookup:
     description:
       - "Look up route table by either tags or by route table ID. Non-unique tag lookup will fail. If no tags are specifed then no lookup for an existing route table is performed and a new route table will be created. To change tags of a route table, you must look up by id."
@@ -106,6 +112,8 @@ EXAMPLES = '''
 
 import sys  # noqa
 import re
+import threading
+from multiprocessing.pool import ThreadPool
 
 try:
     import boto.ec2
@@ -294,22 +302,81 @@ def rename_key(d, old_key, new_key):
     del d[old_key]
 
 
-def index_of_matching_route(route_spec, routes_to_match):
-    for i, route in enumerate(routes_to_match):
-        if route_spec_matches_route(route_spec, route):
-            return i
+def index_routes(routes):
+    """
+    Indexes routes by destination CIDR block. A route table holds at most one
+    route per destination, so this is the canonical key for matching route
+    specs without scanning the whole table for each one.
+    """
+    index = {}
+    for route in routes:
+        index.setdefault(route.destination_cidr_block, []).append(route)
+    return index
+
+
+def run_vpc_calls(vpc_conn, calls, connect=None, concurrency=1):
+    """
+    Runs a list of (method_name, args, kwargs) calls against the VPC API and
+    returns a list of (result, error) tuples in the same order. When a
+    connection factory is given and more than one call is queued, the calls
+    are spread over a thread pool with one connection per worker thread.
+    Dry run responses count as success.
+    """
+    local = threading.local()
+
+    def run(call):
+        method, args, kwargs = call
+        try:
+            conn = vpc_conn
+            if connect is not None:
+                if not hasattr(local, 'conn'):
+                    local.conn = connect()
+                conn = local.conn
+            return getattr(conn, method)(*args, **kwargs), None
+        except EC2ResponseError as e:
+            if e.error_code == 'DryRunOperation':
+                return None, None
+            return None, e
+
+    if connect is None or concurrency <= 1 or len(calls) <= 1:
+        return [run(call) for call in calls]
+
+    pool = ThreadPool(min(concurrency, len(calls)))
+    try:
+        return pool.map(run, calls)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def raise_on_call_errors(calls, results, action):
+    errors = ['{0}{1}: {2}'.format(call[0], tuple(call[1]), error)
+              for call, (result, error) in zip(calls, results) if error]
+    if errors:
+        raise AnsibleRouteTableException(
+            'Unable to {0}, errors: {1}'.format(action, '; '.join(errors)))
 
 
 def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
-                  check_mode):
-    routes_to_match = list(route_table.routes)
+                  check_mode, connect=None, concurrency=1):
+    routes_by_dest = index_routes(route_table.routes)
+    matched = set()
     route_specs_to_create = []
     for route_spec in route_specs:
-        i = index_of_matching_route(route_spec, routes_to_match)
-        if i is None:
+        candidates = routes_by_dest.get(
+            route_spec.get('destination_cidr_block'), [])
+        match = None
+        for route in candidates:
+            if id(route) not in matched and \
+                    route_spec_matches_route(route_spec, route):
+                match = route
+                break
+        if match is None:
             route_specs_to_create.append(route_spec)
         else:
-            del routes_to_match[i]
+            matched.add(id(match))
+
+    routes_to_match = [r for r in route_table.routes if id(r) not in matched]
 
     # NOTE: As of boto==2.38.0, the origin of a route is not available
     # (for example, whether it came from a gateway with route propagation
@@ -323,67 +390,71 @@ def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
 
     changed = routes_to_delete or route_specs_to_create
     if changed:
-        for route_spec in route_specs_to_create:
-            try:
-                vpc_conn.create_route(route_table.id,
-                                      dry_run=check_mode,
-                                      **route_spec)
-            except EC2ResponseError as e:
-                if e.error_code == 'DryRunOperation':
-                    pass
-
-        for route in routes_to_delete:
-            try:
-                vpc_conn.delete_route(route_table.id,
-                                      route.destination_cidr_block,
-                                      dry_run=check_mode)
-            except EC2ResponseError as e:
-                if e.error_code == 'DryRunOperation':
-                    pass
+        # Deletes go first so that a route whose target changed can be
+        # recreated for the same destination.
+        calls = [('delete_route',
+                  (route_table.id, route.destination_cidr_block),
+                  {'dry_run': check_mode})
+                 for route in routes_to_delete]
+        results = run_vpc_calls(vpc_conn, calls, connect, concurrency)
+        raise_on_call_errors(calls, results, 'delete routes')
+
+        calls = [('create_route', (route_table.id,),
+                  dict(route_spec, dry_run=check_mode))
+                 for route_spec in route_specs_to_create]
+        results = run_vpc_calls(vpc_conn, calls, connect, concurrency)
+        raise_on_call_errors(calls, results, 'create routes')
 
     return {'changed': bool(changed)}
 
 
-def ensure_subnet_association(vpc_conn, vpc_id, route_table_id, subnet_id,
-                              check_mode):
-    route_tables = vpc_conn.get_all_route_tables(
-        filters={'association.subnet_id': subnet_id, 'vpc_id': vpc_id}
-    )
-    for route_table in route_tables:
+def index_subnet_associations(vpc_conn, vpc_id):
+    """
+    Maps each explicitly associated subnet in the VPC to its
+    (route_table_id, association_id), using a single VPC-wide lookup.
+    """
+    associations = {}
+    for route_table in vpc_conn.get_all_route_tables(
+            filters={'vpc_id': vpc_id}):
         if route_table.id is None:
             continue
         for a in route_table.associations:
-            if a.subnet_id == subnet_id:
-                if route_table.id == route_table_id:
-                    return {'changed': False, 'association_id': a.id}
-                else:
-                    if check_mode:
-                        return {'changed': True}
-                    vpc_conn.disassociate_route_table(a.id)
-
-    association_id = vpc_conn.associate_route_table(route_table_id, subnet_id)
-    return {'changed': True, 'association_id': association_id}
+            if a.subnet_id:
+                associations[a.subnet_id] = (route_table.id, a.id)
+    return associations
 
 
 def ensure_subnet_associations(vpc_conn, vpc_id, route_table, subnets,
-                               check_mode):
-    current_association_ids = [a.id for a in route_table.associations]
+                               check_mode, connect=None, concurrency=1):
+    associations = index_subnet_associations(vpc_conn, vpc_id)
+
     new_association_ids = []
-    changed = False
+    calls = []
     for subnet in subnets:
-        result = ensure_subnet_association(
-            vpc_conn, vpc_id, route_table.id, subnet.id, check_mode)
-        changed = changed or result['changed']
-        if changed and check_mode:
-            return {'changed': True}
-        new_association_ids.append(result['association_id'])
+        table_id, association_id = associations.get(subnet.id, (None, None))
+        if table_id == route_table.id:
+            new_association_ids.append(association_id)
+        elif table_id is not None:
+            # Moving a subnet from another table is a single replace call.
+            calls.append(('replace_route_table_association_with_assoc',
+                          (association_id, route_table.id), {}))
+        else:
+            calls.append(('associate_route_table',
+                          (route_table.id, subnet.id), {}))
 
-    to_delete = [a_id for a_id in current_association_ids
-                 if a_id not in new_association_ids]
+    to_delete = [a.id for a in route_table.associations
+                 if a.subnet_id and a.id not in new_association_ids]
 
-    for a_id in to_delete:
-        changed = True
-        vpc_conn.disassociate_route_table(a_id, dry_run=check_mode)
+    changed = bool(calls or to_delete)
+    if not changed or check_mode:
+        return {'changed': changed}
+
+    results = run_vpc_calls(vpc_conn, calls, connect, concurrency)
+    raise_on_call_errors(calls, results, 'associate subnets')
+
+    calls = [('disassociate_route_table', (a_id,), {}) for a_id in to_delete]
+    results = run_vpc_calls(vpc_conn, calls, connect, concurrency)
+    raise_on_call_errors(calls, results, 'disassociate subnets')
 
     return {'changed': changed}
 
@@ -474,7 +545,7 @@ def create_route_spec(connection, routes, vpc_id):
 
     return routes
 
-def ensure_route_table_present(connection, module):
+def ensure_route_table_present(connection, module, connect=None):
 
     lookup = module.params.get('lookup')
     propagating_vgw_ids = module.params.get('propagating_vgw_ids')
@@ -482,6 +553,7 @@ def ensure_route_table_present(connection, module):
     subnets = module.params.get('subnets')
     tags = module.params.get('tags')
     vpc_id = module.params.get('vpc_id')
+    concurrency = module.params.get('concurrency')
     try:
         routes = create_route_spec(connection, module.params.get('routes'), vpc_id)
     except AnsibleIgwSearchException as e:
@@ -519,7 +591,8 @@ def ensure_route_table_present(connection, module):
 
     if routes is not None:
         try:
-            result = ensure_routes(connection, route_table, routes, propagating_vgw_ids, module.check_mode)
+            result = ensure_routes(connection, route_table, routes, propagating_vgw_ids, module.check_mode,
+                                   connect=connect, concurrency=concurrency)
             changed = changed or result['changed']
         except EC2ResponseError as e:
             module.fail_json(msg=e.message)
@@ -546,7 +619,8 @@ def ensure_route_table_present(connection, module):
             )
 
         try:
-            result = ensure_subnet_associations(connection, vpc_id, route_table, associated_subnets, module.check_mode)
+            result = ensure_subnet_associations(connection, vpc_id, route_table, associated_subnets, module.check_mode,
+                                                connect=connect, concurrency=concurrency)
             changed = changed or result['changed']
         except EC2ResponseError as e:
             raise AnsibleRouteTableException(
@@ -561,6 +635,7 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
+            concurrency = dict(default=4, required=False, type='int'),
             lookup = dict(default='tag', required=False, choices=['tag', 'id']),
             propagating_vgw_ids = dict(default=None, required=False, type='list'),
             route_table_id = dict(default=None, required=False),
@@ -587,6 +662,9 @@ def main():
     else:
         module.fail_json(msg="region must be specified")
 
+    def connect():
+        return connect_to_aws(boto.vpc, region, **aws_connect_params)
+
     lookup = module.params.get('lookup')
     route_table_id = module.params.get('route_table_id')
     state = module.params.get('state', 'present')
@@ -596,7 +674,7 @@ def main():
 
     try:
         if state == 'present':
-            result = ensure_route_table_present(connection, module)
+            result = ensure_route_table_present(connection, module, connect)
         elif state == 'absent':
             result = ensure_route_table_absent(connection, module)
     except AnsibleRouteTableException as e:
@@ -67,14 +67,29 @@ options:
         required: false
     delay:
         description:
-          - The time to wait before checking that the service is available
+          - The time to wait before checking that the service is available.
+            Since 2.2 the time between checks grows exponentially, up to this value.
         required: false
         default: 10
     repeat:
         description:
-          - The number of times to check that the service is available
+          - The number of times to check that the service is available.
+            Since 2.2 this only sets the default I(wait_timeout), I(delay) times I(repeat) seconds.
         required: false
         default: 10
+    wait_timeout:
+        description:
+          - How long to wait in total, in seconds, for the service to be deleted with I(state=deleting)
+            or to reach a steady state with I(wait_for_steady_state). Defaults to I(delay) times I(repeat).
+        required: false
+        version_added: "2.2"
+    wait_for_steady_state:
+        description:
+          - With I(state=present), wait after the service was created or updated until its deployment has
+            finished, that is until only one deployment is left and the running count matches the desired count.
+        required: false
+        default: false
+        version_added: "2.2"
 extends_documentation_fragment:
     - aws
     - ec2
@@ -100,6 +115,16 @@ EXAMPLES = '''
     name: default
     state: absent
     cluster: new_cluster
+
+# Roll out a new task definition and wait until the deployment has finished
+- ecs_service:
+    state: present
+    name: console-test-service
+    cluster: new_cluster
+    task_definition: new_cluster-task:2
+    desired_count: 4
+    wait_for_steady_state: yes
+    wait_timeout: 900
 '''
 
 RETURN = '''
@@ -175,6 +200,9 @@ ansible_facts:
             returned: when service existed and was deleted
             type: complex
 '''
+import random
+import time
+
 try:
     import boto
     import botocore
@@ -237,6 +265,55 @@ class EcsServiceManager:
                 return c
         raise StandardError("Unknown problem describing service %s." % service_name)
 
+    def describe_services(self, cluster_name, service_names):
+        # describe_services accepts at most 10 services per call, services
+        # which were not found are left out of the result
+        services = dict()
+        for i in range(0, len(service_names), 10):
+            response = self.ecs.describe_services(
+                cluster=cluster_name,
+                services=service_names[i:i + 10])
+            for name in service_names[i:i + 10]:
+                c = self.find_in_array(response['services'], name)
+                if c:
+                    services[name] = c
+        return services
+
+    def wait_for_services(self, cluster_name, service_names, is_ready, timeout, max_delay):
+        """
+        Waits until is_ready(service) is true for all the given services,
+        polling them in batches with exponential backoff and jitter. is_ready
+        is passed None for a service that was not found.
+        Returns the services that were ready and the names of those still
+        pending when the timeout expired.
+        """
+        deadline = time.time() + timeout
+        delay = min(2, max_delay)
+        ready = dict()
+        pending = list(service_names)
+        while True:
+            services = self.describe_services(cluster_name, pending)
+            for name in pending:
+                if is_ready(services.get(name)):
+                    ready[name] = services.get(name)
+            pending = [name for name in pending if name not in ready]
+
+            remaining = deadline - time.time()
+            if not pending or remaining <= 0:
+                return ready, pending
+            time.sleep(min(delay + random.uniform(0, delay), remaining))
+            delay = min(delay * 2, max_delay)
+
+    def is_inactive(self, service):
+        return service is None or service['status'] == 'INACTIVE'
+
+    def is_steady(self, service):
+        # a rolling deploy is done once the old deployments are gone and the
+        # primary one runs the desired number of tasks
+        return (service is not None and
+                len(service['deployments']) == 1 and
+                service['runningCount'] == service['desiredCount'])
+
     def is_matching_service(self, expected, existing):
         if expected['task_definition'] != existing['taskDefinition']:
             return False
@@ -301,7 +378,9 @@ def main():
         client_token=dict(required=False, type='str' ),
         role=dict(required=False, type='str' ),
         delay=dict(required=False, type='int', default=10),
-        repeat=dict(required=False, type='int', default=10)
+        repeat=dict(required=False, type='int', default=10),
+        wait_timeout=dict(required=False, type='int'),
+        wait_for_steady_state=dict(required=False, type='bool', default=False)
     ))
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
@@ -318,6 +397,11 @@ def main():
         if not 'desired_count' in module.params and module.params['desired_count'] is None:
             module.fail_json(msg="To use create a service, a desired_count must be specified")
 
+    delay = module.params['delay']
+    wait_timeout = module.params['wait_timeout']
+    if wait_timeout is None:
+        wait_timeout = delay * module.params['repeat']
+
     service_mgr = EcsServiceManager(module)
     try:
         existing = service_mgr.describe_service(module.params['cluster'], module.params['name'])
@@ -372,6 +456,13 @@ def main():
 
                 results['service'] = response
 
+                if module.params['wait_for_steady_state']:
+                    ready, pending = service_mgr.wait_for_services(module.params['cluster'],
+                        [module.params['name']], service_mgr.is_steady, wait_timeout, delay)
+                    if pending:
+                        module.fail_json(msg="Service '"+module.params['name']+"' did not reach a steady state within "+str(wait_timeout)+" seconds.")
+                    results['service'] = service_mgr.jsonize(ready[module.params['name']])
+
             results['changed'] = True
 
     elif module.params['state'] == 'absent':
@@ -402,19 +493,12 @@ def main():
             return
         # it exists, so we should delete it and mark changed.
         # return info about the cluster deleted
-        delay = module.params['delay']
-        repeat = module.params['repeat']
-        time.sleep(delay)
-        for i in range(repeat):
-            existing = service_mgr.describe_service(module.params['cluster'], module.params['name'])
-            status = existing['status']
-            if status == "INACTIVE":
-                results['changed'] = True
-                break
-            time.sleep(delay)
-        if i is repeat-1:
-            module.fail_json(msg="Service still not deleted after "+str(repeat)+" tries of "+str(delay)+" seconds each.")
+        ready, pending = service_mgr.wait_for_services(module.params['cluster'],
+            [module.params['name']], service_mgr.is_inactive, wait_timeout, delay)
+        if pending:
+            module.fail_json(msg="Service still not deleted after "+str(wait_timeout)+" seconds.")
             return
+        results['changed'] = True
 
     module.exit_json(**results)
 
@@ -39,10 +39,24 @@ options:
             - The cluster ARNS in which to list the services.
         required: false
         default: 'default'
+    clusters:
+        description:
+            - A list of clusters to list or describe the services of, instead of I(cluster). The services of all
+              clusters are returned in C(services) and, per cluster, in C(services_by_cluster).
+        required: false
+        version_added: "2.2"
     service:
         description:
-            - The service to get details for (required if details is true)
+            - The service to get details for. A comma separated list of services can be given.
+              If details is true and no service is given, all the services of the cluster are described.
+        required: false
+    concurrency:
+        description:
+            - The services are described in batches of 10, the most the API accepts in one call.
+              This is the maximum number of batches described at the same time.
         required: false
+        default: 4
+        version_added: "2.2"
 extends_documentation_fragment:
     - aws
     - ec2
@@ -60,6 +74,13 @@ EXAMPLES = '''
 # Basic listing example
 - ecs_service_facts:
     cluster: test-cluster
+
+# Describe every service of several clusters
+- ecs_service_facts:
+    clusters:
+      - test-cluster
+      - prod-cluster
+    details: "true"
 '''
 
 RETURN = '''
@@ -125,7 +146,18 @@ services:
             description: lost of service events
             returned: always
             type: list of complex
+services_by_cluster:
+    description: When clusters is used, the services of each cluster, as returned in services, keyed by cluster.
+    returned: when clusters is used
+    type: dict
+    version_added: "2.2"
+services_not_running:
+    description: When details is true, the services which could not be described and the reason why.
+    returned: when some services were not found
+    type: list of complex
 '''
+from multiprocessing.pool import ThreadPool
+
 try:
     import boto
     import botocore
@@ -167,21 +199,64 @@ class EcsServiceManager:
         fn_args = dict()
         if cluster and cluster is not None:
             fn_args['cluster'] = cluster
-        response = self.ecs.list_services(**fn_args)
-        relevant_response = dict(services = response['serviceArns'])
+        # follow nextToken until every page has been listed
+        service_arns = []
+        while True:
+            response = self.ecs.list_services(**fn_args)
+            service_arns.extend(response['serviceArns'])
+            if not response.get('nextToken'):
+                break
+            fn_args['nextToken'] = response['nextToken']
+        relevant_response = dict(services = service_arns)
         return relevant_response
 
-    def describe_services(self, cluster, services):
+    def describe_services(self, cluster, services, concurrency=1):
         fn_args = dict()
         if cluster and cluster is not None:
             fn_args['cluster'] = cluster
-        fn_args['services']=services.split(",")
-        response = self.ecs.describe_services(**fn_args)
-        relevant_response = dict(services = map(self.extract_service_from, response['services']))
-        if 'failures' in response and len(response['failures'])>0:
-            relevant_response['services_not_running'] = response['failures']
+        if isinstance(services, basestring):
+            services = services.split(",")
+        # describe_services accepts at most 10 services per call
+        batches = [services[i:i + 10] for i in range(0, len(services), 10)]
+
+        def describe(batch):
+            try:
+                return self.ecs.describe_services(services=batch, **fn_args), None
+            except botocore.exceptions.ClientError, e:
+                return None, str(e)
+
+        if len(batches) > 1 and concurrency > 1:
+            pool = ThreadPool(min(concurrency, len(batches)))
+            try:
+                results = pool.map(describe, batches)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = map(describe, batches)
+
+        errors = [error for response, error in results if error]
+        if errors:
+            self.module.fail_json(msg="Failed to describe services: %s" % "; ".join(errors))
+
+        relevant_response = dict(services = [])
+        failures = []
+        for response, error in results:
+            relevant_response['services'].extend(map(self.extract_service_from, response['services']))
+            failures.extend(response.get('failures', []))
+        if len(failures)>0:
+            relevant_response['services_not_running'] = failures
         return relevant_response
 
+    def get_facts(self, cluster, service, show_details, concurrency):
+        if not show_details:
+            return self.list_services(cluster)
+        if not service:
+            service = self.list_services(cluster)['services']
+            if not service:
+                return dict(services = [])
+        return self.describe_services(cluster, service, concurrency)
+
     def extract_service_from(self, service):
         # some fields are datetime which is not JSON serializable
         # make them strings
@@ -203,10 +278,13 @@ def main():
     argument_spec.update(dict(
         details=dict(required=False, choices=['true', 'false'] ),
         cluster=dict(required=False, type='str' ),
-        service=dict(required=False, type='str' )
+        service=dict(required=False, type='str' ),
+        clusters=dict(required=False, type='list' ),
+        concurrency=dict(required=False, type='int', default=4 )
     ))
 
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True,
+                           mutually_exclusive=[['cluster', 'clusters']])
 
     if not HAS_BOTO:
       module.fail_json(msg='boto is required.')
@@ -219,12 +297,18 @@ def main():
         show_details = True
 
     task_mgr = EcsServiceManager(module)
-    if show_details:
-        if 'service' not in module.params or not module.params['service']:
-            module.fail_json(msg="service must be specified for ecs_service_facts")
-        ecs_facts = task_mgr.describe_services(module.params['cluster'], module.params['service'])
+    service = module.params['service']
+    concurrency = module.params['concurrency']
+    if module.params['clusters']:
+        ecs_facts = dict(services = [], services_by_cluster = dict())
+        for cluster in module.params['clusters']:
+            cluster_facts = task_mgr.get_facts(cluster, service, show_details, concurrency)
+            ecs_facts['services'].extend(cluster_facts['services'])
+            ecs_facts['services_by_cluster'][cluster] = cluster_facts['services']
+            if 'services_not_running' in cluster_facts:
+                ecs_facts.setdefault('services_not_running', []).extend(cluster_facts['services_not_running'])
     else:
-        ecs_facts = task_mgr.list_services(module.params['cluster'])
+        ecs_facts = task_mgr.get_facts(module.params['cluster'], service, show_details, concurrency)
 
     ecs_facts_result = dict(changed=False, ansible_facts=ecs_facts)
     module.exit_json(**ecs_facts_result)
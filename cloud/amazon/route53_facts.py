@@ -112,6 +112,28 @@ options:
         'tags',
         ]
     default: 'list'
+  all_pages:
+    description:
+      - "Follow the pagination markers and retrieve every page of results for
+        query: record_sets, hosted_zone_method: list and health_check_method: list.
+        In this mode max_items is used as the page size."
+      - "The results are streamed into a compact index instead of a list: record
+        sets are indexed by name and type (RecordSetIndex), hosted zones and health
+        checks by id (HostedZoneIndex, HealthCheckIndex). The number of items is
+        returned in Count."
+      - "With query: record_sets, type filters the record sets by type and does not
+        require start_record_name."
+    required: false
+    default: false
+    version_added: "2.2"
+  dest:
+    description:
+      - "Used with all_pages. Write the results to this file, one JSON document per
+        line (JSON Lines), as the pages are retrieved instead of returning them,
+        so that zones with a very large number of records do not have to be held in
+        memory. Only Count and Dest are returned."
+    required: false
+    version_added: "2.2"
 author: Karen Cheng(@Etherdaemon)
 extends_documentation_fragment: aws
 '''
@@ -152,6 +174,21 @@ EXAMPLES = '''
     health_check_id: '00000000-1111-2222-3333-12345678abcd'
   register: health_check_failure_reason
 
+- name: Retrieve every resource record set of a zone, indexed by name and type
+  route53_facts:
+    query: record_sets
+    hosted_zone_id: 'ZZZ1111112222'
+    all_pages: true
+  register: record_sets
+
+- name: Export the record sets of a very large zone to a JSON Lines file
+  route53_facts:
+    query: record_sets
+    hosted_zone_id: 'ZZZ1111112222'
+    all_pages: true
+    max_items: 300
+    dest: /tmp/ZZZ1111112222.jsonl
+
 - name: Retrieve reusable delegation set details
   route53_facts:
     query: reusable_delegation_set
@@ -159,6 +196,8 @@ EXAMPLES = '''
   register: delegation_sets
 
 '''
+import json
+
 try:
     import boto
     import botocore
@@ -173,6 +212,57 @@ except ImportError:
     HAS_BOTO3 = False
 
 
+def paginate(client, module, operation, params, result_key):
+    paginator = client.get_paginator(operation)
+    pagination_config = dict()
+    if module.params.get('max_items'):
+        pagination_config['PageSize'] = int(module.params.get('max_items'))
+
+    for page in paginator.paginate(PaginationConfig=pagination_config, **params):
+        for item in page[result_key]:
+            yield item
+
+
+def collect_pages(client, module, operation, params, result_key, index_name, index_item, item_filter=None):
+    # Stream every item of every page either into an index or, when dest is
+    # set, into a JSON Lines file, so the full page list is never built
+    count = 0
+    items = paginate(client, module, operation, params, result_key)
+    if item_filter:
+        items = (item for item in items if item_filter(item))
+
+    dest = module.params.get('dest')
+    if dest:
+        try:
+            f = open(dest, 'w')
+            try:
+                for item in items:
+                    f.write(json.dumps(item, default=str) + '\n')
+                    count += 1
+            finally:
+                f.close()
+        except IOError, e:
+            module.fail_json(msg="Failed to write %s: %s" % (dest, str(e)))
+        return dict(Count=count, Dest=dest)
+
+    index = dict()
+    for item in items:
+        index_item(index, item)
+        count += 1
+    return {'Count': count, index_name: index}
+
+
+def index_by_id(index, item):
+    index[item['Id']] = item
+
+
+def index_record_set(index, record_set):
+    entry = dict((k, v) for k, v in record_set.items() if k not in ('Name', 'Type', 'ResourceRecords'))
+    if 'ResourceRecords' in record_set:
+        entry['Values'] = [record['Value'] for record in record_set['ResourceRecords']]
+    index.setdefault(record_set['Name'], dict()).setdefault(record_set['Type'], []).append(entry)
+
+
 def get_hosted_zone(client, module):
     params = dict()
 
@@ -214,6 +304,11 @@ def list_hosted_zones(client, module):
     if module.params.get('delegation_set_id'):
         params['DelegationSetId'] = module.params.get('delegation_set_id')
 
+    if module.params.get('all_pages'):
+        params.pop('MaxItems', None)
+        return collect_pages(client, module, 'list_hosted_zones', params, 'HostedZones',
+                             'HostedZoneIndex', index_by_id)
+
     results = client.list_hosted_zones(**params)
     return results
 
@@ -304,6 +399,11 @@ def list_health_checks(client, module):
     if module.params.get('next_marker'):
         params['Marker'] = module.params.get('next_marker')
 
+    if module.params.get('all_pages'):
+        params.pop('MaxItems', None)
+        return collect_pages(client, module, 'list_health_checks', params, 'HealthChecks',
+                             'HealthCheckIndex', index_by_id)
+
     results = client.list_health_checks(**params)
     return results
 
@@ -322,6 +422,15 @@ def record_sets_details(client, module):
     if module.params.get('start_record_name'):
         params['StartRecordName'] = module.params.get('start_record_name')
 
+    if module.params.get('all_pages'):
+        params.pop('MaxItems', None)
+        record_type = module.params.get('type')
+        item_filter = None
+        if record_type:
+            item_filter = lambda record_set: record_set['Type'] == record_type
+        return collect_pages(client, module, 'list_resource_record_sets', params, 'ResourceRecordSets',
+                             'RecordSetIndex', index_record_set, item_filter)
+
     if module.params.get('type') and not module.params.get('start_record_name'):
         module.fail_json(msg="start_record_name must be specified if type is set")
     elif module.params.get('type'):
@@ -396,6 +505,8 @@ def main():
             'count',
             'tags',
         ], default='list'),
+        all_pages=dict(type='bool', default=False),
+        dest=dict(type='path'),
         )
     )
 
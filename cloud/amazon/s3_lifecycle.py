@@ -29,8 +29,27 @@ requirements:
 options:
   name:
     description:
-      - "Name of the s3 bucket"
-    required: true
+      - "Name of the s3 bucket. Required unless I(buckets) is given."
+    required: false
+  buckets:
+    description:
+      - "A list of s3 buckets to apply the rules to, instead of I(name). The lifecycle configurations of the buckets are read and updated concurrently; a configuration is only written when a rule changed it. The names of the changed buckets are returned in C(changed_buckets)."
+    required: false
+    default: null
+    version_added: "2.2"
+  rules:
+    description:
+      - "A list of lifecycle rules to apply, in order, instead of a single rule described by the module options. Each rule is a dictionary of the rule options: C(expiration_date), C(expiration_days), C(prefix), C(rule_id), C(state), C(status), C(storage_class), C(transition_date) and C(transition_days). C(state), C(status) and C(storage_class) default to the module options."
+      - "All the rules are applied to the current configuration of a bucket before it is written, so the configuration is written at most once per bucket."
+    required: false
+    default: null
+    version_added: "2.2"
+  concurrency:
+    description:
+      - "Maximum number of buckets to update at the same time."
+    required: false
+    default: 4
+    version_added: "2.2"
   expiration_date:
     description:
       - "Indicates the lifetime of the objects that are subject to the rule by the date they will expire. The value must be ISO-8601 format, the time must be midnight and a GMT timezone must be specified."
@@ -137,11 +156,29 @@ EXAMPLES = '''
     state: present
     status: enabled
 
+# Manage a set of rules on several buckets, writing each bucket's configuration at most once.
+# Rules without a rule_id are matched to the existing rules by their prefix.
+- s3_lifecycle:
+    buckets:
+      - mybucket
+      - myotherbucket
+    rules:
+      - prefix: /logs/
+        transition_days: 7
+        expiration_days: 90
+      - prefix: /backups/
+        storage_class: standard_ia
+        transition_days: 31
+      - prefix: /tmp/
+        state: absent
+
 '''
 
 import xml.etree.ElementTree as ET
 import copy
 import datetime
+import threading
+from multiprocessing.pool import ThreadPool
 
 try:
     import dateutil.parser
@@ -159,32 +196,74 @@ try:
 except ImportError:
     HAS_BOTO = False
 
-def create_lifecycle_rule(connection, module):
-
-    name = module.params.get("name")
-    expiration_date = module.params.get("expiration_date")
-    expiration_days = module.params.get("expiration_days")
-    prefix = module.params.get("prefix")
-    rule_id = module.params.get("rule_id")
-    status = module.params.get("status")
-    storage_class = module.params.get("storage_class")
-    transition_date = module.params.get("transition_date")
-    transition_days = module.params.get("transition_days")
-    changed = False
+MUTUALLY_EXCLUSIVE_OPTIONS = [
+    ['expiration_days', 'expiration_date'],
+    ['expiration_days', 'transition_date'],
+    ['transition_days', 'transition_date'],
+    ['transition_days', 'expiration_date'],
+]
+
+RULE_OPTIONS = ['expiration_date', 'expiration_days', 'prefix', 'rule_id', 'state', 'status', 'storage_class',
+                'transition_date', 'transition_days']
+# Options a rule of the rules list inherits from the module options
+RULE_DEFAULTS = ['state', 'status', 'storage_class']
+
+
+def get_rule_specs(module):
+    if not module.params.get('rules'):
+        return [dict((option, module.params.get(option)) for option in RULE_OPTIONS)]
+
+    specs = []
+    for rule in module.params.get('rules'):
+        for key in rule:
+            if key not in RULE_OPTIONS:
+                module.fail_json(msg='%s is not a valid option for a rule' % key)
+        spec = dict((option, None) for option in RULE_OPTIONS)
+        for option in RULE_DEFAULTS:
+            spec[option] = module.params.get(option)
+        spec.update(rule)
+        specs.append(spec)
+    return specs
+
+
+def validate_rule_spec(spec, module):
+
+    for option_a, option_b in MUTUALLY_EXCLUSIVE_OPTIONS:
+        if spec[option_a] is not None and spec[option_b] is not None:
+            module.fail_json(msg="parameters are mutually exclusive: %s|%s" % (option_a, option_b))
+
+    if spec['state'] not in ('present', 'absent'):
+        module.fail_json(msg="state of a rule must be one of present, absent")
+    if spec['status'] not in ('enabled', 'disabled'):
+        module.fail_json(msg="status of a rule must be one of enabled, disabled")
+    if spec['storage_class'] not in ('glacier', 'standard_ia'):
+        module.fail_json(msg="storage_class of a rule must be one of glacier, standard_ia")
 
-    try:
-        bucket = connection.get_bucket(name)
-    except S3ResponseError, e:
-        module.fail_json(msg=e.message)
+    # If expiration_date set, check string is valid
+    if spec['expiration_date'] is not None:
+        try:
+            datetime.datetime.strptime(spec['expiration_date'], "%Y-%m-%dT%H:%M:%S.000Z")
+        except ValueError, e:
+            module.fail_json(msg="expiration_date is not a valid ISO-8601 format. The time must be midnight and a timezone of GMT must be included")
 
-    # Get the bucket's current lifecycle rules
-    try:
-        current_lifecycle_obj = bucket.get_lifecycle_config()
-    except S3ResponseError, e:
-        if e.error_code == "NoSuchLifecycleConfiguration":
-            current_lifecycle_obj = Lifecycle()
-        else:
-            module.fail_json(msg=e.message)
+    if spec['transition_date'] is not None:
+        try:
+            datetime.datetime.strptime(spec['transition_date'], "%Y-%m-%dT%H:%M:%S.000Z")
+        except ValueError, e:
+            module.fail_json(msg="expiration_date is not a valid ISO-8601 format. The time must be midnight and a timezone of GMT must be included")
+
+    boto_required_version = (2,40,0)
+    if spec['storage_class'] == 'standard_ia' and tuple(map(int, (boto.__version__.split(".")))) < boto_required_version:
+        module.fail_json(msg="'standard_ia' class requires boto >= 2.40.0")
+
+
+def build_rule(spec):
+
+    expiration_date = spec["expiration_date"]
+    expiration_days = spec["expiration_days"]
+    storage_class = spec["storage_class"]
+    transition_date = spec["transition_date"]
+    transition_days = spec["transition_days"]
 
     # Create expiration
     if expiration_days is not None:
@@ -203,7 +282,12 @@ def create_lifecycle_rule(connection, module):
         transition_obj = None
 
     # Create rule
-    rule = Rule(rule_id, prefix, status.title(), expiration_obj, transition_obj)
+    return Rule(spec["rule_id"], spec["prefix"], spec["status"].title(), expiration_obj, transition_obj)
+
+
+def add_lifecycle_rule(current_lifecycle_obj, rule):
+
+    changed = False
 
     # Create lifecycle
     lifecycle_obj = Lifecycle()
@@ -213,7 +297,7 @@ def create_lifecycle_rule(connection, module):
     if current_lifecycle_obj:
         # If rule ID exists, use that for comparison otherwise compare based on prefix
         for existing_rule in current_lifecycle_obj:
-            if rule.id == existing_rule.id:
+            if rule.id is not None and rule.id == existing_rule.id:
                 if compare_rule(rule, existing_rule):
                     lifecycle_obj.append(rule)
                     appended = True
@@ -222,7 +306,9 @@ def create_lifecycle_rule(connection, module):
                     changed = True
                     appended = True
             elif rule.prefix == existing_rule.prefix:
-                existing_rule.id = None
+                # matched on the prefix, so the ids are left out of the comparison
+                existing_rule = copy.deepcopy(existing_rule)
+                existing_rule.id = rule.id
                 if compare_rule(rule, existing_rule):
                     lifecycle_obj.append(rule)
                     appended = True
@@ -240,13 +326,7 @@ def create_lifecycle_rule(connection, module):
         lifecycle_obj.append(rule)
         changed = True
 
-    # Write lifecycle to bucket
-    try:
-        bucket.configure_lifecycle(lifecycle_obj)
-    except S3ResponseError, e:
-        module.fail_json(msg=e.message)
-
-    module.exit_json(changed=changed)
+    return lifecycle_obj, changed
 
 def compare_rule(rule_a, rule_b):
 
@@ -293,30 +373,13 @@ def compare_rule(rule_a, rule_b):
         return False
 
 
-def destroy_lifecycle_rule(connection, module):
+def remove_lifecycle_rule(current_lifecycle_obj, rule_id, prefix):
 
-    name = module.params.get("name")
-    prefix = module.params.get("prefix")
-    rule_id = module.params.get("rule_id")
     changed = False
 
     if prefix is None:
         prefix = ""
 
-    try:
-        bucket = connection.get_bucket(name)
-    except S3ResponseError, e:
-        module.fail_json(msg=e.message)
-
-    # Get the bucket's current lifecycle rules
-    try:
-        current_lifecycle_obj = bucket.get_lifecycle_config()
-    except S3ResponseError, e:
-        if e.error_code == "NoSuchLifecycleConfiguration":
-            module.exit_json(changed=changed)
-        else:
-            module.fail_json(msg=e.message)
-
     # Create lifecycle
     lifecycle_obj = Lifecycle()
 
@@ -337,16 +400,87 @@ def destroy_lifecycle_rule(connection, module):
             else:
                 lifecycle_obj.append(existing_rule)
 
-    # Write lifecycle to bucket or, if there no rules left, delete lifecycle configuration
+    return lifecycle_obj, changed
+
+
+def update_bucket_lifecycle(connection, name, rules):
+    """
+    Applies all the rules to the bucket's lifecycle configuration, in order,
+    and writes the configuration once, only if any rule changed it.
+    """
+
+    bucket = connection.get_bucket(name)
+
+    # Get the bucket's current lifecycle rules
     try:
+        lifecycle_obj = bucket.get_lifecycle_config()
+    except S3ResponseError, e:
+        if e.error_code == "NoSuchLifecycleConfiguration":
+            lifecycle_obj = Lifecycle()
+        else:
+            raise
+
+    changed = False
+    for spec, rule in rules:
+        if spec['state'] == 'present':
+            lifecycle_obj, rule_changed = add_lifecycle_rule(lifecycle_obj, rule)
+        else:
+            lifecycle_obj, rule_changed = remove_lifecycle_rule(lifecycle_obj, spec['rule_id'], spec['prefix'])
+        changed = changed or rule_changed
+
+    # Write lifecycle to bucket or, if there no rules left, delete lifecycle configuration
+    if changed:
         if lifecycle_obj:
             bucket.configure_lifecycle(lifecycle_obj)
         else:
             bucket.delete_lifecycle_configuration()
-    except BotoServerError, e:
-        module.fail_json(msg=e.message)
 
-    module.exit_json(changed=changed)
+    return changed
+
+
+def update_lifecycles(connection, connect, module, specs):
+
+    names = module.params.get("buckets") or [module.params.get("name")]
+    concurrency = module.params.get("concurrency")
+    rules = [(spec, build_rule(spec) if spec['state'] == 'present' else None) for spec in specs]
+
+    # the pool threads each open their own connection
+    threads = threading.local()
+    threads.connection = connection
+
+    def update(name):
+        try:
+            if not hasattr(threads, 'connection'):
+                threads.connection = connect()
+            return update_bucket_lifecycle(threads.connection, name, rules), None
+        except (BotoServerError, S3ResponseError), e:
+            return None, e.message
+        except (boto.exception.NoAuthHandlerFound, AnsibleAWSError), e:
+            return None, str(e)
+
+    if len(names) > 1 and concurrency > 1:
+        pool = ThreadPool(min(concurrency, len(names)))
+        try:
+            results = pool.map(update, names)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = map(update, names)
+
+    if not module.params.get("buckets"):
+        changed, error = results[0]
+        if error:
+            module.fail_json(msg=error)
+        module.exit_json(changed=changed)
+
+    changed_buckets = [name for name, (changed, error) in zip(names, results) if changed]
+    errors = ["%s: %s" % (name, error) for name, (changed, error) in zip(names, results) if error]
+    if errors:
+        module.fail_json(msg="Failed to update the lifecycle of buckets: %s" % "; ".join(errors),
+                         changed=bool(changed_buckets), changed_buckets=changed_buckets)
+
+    module.exit_json(changed=bool(changed_buckets), changed_buckets=changed_buckets)
 
 
 def main():
@@ -354,7 +488,10 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            name = dict(required=True, type='str'),
+            name = dict(required=False, type='str'),
+            buckets = dict(default=None, required=False, type='list'),
+            rules = dict(default=None, required=False, type='list'),
+            concurrency = dict(default=4, required=False, type='int'),
             expiration_days = dict(default=None, required=False, type='int'),
             expiration_date = dict(default=None, required=False, type='str'),
             prefix = dict(default=None, required=False),
@@ -369,12 +506,8 @@ def main():
     )
 
     module = AnsibleModule(argument_spec=argument_spec,
-                           mutually_exclusive = [
-                                                 [ 'expiration_days', 'expiration_date' ],
-                                                 [ 'expiration_days', 'transition_date' ],
-                                                 [ 'transition_days', 'transition_date' ],
-                                                 [ 'transition_days', 'expiration_date' ]
-                                                 ]
+                           mutually_exclusive = MUTUALLY_EXCLUSIVE_OPTIONS + [ [ 'name', 'buckets' ] ],
+                           required_one_of = [ [ 'name', 'buckets' ] ]
                            )
 
     if not HAS_BOTO:
@@ -392,40 +525,24 @@ def main():
         # Boto uses symbolic names for locations but region strings will
         # actually work fine for everything except us-east-1 (US Standard)
         location = region
-    try:
+
+    def connect():
         connection = boto.s3.connect_to_region(location, is_secure=True, calling_format=OrdinaryCallingFormat(), **aws_connect_params)
         # use this as fallback because connect_to_region seems to fail in boto + non 'classic' aws accounts in some cases
         if connection is None:
             connection = boto.connect_s3(**aws_connect_params)
+        return connection
+
+    try:
+        connection = connect()
     except (boto.exception.NoAuthHandlerFound, AnsibleAWSError), e:
         module.fail_json(msg=str(e))
 
-    expiration_date = module.params.get("expiration_date")
-    transition_date = module.params.get("transition_date")
-    state = module.params.get("state")
-    storage_class = module.params.get("storage_class")
-
-    # If expiration_date set, check string is valid
-    if expiration_date is not None:
-        try:
-            datetime.datetime.strptime(expiration_date, "%Y-%m-%dT%H:%M:%S.000Z")
-        except ValueError, e:
-            module.fail_json(msg="expiration_date is not a valid ISO-8601 format. The time must be midnight and a timezone of GMT must be included")
-
-    if transition_date is not None:
-        try:
-            datetime.datetime.strptime(transition_date, "%Y-%m-%dT%H:%M:%S.000Z")
-        except ValueError, e:
-            module.fail_json(msg="expiration_date is not a valid ISO-8601 format. The time must be midnight and a timezone of GMT must be included")
-
-    boto_required_version = (2,40,0)
-    if storage_class == 'standard_ia' and tuple(map(int, (boto.__version__.split(".")))) < boto_required_version:
-        module.fail_json(msg="'standard_ia' class requires boto >= 2.40.0")
+    specs = get_rule_specs(module)
+    for spec in specs:
+        validate_rule_spec(spec, module)
 
-    if state == 'present':
-        create_lifecycle_rule(connection, module)
-    elif state == 'absent':
-        destroy_lifecycle_rule(connection, module)
+    update_lifecycles(connection, connect, module, specs)
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.ec2 import *
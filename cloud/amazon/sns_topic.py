@@ -20,6 +20,7 @@ module: sns_topic
 short_description: Manages AWS SNS topics and subscriptions
 description:
     - The M(sns_topic) module allows you to create, delete, and manage subscriptions for AWS SNS topics.
+    - Many topics can be managed in one task with I(topics).
 version_added: 2.0
 author:
   - "Joel Thompson (@joelthompson)"
@@ -27,8 +28,8 @@ author:
 options:
   name:
     description:
-      - The name or ARN of the SNS topic to converge
-    required: True
+      - The name or ARN of the SNS topic to converge. Required unless I(topics) is given.
+    required: False
   state:
     description:
       - Whether to create or destroy an SNS topic
@@ -66,6 +67,23 @@ options:
         Blame Amazon."
     required: False
     default: True
+  topics:
+    description:
+      - List of topics to converge in one task, instead of I(name). Each item is a dictionary of topic options
+        (C(name), C(state), C(display_name), C(policy), C(delivery_policy), C(subscriptions),
+        C(purge_subscriptions)); C(state) and C(purge_subscriptions) default to the module options.
+      - Existing topics are found with one paginated listing, and the topics are then read and changed
+        concurrently, setting only the attributes and subscriptions which differ. A topic whose requests are
+        throttled is converged again after a jittered exponential backoff.
+    required: False
+    default: None
+    version_added: "2.2"
+  concurrency:
+    description:
+      - Maximum number of topics to read or change at the same time.
+    required: False
+    default: 10
+    version_added: "2.2"
 extends_documentation_fragment: aws
 requirements: [ "boto" ]
 """
@@ -94,6 +112,18 @@ EXAMPLES = """
       - endpoint: "my_mobile_number"
         protocol: "sms"
 
+- name: Converge the topics of several services
+  sns_topic:
+    topics:
+      - name: "orders"
+        display_name: "order events"
+      - name: "payments"
+        subscriptions:
+          - endpoint: "https://payments.example.com/sns"
+            protocol: "https"
+      - name: "legacy"
+        state: absent
+
 """
 
 RETURN = '''
@@ -126,12 +156,23 @@ sns_arn:
     type: string
     returned: state == "present"
     sample: "arn:aws:sns:us-east-1:123456789012:my_topic_name"
+
+topics:
+    description: With topics, the result of each topic, with the keys above plus name, state and changed
+    type: list
+    returned: when topics is given
+    sample: [{"name": "orders", "state": "present", "changed": true, "topic_created": true,
+              "attributes_set": ["display_name"], "subscriptions_added": [], "subscriptions_deleted": [],
+              "sns_arn": "arn:aws:sns:us-east-1:123456789012:orders"}]
 '''
 
 import sys
 import time
 import json
+import random
 import re
+import threading
+from multiprocessing.pool import ThreadPool
 
 try:
     import boto.sns
@@ -148,6 +189,13 @@ def canonicalize_endpoint(protocol, endpoint):
     return endpoint
 
 
+TOPIC_OPTIONS = ('name', 'state', 'display_name', 'policy', 'delivery_policy',
+                 'subscriptions', 'purge_subscriptions')
+
+THROTTLING_ERRORS = ('Throttling', 'Throttled')
+MAX_THROTTLING_DELAY = 30
+
+
 def get_all_topics(connection, module):
     next_token = None
     topics = []
@@ -165,180 +213,262 @@ def get_all_topics(connection, module):
     return [t['TopicArn'] for t in topics]
 
 
-def arn_topic_lookup(connection, short_topic, module):
+def find_topic_arn(name, all_topics):
+    # topics cannot contain ':', so thats the decider
+    if ':' in name:
+        if name in all_topics:
+            return name
+        return None
+
     # topic names cannot have colons, so this captures the full topic name
-    all_topics = get_all_topics(connection, module)
-    lookup_topic = ':%s' % short_topic
+    lookup_topic = ':%s' % name
     for topic in all_topics:
         if topic.endswith(lookup_topic):
             return topic
     return None
 
 
-def main():
-    argument_spec = ec2_argument_spec()
-    argument_spec.update(
-        dict(
-            name=dict(type='str', required=True),
-            state=dict(type='str', default='present', choices=['present',
-                'absent']),
-            display_name=dict(type='str', required=False),
-            policy=dict(type='dict', required=False),
-            delivery_policy=dict(type='dict', required=False),
-            subscriptions=dict(default=[], type='list', required=False),
-            purge_subscriptions=dict(type='bool', default=True),
-        )
-    )
+def arn_topic_lookup(connection, short_topic, module):
+    return find_topic_arn(short_topic, get_all_topics(connection, module))
+
+
+def get_topic_specs(module):
+    if not module.params.get('topics'):
+        return [dict((option, module.params.get(option)) for option in TOPIC_OPTIONS)]
+
+    specs = []
+    for topic in module.params.get('topics'):
+        for key in topic:
+            if key not in TOPIC_OPTIONS:
+                module.fail_json(msg='%s is not a valid option for a topic' % key)
+        if not topic.get('name'):
+            module.fail_json(msg='name is required for every topic')
+        spec = dict((option, None) for option in TOPIC_OPTIONS)
+        spec.update(state=module.params.get('state'), subscriptions=[],
+                    purge_subscriptions=module.params.get('purge_subscriptions'))
+        spec.update(topic)
+        if spec['state'] not in ('present', 'absent'):
+            module.fail_json(msg='state of a topic must be one of present, absent')
+        specs.append(spec)
+    return specs
+
+
+def get_topic_subscriptions(connection, arn_topic):
+    next_token = None
+    aws_subscriptions = []
+    while True:
+        response = connection.get_all_subscriptions_by_topic(arn_topic,
+            next_token)
 
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+        aws_subscriptions.extend(response['ListSubscriptionsByTopicResponse'] \
+                ['ListSubscriptionsByTopicResult']['Subscriptions'])
+        next_token = response['ListSubscriptionsByTopicResponse'] \
+                ['ListSubscriptionsByTopicResult']['NextToken']
+        if not next_token:
+            break
+    return aws_subscriptions
 
-    if not HAS_BOTO:
-        module.fail_json(msg='boto required for this module')
 
-    name = module.params.get('name')
-    state = module.params.get('state')
-    display_name = module.params.get('display_name')
-    policy = module.params.get('policy')
-    delivery_policy = module.params.get('delivery_policy')
-    subscriptions = module.params.get('subscriptions')
-    purge_subscriptions = module.params.get('purge_subscriptions')
-    check_mode = module.check_mode
-    changed = False
-
-    topic_created = False
-    attributes_set = []
-    subscriptions_added = []
-    subscriptions_deleted = []
+def get_attribute_changes(spec, topic_attributes):
+    """
+    Returns (option, attribute, value) for every attribute of spec which
+    differs from the existing topic attributes.
+    """
+    changes = []
+    display_name = spec.get('display_name')
+    if display_name and display_name != topic_attributes.get('DisplayName'):
+        changes.append(('display_name', 'DisplayName', display_name))
 
-    region, ec2_url, aws_connect_params = get_aws_connection_info(module)
-    if not region:
-        module.fail_json(msg="region must be specified")
-    try:
-        connection = connect_to_aws(boto.sns, region, **aws_connect_params)
-    except boto.exception.NoAuthHandlerFound, e:
-        module.fail_json(msg=str(e))
+    policy = spec.get('policy')
+    if policy and ('Policy' not in topic_attributes or \
+            policy != json.loads(topic_attributes['Policy'])):
+        changes.append(('policy', 'Policy', json.dumps(policy)))
 
-    # topics cannot contain ':', so thats the decider
-    if ':' in name:
-        all_topics = get_all_topics(connection, module)
-        if name in all_topics:
-            arn_topic = name
-        elif state == 'absent':
-            module.exit_json(changed=False)
-        else:
-            module.fail_json(msg="specified an ARN for a topic but it doesn't"
-                    " exist")
-    else:
-        arn_topic = arn_topic_lookup(connection, name, module)
-        if not arn_topic:
-            if state == 'absent':
-                module.exit_json(changed=False)
-            elif check_mode:
-                module.exit_json(changed=True, topic_created=True,
-                        subscriptions_added=subscriptions,
-                        subscriptions_deleted=[])
-            
-            changed=True
-            topic_created = True
-            try:
-                connection.create_topic(name)
-            except BotoServerError, e:
-                module.fail_json(msg=e.message)
-            arn_topic = arn_topic_lookup(connection, name, module)
-            while not arn_topic:
-                time.sleep(3)
-                arn_topic = arn_topic_lookup(connection, name, module)
-    
-    if arn_topic and state == "absent":
+    delivery_policy = spec.get('delivery_policy')
+    if delivery_policy and ('DeliveryPolicy' not in topic_attributes or \
+            delivery_policy != json.loads(topic_attributes['DeliveryPolicy'])):
+        changes.append(('delivery_policy', 'DeliveryPolicy', json.dumps(delivery_policy)))
+    return changes
+
+
+def ensure_topic(connection, spec, all_topics, check_mode=False):
+    """
+    Converges one topic and returns its result. all_topics are the ARNs of
+    the existing topics, so that a topic is never looked up on its own.
+    """
+    name = spec['name']
+    state = spec['state']
+    result = dict(name=name, state=state, changed=False)
+
+    arn_topic = find_topic_arn(name, all_topics)
+    if not arn_topic:
+        if state == 'absent':
+            return result
+
+        desired_subscriptions = [(sub['protocol'],
+            canonicalize_endpoint(sub['protocol'], sub['endpoint'])) for sub in
+            spec['subscriptions'] or []]
+        result.update(changed=True, topic_created=True)
+        if check_mode:
+            result.update(subscriptions_added=desired_subscriptions,
+                          subscriptions_deleted=[])
+            return result
+
+        # the ARN of the new topic is returned by CreateTopic, there is no
+        # need to wait for it to show up in the listing
+        response = connection.create_topic(name)
+        arn_topic = response['CreateTopicResponse']['CreateTopicResult']['TopicArn']
+
+    if state == 'absent':
         if not check_mode:
-            try:
-                connection.delete_topic(arn_topic)
-            except BotoServerError, e:
-                module.fail_json(msg=e.message)
-
-        module.exit_json(changed=True)
+            connection.delete_topic(arn_topic)
+        result['changed'] = True
+        return result
 
     topic_attributes = connection.get_topic_attributes(arn_topic) \
             ['GetTopicAttributesResponse'] ['GetTopicAttributesResult'] \
             ['Attributes']
-    if display_name and display_name != topic_attributes['DisplayName']:
-        changed = True
-        attributes_set.append('display_name')
-        if not check_mode:
-            try:
-                connection.set_topic_attributes(arn_topic, 'DisplayName', display_name)
-            except BotoServerError, e:
-                module.fail_json(msg=e.message)
 
-    if policy and policy != json.loads(topic_attributes['Policy']):
-        changed = True
-        attributes_set.append('policy')
-        if not check_mode:
-            try:
-                connection.set_topic_attributes(arn_topic, 'Policy', json.dumps(policy))
-            except BotoServerError, e:
-                module.fail_json(msg=e.message)
-    
-    if delivery_policy and ('DeliveryPolicy' not in topic_attributes or \
-            delivery_policy != json.loads(topic_attributes['DeliveryPolicy'])):
-        changed = True
-        attributes_set.append('delivery_policy')
+    attributes_set = []
+    for option, attribute, value in get_attribute_changes(spec, topic_attributes):
+        attributes_set.append(option)
         if not check_mode:
-            try:
-                connection.set_topic_attributes(arn_topic, 'DeliveryPolicy',json.dumps(delivery_policy))
-            except BotoServerError, e:
-                module.fail_json(msg=e.message)
+            connection.set_topic_attributes(arn_topic, attribute, value)
 
-
-    next_token = None
-    aws_subscriptions = []
-    while True:
-        try:
-            response = connection.get_all_subscriptions_by_topic(arn_topic,
-                next_token)
-        except BotoServerError, e:
-            module.fail_json(msg=e.message)
-
-        aws_subscriptions.extend(response['ListSubscriptionsByTopicResponse'] \
-                ['ListSubscriptionsByTopicResult']['Subscriptions'])
-        next_token = response['ListSubscriptionsByTopicResponse'] \
-                ['ListSubscriptionsByTopicResult']['NextToken']
-        if not next_token:
-            break
+    aws_subscriptions = get_topic_subscriptions(connection, arn_topic)
 
     desired_subscriptions = [(sub['protocol'],
         canonicalize_endpoint(sub['protocol'], sub['endpoint'])) for sub in
-        subscriptions]
-    
+        spec['subscriptions'] or []]
+
     aws_subscriptions_list = []
+    subscriptions_deleted = []
+    subscriptions_added = []
 
     for sub in aws_subscriptions:
         sub_key = (sub['Protocol'], sub['Endpoint'])
         aws_subscriptions_list.append(sub_key)
-        if purge_subscriptions and sub_key not in desired_subscriptions and \
+        if spec['purge_subscriptions'] and sub_key not in desired_subscriptions and \
                 sub['SubscriptionArn'] != 'PendingConfirmation':
-            changed = True
             subscriptions_deleted.append(sub_key)
             if not check_mode:
-                try:
-                    connection.unsubscribe(sub['SubscriptionArn'])
-                except BotoServerError, e:
-                    module.fail_json(msg=e.message)
+                connection.unsubscribe(sub['SubscriptionArn'])
 
     for (protocol, endpoint) in desired_subscriptions:
         if (protocol, endpoint) not in aws_subscriptions_list:
-            changed = True
-            subscriptions_added.append(sub)
+            subscriptions_added.append((protocol, endpoint))
             if not check_mode:
-                try:
-                    connection.subscribe(arn_topic, protocol, endpoint)
-                except BotoServerError, e:
-                    module.fail_json(msg=e.message)
-
-    module.exit_json(changed=changed, topic_created=topic_created,
-            attributes_set=attributes_set,
-            subscriptions_added=subscriptions_added,
-            subscriptions_deleted=subscriptions_deleted, sns_arn=arn_topic)
+                connection.subscribe(arn_topic, protocol, endpoint)
+
+    if attributes_set or subscriptions_added or subscriptions_deleted:
+        result['changed'] = True
+    result.update(topic_created=result.get('topic_created', False),
+                  attributes_set=attributes_set,
+                  subscriptions_added=subscriptions_added,
+                  subscriptions_deleted=subscriptions_deleted,
+                  sns_arn=arn_topic)
+    return result
+
+
+def ensure_topics(connection, connect, module, specs):
+    """
+    Converges every topic of specs on a thread pool of at most concurrency
+    threads, each with its own connection. Returns (result, error) tuples
+    in the order of specs.
+    """
+    concurrency = module.params.get('concurrency')
+    all_topics = get_all_topics(connection, module)
+
+    for spec in specs:
+        if ':' in spec['name'] and spec['state'] == 'present' and spec['name'] not in all_topics:
+            module.fail_json(msg="specified an ARN for a topic but it doesn't"
+                    " exist: %s" % spec['name'])
+
+    threads = threading.local()
+    threads.connection = connection
+
+    def converge(spec):
+        # a throttled topic is converged again from scratch after a jittered
+        # exponential backoff, which is safe as ensure_topic is idempotent
+        delay = 1
+        while True:
+            try:
+                if not hasattr(threads, 'connection'):
+                    threads.connection = connect()
+                return ensure_topic(threads.connection, spec, all_topics, module.check_mode), None
+            except BotoServerError, e:
+                if e.error_code not in THROTTLING_ERRORS or delay > MAX_THROTTLING_DELAY:
+                    return None, e.message
+            except (boto.exception.NoAuthHandlerFound, AnsibleAWSError), e:
+                return None, str(e)
+            time.sleep(delay + random.uniform(0, delay))
+            delay *= 2
+
+    if len(specs) > 1 and concurrency > 1:
+        pool = ThreadPool(min(concurrency, len(specs)))
+        try:
+            return pool.map(converge, specs)
+        finally:
+            pool.close()
+            pool.join()
+    return map(converge, specs)
+
+
+def main():
+    argument_spec = ec2_argument_spec()
+    argument_spec.update(
+        dict(
+            name=dict(type='str', required=False),
+            state=dict(type='str', default='present', choices=['present',
+                'absent']),
+            display_name=dict(type='str', required=False),
+            policy=dict(type='dict', required=False),
+            delivery_policy=dict(type='dict', required=False),
+            subscriptions=dict(default=[], type='list', required=False),
+            purge_subscriptions=dict(type='bool', default=True),
+            topics=dict(type='list', required=False),
+            concurrency=dict(type='int', default=10),
+        )
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           mutually_exclusive=[['name', 'topics']],
+                           required_one_of=[['name', 'topics']],
+                           supports_check_mode=True)
+
+    if not HAS_BOTO:
+        module.fail_json(msg='boto required for this module')
+
+    region, ec2_url, aws_connect_params = get_aws_connection_info(module)
+    if not region:
+        module.fail_json(msg="region must be specified")
+
+    def connect():
+        return connect_to_aws(boto.sns, region, **aws_connect_params)
+
+    try:
+        connection = connect()
+    except boto.exception.NoAuthHandlerFound, e:
+        module.fail_json(msg=str(e))
+
+    specs = get_topic_specs(module)
+    results = ensure_topics(connection, connect, module, specs)
+
+    if not module.params.get('topics'):
+        result, error = results[0]
+        if error:
+            module.fail_json(msg=error)
+        del result['name'], result['state']
+        module.exit_json(**result)
+
+    topics = [result for result, error in results if result]
+    changed = any(topic['changed'] for topic in topics)
+    errors = ['%s: %s' % (spec['name'], error) for spec, (result, error) in zip(specs, results) if error]
+    if errors:
+        module.fail_json(msg='Failed to converge topics: %s' % '; '.join(errors),
+                         changed=changed, topics=topics)
+
+    module.exit_json(changed=changed, topics=topics)
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.ec2 import *
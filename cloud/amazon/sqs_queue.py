@@ -21,6 +21,7 @@ short_description: Creates or deletes AWS SQS queues.
 description:
   - Create or delete AWS SQS queues.
   - Update attributes on existing queues.
+  - Manage many queues in one task with I(queues).
 version_added: "2.0"
 author:
   - Alan Loi (@loia)
@@ -36,8 +37,8 @@ options:
     default: 'present'
   name:
     description:
-      - Name of the queue.
-    required: true
+      - Name of the queue. Required unless I(queues) is given.
+    required: false
   default_visibility_timeout:
     description:
       - The default visibility timeout in seconds.
@@ -69,6 +70,23 @@ options:
     required: false
     default: null
     version_added: "2.1"
+  queues:
+    description:
+      - List of queues to manage in one task, instead of I(name). Each item is a dictionary of queue options
+        (C(name), C(state), C(default_visibility_timeout), C(message_retention_period), C(maximum_message_size),
+        C(delivery_delay), C(receive_message_wait_time), C(policy)); C(state) defaults to I(state).
+      - Existing queues are found with one listing of the region and their attributes are read concurrently;
+        only the attributes which differ are set. The result of each queue is returned in C(queues).
+      - A queue whose requests are throttled is converged again after a jittered exponential backoff.
+    required: false
+    default: null
+    version_added: "2.2"
+  concurrency:
+    description:
+      - Maximum number of queues to read or change at the same time.
+    required: false
+    default: 10
+    version_added: "2.2"
 extends_documentation_fragment:
     - aws
     - ec2
@@ -91,10 +109,27 @@ EXAMPLES = '''
     name: my-queue
     region: ap-southeast-2
     state: absent
+
+# Converge several SQS queues at once
+- sqs_queue:
+    region: ap-southeast-2
+    queues:
+      - name: orders
+        default_visibility_timeout: 120
+      - name: orders-dead-letter
+        message_retention_period: 1209600
+      - name: legacy-queue
+        state: absent
 '''
 
+import random
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
 try:
     import boto.sqs
+    from boto.sqs.queue import Queue
     from boto.exception import BotoServerError, NoAuthHandlerFound
     HAS_BOTO = True
 
@@ -102,16 +137,170 @@ except ImportError:
     HAS_BOTO = False
 
 
+# module option -> SQS attribute
+QUEUE_ATTRIBUTES = [
+    ('default_visibility_timeout', 'VisibilityTimeout'),
+    ('message_retention_period', 'MessageRetentionPeriod'),
+    ('maximum_message_size', 'MaximumMessageSize'),
+    ('delivery_delay', 'DelaySeconds'),
+    ('receive_message_wait_time', 'ReceiveMessageWaitTimeSeconds'),
+    ('policy', 'Policy'),
+]
+
+QUEUE_OPTIONS = ['name', 'state'] + [option for option, attribute in QUEUE_ATTRIBUTES]
+
+THROTTLING_ERRORS = ('Throttling', 'RequestThrottled', 'AWS.SimpleQueueService.RequestThrottled')
+MAX_THROTTLING_DELAY = 30
+
+# ListQueues returns at most this many queue URLs and cannot be paged
+LIST_QUEUES_LIMIT = 1000
+
+
+def get_queue_specs(module):
+    if not module.params.get('queues'):
+        return [dict((option, module.params.get(option)) for option in QUEUE_OPTIONS)]
+
+    specs = []
+    for queue in module.params.get('queues'):
+        for key in queue:
+            if key not in QUEUE_OPTIONS:
+                module.fail_json(msg='%s is not a valid option for a queue' % key)
+        if not queue.get('name'):
+            module.fail_json(msg='name is required for every queue')
+        spec = dict((option, None) for option in QUEUE_OPTIONS)
+        spec['state'] = module.params.get('state')
+        spec.update(queue)
+        if spec['state'] not in ('present', 'absent'):
+            module.fail_json(msg='state of a queue must be one of present, absent')
+        specs.append(spec)
+    return specs
+
+
+def list_queue_urls(connection):
+    queues = connection.get_all_queues()
+    return dict((queue.name, queue.url) for queue in queues)
+
+
+def find_queue(connection, name, queue_urls=None):
+    # Queues found by the listing are bound to the connection of the calling
+    # thread; without a listing, or when the listing was truncated, fall back
+    # to looking the queue up by name
+    if queue_urls is not None:
+        if name in queue_urls:
+            return Queue(connection, queue_urls[name])
+        if len(queue_urls) < LIST_QUEUES_LIMIT:
+            return None
+    return connection.get_queue(name)
+
+
+def get_attribute_changes(spec, existing):
+    """
+    Returns the (attribute, value) pairs of spec which differ from the
+    existing queue attributes.
+    """
+    changes = []
+    for option, attribute in QUEUE_ATTRIBUTES:
+        value = spec.get(option)
+        if not value:
+            continue
+
+        existing_value = existing.get(attribute, '')
+
+        # convert dict attributes to JSON strings (sort keys for comparing)
+        if attribute == 'Policy':
+            value = json.dumps(value, sort_keys=True)
+            if existing_value:
+                existing_value = json.dumps(json.loads(existing_value), sort_keys=True)
+
+        if str(value) != existing_value:
+            changes.append((attribute, value))
+    return changes
+
+
+def ensure_queue(connection, spec, queue_urls=None, check_mode=False):
+    """
+    Converges one queue and returns a dictionary with name, state, changed,
+    and for present queues, the attributes which were set.
+    """
+    result = dict(name=spec['name'], state=spec['state'], changed=False)
+    queue = find_queue(connection, spec['name'], queue_urls)
+
+    if spec['state'] == 'absent':
+        if queue:
+            if not check_mode:
+                connection.delete_queue(queue)
+            result['changed'] = True
+        return result
+
+    if queue:
+        existing = queue.get_attributes('All')
+    else:
+        result['changed'] = True
+        if not check_mode:
+            queue = connection.create_queue(spec['name'])
+        existing = {}
+
+    changes = get_attribute_changes(spec, existing)
+    if changes:
+        result['changed'] = True
+        if not check_mode:
+            for attribute, value in changes:
+                queue.set_attribute(attribute, value)
+    result['attributes_set'] = [attribute for attribute, value in changes]
+    return result
+
+
+def ensure_sqs_queues(connect, module, specs):
+    concurrency = module.params.get('concurrency')
+    threads = threading.local()
+    try:
+        threads.connection = connect()
+        queue_urls = list_queue_urls(threads.connection)
+    except (BotoServerError, NoAuthHandlerFound, AnsibleAWSError):
+        module.fail_json(msg='Failed to list sqs queues due to error: ' + traceback.format_exc())
+
+    def converge(spec):
+        # when throttled, start the whole queue over later: ensure_queue
+        # reads the queue again before changing anything
+        delay = 1
+        while True:
+            try:
+                if not hasattr(threads, 'connection'):
+                    threads.connection = connect()
+                return ensure_queue(threads.connection, spec, queue_urls, module.check_mode), None
+            except BotoServerError as e:
+                if e.error_code not in THROTTLING_ERRORS or delay > MAX_THROTTLING_DELAY:
+                    return None, traceback.format_exc()
+            except (NoAuthHandlerFound, AnsibleAWSError):
+                return None, traceback.format_exc()
+            time.sleep(delay + random.uniform(0, delay))
+            delay *= 2
+
+    if len(specs) > 1 and concurrency > 1:
+        pool = ThreadPool(min(concurrency, len(specs)))
+        try:
+            results = pool.map(converge, specs)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = map(converge, specs)
+
+    queues = [queue for queue, error in results if queue]
+    changed = any(queue['changed'] for queue in queues)
+    errors = ['%s: %s' % (spec['name'], error) for spec, (queue, error) in zip(specs, results) if error]
+    if errors:
+        module.fail_json(msg='Failed to converge sqs queues due to error: ' + '; '.join(errors),
+                         changed=changed, queues=queues)
+
+    module.exit_json(changed=changed, queues=queues)
+
+
 def create_or_update_sqs_queue(connection, module):
     queue_name = module.params.get('name')
 
     queue_attributes = dict(
-        default_visibility_timeout=module.params.get('default_visibility_timeout'),
-        message_retention_period=module.params.get('message_retention_period'),
-        maximum_message_size=module.params.get('maximum_message_size'),
-        delivery_delay=module.params.get('delivery_delay'),
-        receive_message_wait_time=module.params.get('receive_message_wait_time'),
-        policy=module.params.get('policy'),
+        (option, module.params.get(option)) for option, attribute in QUEUE_ATTRIBUTES
     )
 
     result = dict(
@@ -120,18 +309,9 @@ def create_or_update_sqs_queue(connection, module):
     )
     result.update(queue_attributes)
 
+    spec = dict(queue_attributes, name=queue_name, state='present')
     try:
-        queue = connection.get_queue(queue_name)
-        if queue:
-            # Update existing
-            result['changed'] = update_sqs_queue(queue, check_mode=module.check_mode, **queue_attributes)
-
-        else:
-            # Create new
-            if not module.check_mode:
-                queue = connection.create_queue(queue_name)
-                update_sqs_queue(queue, **queue_attributes)
-            result['changed'] = True
+        result['changed'] = ensure_queue(connection, spec, check_mode=module.check_mode)['changed']
 
     except BotoServerError:
         result['msg'] = 'Failed to create/update sqs queue due to error: ' + traceback.format_exc()
@@ -140,54 +320,6 @@ def create_or_update_sqs_queue(connection, module):
         module.exit_json(**result)
 
 
-def update_sqs_queue(queue,
-                     check_mode=False,
-                     default_visibility_timeout=None,
-                     message_retention_period=None,
-                     maximum_message_size=None,
-                     delivery_delay=None,
-                     receive_message_wait_time=None,
-                     policy=None):
-    changed = False
-
-    changed = set_queue_attribute(queue, 'VisibilityTimeout', default_visibility_timeout,
-                                  check_mode=check_mode) or changed
-    changed = set_queue_attribute(queue, 'MessageRetentionPeriod', message_retention_period,
-                                  check_mode=check_mode) or changed
-    changed = set_queue_attribute(queue, 'MaximumMessageSize', maximum_message_size,
-                                  check_mode=check_mode) or changed
-    changed = set_queue_attribute(queue, 'DelaySeconds', delivery_delay,
-                                  check_mode=check_mode) or changed
-    changed = set_queue_attribute(queue, 'ReceiveMessageWaitTimeSeconds', receive_message_wait_time,
-                                  check_mode=check_mode) or changed
-    changed = set_queue_attribute(queue, 'Policy', policy,
-                                  check_mode=check_mode) or changed
-    return changed
-
-
-def set_queue_attribute(queue, attribute, value, check_mode=False):
-    if not value:
-        return False
-
-    try:
-        existing_value = queue.get_attributes(attributes=attribute)[attribute]
-    except:
-        existing_value = ''
-
-    # convert dict attributes to JSON strings (sort keys for comparing)
-    if attribute is 'Policy':
-        value = json.dumps(value, sort_keys=True)
-        if existing_value:
-            existing_value = json.dumps(json.loads(existing_value), sort_keys=True)
-
-    if str(value) != existing_value:
-        if not check_mode:
-            queue.set_attribute(attribute, value)
-        return True
-
-    return False
-
-
 def delete_sqs_queue(connection, module):
     queue_name = module.params.get('name')
 
@@ -196,15 +328,9 @@ def delete_sqs_queue(connection, module):
         name=queue_name,
     )
 
+    spec = dict(name=queue_name, state='absent')
     try:
-        queue = connection.get_queue(queue_name)
-        if queue:
-            if not module.check_mode:
-                connection.delete_queue(queue)
-            result['changed'] = True
-
-        else:
-            result['changed'] = False
+        result['changed'] = ensure_queue(connection, spec, check_mode=module.check_mode)['changed']
 
     except BotoServerError:
         result['msg'] = 'Failed to delete sqs queue due to error: ' + traceback.format_exc()
@@ -217,17 +343,21 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(dict(
         state=dict(default='present', choices=['present', 'absent']),
-        name=dict(required=True, type='str'),
+        name=dict(required=False, type='str'),
         default_visibility_timeout=dict(type='int'),
         message_retention_period=dict(type='int'),
         maximum_message_size=dict(type='int'),
         delivery_delay=dict(type='int'),
         receive_message_wait_time=dict(type='int'),
         policy=dict(type='dict', required=False),
+        queues=dict(type='list', required=False),
+        concurrency=dict(type='int', default=10),
     ))
 
     module = AnsibleModule(
         argument_spec=argument_spec,
+        mutually_exclusive=[['name', 'queues']],
+        required_one_of=[['name', 'queues']],
         supports_check_mode=True)
 
     if not HAS_BOTO:
@@ -237,6 +367,10 @@ def main():
     if not region:
         module.fail_json(msg='region must be specified')
 
+    if module.params.get('queues'):
+        ensure_sqs_queues(lambda: connect_to_aws(boto.sqs, region, **aws_connect_params),
+                          module, get_queue_specs(module))
+
     try:
         connection = connect_to_aws(boto.sqs, region, **aws_connect_params)
 
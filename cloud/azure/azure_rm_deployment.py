@@ -70,6 +70,31 @@ options:
         one of them is required if "state" parameter is "present".
     required: false
     default: null
+  wait_for_deployment_completion:
+    description:
+      - Whether to wait for the deployment to reach a final state.
+    required: false
+    default: true
+  wait_for_deployment_polling_period:
+    description:
+      - Longest time in seconds to wait between two status checks of the deployment. Polling starts every 5
+        seconds and backs off up to this period while no deployment operation completes.
+    required: false
+    default: 30
+  fail_fast:
+    description:
+      - Stop waiting and fail as soon as one of the deployment operations fails, instead of waiting for the
+        whole deployment to finish. The deployment itself keeps running in Azure.
+    required: false
+    default: false
+    version_added: "2.2"
+  concurrency:
+    description:
+      - Number of nested deployments whose operations are retrieved at the same time when looking for the
+        operations which failed.
+    required: false
+    default: 8
+    version_added: "2.2"
 
 extends_documentation_fragment:
     - azure
@@ -340,6 +365,11 @@ deployment:
         description: Dictionary of outputs received from the deployment
         type: dict
         returned: always
+      operations:
+        description: Deployment operations in the order they completed, as seen while waiting for the deployment.
+        type: list
+        returned: when wait_for_deployment_completion is true
+        version_added: "2.2"
 '''
 
 PREREQ_IMPORT_ERROR = None
@@ -347,6 +377,7 @@ PREREQ_IMPORT_ERROR = None
 try:
     import time
     import yaml
+    from multiprocessing.pool import ThreadPool
 except ImportError as exc:
     IMPORT_ERROR = "Error importing module prerequisites: %s" % exc
 
@@ -369,6 +400,10 @@ except ImportError:
     # This is handled in azure_rm_common
     pass
 
+DEPLOYMENT_FINAL_STATES = ['Canceled', 'Failed', 'Deleted', 'Succeeded']
+OPERATION_FINAL_STATES = ['Canceled', 'Failed', 'Succeeded']
+MIN_POLLING_PERIOD = 5
+
 
 class AzureRMDeploymentManager(AzureRMModuleBase):
 
@@ -385,7 +420,9 @@ class AzureRMDeploymentManager(AzureRMModuleBase):
             deployment_mode=dict(type='str', default='complete', choices=['complete', 'incremental']),
             deployment_name=dict(type='str', default="ansible-arm"),
             wait_for_deployment_completion=dict(type='bool', default=True),
-            wait_for_deployment_polling_period=dict(type='int', default=30)
+            wait_for_deployment_polling_period=dict(type='int', default=30),
+            fail_fast=dict(type='bool', default=False),
+            concurrency=dict(type='int', default=8)
         )
 
         mutually_exclusive = [('template', 'template_link'),
@@ -402,7 +439,10 @@ class AzureRMDeploymentManager(AzureRMModuleBase):
         self.deployment_name = None
         self.wait_for_deployment_completion = None
         self.wait_for_deployment_polling_period = None
+        self.fail_fast = None
+        self.concurrency = None
         self.tags = None
+        self.completed_operations = []
 
         self.results = dict(
             deployment=dict(),
@@ -431,6 +471,8 @@ class AzureRMDeploymentManager(AzureRMModuleBase):
                 outputs=deployment.properties.outputs,
                 instances=self._get_instances(deployment)
             )
+            if self.wait_for_deployment_completion:
+                self.results['deployment']['operations'] = self.completed_operations
             self.results['changed'] = True
             self.results['msg'] = 'deployment succeeded'
         else:
@@ -479,24 +521,85 @@ class AzureRMDeploymentManager(AzureRMModuleBase):
 
             deployment_result = self.get_poller_result(result)
             if self.wait_for_deployment_completion:
-                while deployment_result.properties.provisioning_state not in ['Canceled', 'Failed', 'Deleted',
-                                                                              'Succeeded']:
-                    time.sleep(self.wait_for_deployment_polling_period)
-                    deployment_result = self.rm_client.deployments.get(self.resource_group_name, self.deployment_name)
+                deployment_result = self._wait_for_deployment(deployment_result)
         except CloudError as exc:
             failed_deployment_operations = self._get_failed_deployment_operations(self.deployment_name)
             self.log("Deployment failed %s: %s" % (exc.status_code, exc.message))
             self.fail("Deployment failed with status code: %s and message: %s" % (exc.status_code, exc.message),
-                      failed_deployment_operations=failed_deployment_operations)
+                      failed_deployment_operations=failed_deployment_operations,
+                      completed_operations=self.completed_operations)
 
         if self.wait_for_deployment_completion and deployment_result.properties.provisioning_state != 'Succeeded':
             self.log("provisioning state: %s" % deployment_result.properties.provisioning_state)
             failed_deployment_operations = self._get_failed_deployment_operations(self.deployment_name)
             self.fail('Deployment failed. Deployment id: %s' % deployment_result.id,
-                      failed_deployment_operations=failed_deployment_operations)
+                      failed_deployment_operations=failed_deployment_operations,
+                      completed_operations=self.completed_operations)
 
         return deployment_result
 
+    def _wait_for_deployment(self, deployment_result):
+        '''
+        Wait for the deployment to reach a final state. Each poll lists the deployment operations and the
+        deployment itself is read once none of them is running anymore, and at least every
+        wait_for_deployment_polling_period seconds whatever the operations report. The delay between polls
+        doubles up to wait_for_deployment_polling_period and goes back to the shortest one whenever an
+        operation completes.
+
+        :param deployment_result: Deployment as returned when it was submitted
+        :return: Deployment in a final state
+        '''
+        min_delay = min(MIN_POLLING_PERIOD, self.wait_for_deployment_polling_period)
+        delay = min_delay
+        seen = set()
+        last_read = time.time()
+        while deployment_result.properties.provisioning_state not in DEPLOYMENT_FINAL_STATES:
+            time.sleep(delay)
+            progressed, running, failed = self._poll_deployment_operations(seen)
+            if failed and self.fail_fast:
+                failed_deployment_operations = self._format_operations(self._get_failed_nested_operations(failed))
+                self.fail('Deployment operation failed. Deployment: %s' % self.deployment_name,
+                          failed_deployment_operations=failed_deployment_operations,
+                          completed_operations=self.completed_operations)
+            delay = min_delay if progressed else min(delay * 2, self.wait_for_deployment_polling_period)
+            if not running or time.time() - last_read >= self.wait_for_deployment_polling_period:
+                deployment_result = self.rm_client.deployments.get(self.resource_group_name, self.deployment_name)
+                last_read = time.time()
+        self._poll_deployment_operations(seen)
+        return deployment_result
+
+    def _poll_deployment_operations(self, seen):
+        '''
+        List the operations of the deployment and record the ones which completed since the last poll.
+
+        :param seen: set of the ids of the operations already recorded
+        :return: tuple of whether an operation completed, whether one is still running and the failed ones
+        '''
+        try:
+            operations = list(self.rm_client.deployment_operations.list(self.resource_group_name,
+                                                                        self.deployment_name))
+        except CloudError as exc:
+            # the deployment itself is still polled, so this poll only loses the reporting
+            self.log("List deployment operations failed with status code: %s and message: %s" %
+                     (exc.status_code, exc.message))
+            return False, False, []
+        progressed = False
+        running = False
+        failed = []
+        for op in operations:
+            if op.properties.provisioning_state not in OPERATION_FINAL_STATES:
+                running = True
+                continue
+            if op.properties.provisioning_state == 'Failed':
+                failed.append(op)
+            if op.operation_id not in seen:
+                seen.add(op.operation_id)
+                progressed = True
+                operation = self._format_operations([op])[0]
+                self.completed_operations.append(operation)
+                self.log("Deployment operation completed: %s" % operation)
+        return progressed, running, failed
+
     def destroy_resource_group(self):
         """
         Destroy the targeted resource group
@@ -524,24 +627,66 @@ class AzureRMDeploymentManager(AzureRMModuleBase):
             return False
         return True
 
+    def _list_deployment_operations(self, deployment_names):
+        '''
+        List the operations of several deployments, up to concurrency at a time.
+
+        :param deployment_names: list of deployment names
+        :return: list of (operations, CloudError or None) tuples in the order of deployment_names
+        '''
+        def list_operations(deployment_name):
+            try:
+                return list(self.rm_client.deployment_operations.list(self.resource_group_name,
+                                                                      deployment_name)), None
+            except CloudError as exc:
+                return [], exc
+
+        if len(deployment_names) > 1 and self.concurrency > 1:
+            pool = ThreadPool(min(self.concurrency, len(deployment_names)))
+            try:
+                return pool.map(list_operations, deployment_names)
+            finally:
+                pool.close()
+                pool.join()
+        return [list_operations(name) for name in deployment_names]
+
     def _get_failed_nested_operations(self, current_operations):
         new_operations = []
-        for operation in current_operations:
-            if operation.properties.provisioning_state == 'Failed':
-                new_operations.append(operation)
-                if operation.properties.target_resource and \
-                   'Microsoft.Resources/deployments' in operation.properties.target_resource.id:
-                    nested_deployment = operation.properties.target_resource.resource_name
-                    try:
-                        nested_operations = self.rm_client.deployment_operations.list(self.resource_group_name,
-                                                                                      nested_deployment)
-                    except CloudError as exc:
-                        self.fail("List nested deployment operations failed with status code: %s and message: %s" %
-                                 (e.status_code, e.message))
-                    new_nested_operations = self._get_failed_nested_operations(nested_operations)
-                    new_operations += new_nested_operations
+        operations = list(current_operations)
+        while operations:
+            nested_deployments = []
+            for operation in operations:
+                if operation.properties.provisioning_state == 'Failed':
+                    new_operations.append(operation)
+                    if operation.properties.target_resource and \
+                       'Microsoft.Resources/deployments' in operation.properties.target_resource.id:
+                        nested_deployments.append(operation.properties.target_resource.resource_name)
+            # every level of nested deployments is listed at once
+            operations = []
+            for nested_operations, exc in self._list_deployment_operations(nested_deployments):
+                if exc:
+                    self.fail("List nested deployment operations failed with status code: %s and message: %s" %
+                              (exc.status_code, exc.message))
+                operations += nested_operations
         return new_operations
 
+    def _format_operations(self, operations):
+        return [
+            dict(
+                id=op.id,
+                operation_id=op.operation_id,
+                status_code=op.properties.status_code,
+                status_message=op.properties.status_message,
+                target_resource=dict(
+                    id=op.properties.target_resource.id,
+                    resource_name=op.properties.target_resource.resource_name,
+                    resource_type=op.properties.target_resource.resource_type
+                ) if op.properties.target_resource else None,
+                provisioning_state=op.properties.provisioning_state,
+            )
+            for op in operations
+        ]
+
     def _get_failed_deployment_operations(self, deployment_name):
         results = []
         # time.sleep(15) # there is a race condition between when we ask for deployment status and when the
@@ -553,21 +698,7 @@ class AzureRMDeploymentManager(AzureRMModuleBase):
             self.fail("Get deployment failed with status code: %s and message: %s" %
                       (exc.status_code, exc.message))
         try:
-            results = [
-                dict(
-                    id=op.id,
-                    operation_id=op.operation_id,
-                    status_code=op.properties.status_code,
-                    status_message=op.properties.status_message,
-                    target_resource=dict(
-                        id=op.properties.target_resource.id,
-                        resource_name=op.properties.target_resource.resource_name,
-                        resource_type=op.properties.target_resource.resource_type
-                    ) if op.properties.target_resource else None,
-                    provisioning_state=op.properties.provisioning_state,
-                )
-                for op in self._get_failed_nested_operations(operations)
-            ]
+            results = self._format_operations(self._get_failed_nested_operations(operations))
         except:
             # If we fail here, the original error gets lost and user receives wrong error message/stacktrace
             pass
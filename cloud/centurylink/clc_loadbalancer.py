@@ -29,7 +29,9 @@ options:
   name:
     description:
       - The name of the loadbalancer
-    required: True
+      - Required unless C(loadbalancers) is given.
+    required: False
+    default: None
   description:
     description:
       - A description for the loadbalancer
@@ -78,6 +80,24 @@ options:
     required: False
     default: present
     choices: ['present', 'absent', 'port_absent', 'nodes_present', 'nodes_absent']
+  loadbalancers:
+    description:
+      - A list of load balancer pools to reconcile in a single task. Each item is a dictionary accepting the
+        keys C(name), C(port), C(nodes), C(description), C(method), C(persistence), C(status) and C(state).
+      - C(state) defaults to the value of the module's C(state) option and must be one of C(present),
+        C(nodes_present) or C(nodes_absent).
+      - The current nodes of every pool are fetched once, the required node list is computed for each pool and
+        at most one update is submitted per pool. Requests are issued concurrently.
+      - Mutually exclusive with C(name).
+    required: False
+    default: None
+    version_added: "2.2"
+  concurrency:
+    description:
+      - The maximum number of concurrent API requests issued when C(loadbalancers) is used.
+    required: False
+    default: 5
+    version_added: "2.2"
 requirements:
     - python = 2.7
     - requests >= 2.5.0
@@ -171,6 +191,27 @@ EXAMPLES = '''
         nodes:
           - { 'ipAddress': '10.11.22.123', 'privatePort': 80 }
         state: absent
+
+- name: Converge the nodes of several load balancer pools
+  hosts: localhost
+  connection: local
+  tasks:
+    - name: Actually Converge things
+      clc_loadbalancer:
+        alias: TEST
+        location: WA1
+        loadbalancers:
+          - name: web
+            port: 80
+            nodes:
+              - { 'ipAddress': '10.11.22.123', 'privatePort': 80 }
+              - { 'ipAddress': '10.11.22.124', 'privatePort': 80 }
+          - name: api
+            port: 443
+            state: nodes_absent
+            nodes:
+              - { 'ipAddress': '10.11.22.200', 'privatePort': 8443 }
+        state: present
 '''
 
 RETURN = '''
@@ -213,12 +254,32 @@ loadbalancer:
            ],
            "status":"enabled"
         }
+loadbalancers:
+    description: The per pool results when C(loadbalancers) is used
+    returned: success, when loadbalancers is given
+    type: list
+    sample:
+        [
+           {
+              "name":"web",
+              "port":80,
+              "changed":true,
+              "nodes":[
+                 {
+                    "ipAddress":"10.11.22.123",
+                    "privatePort":80,
+                    "status":"enabled"
+                 }
+              ]
+           }
+        ]
 '''
 
 __version__ = '${version}'
 
 from time import sleep
 from distutils.version import LooseVersion
+from multiprocessing.pool import ThreadPool
 
 try:
     import requests
@@ -282,6 +343,8 @@ class ClcLoadBalancer:
         loadbalancer_persistence = self.module.params.get('persistence')
         loadbalancer_nodes = self.module.params.get('nodes')
         loadbalancer_status = self.module.params.get('status')
+        loadbalancers = self.module.params.get('loadbalancers')
+        concurrency = self.module.params.get('concurrency')
         state = self.module.params.get('state')
 
         if loadbalancer_description is None:
@@ -293,6 +356,15 @@ class ClcLoadBalancer:
             alias=loadbalancer_alias,
             location=loadbalancer_location)
 
+        if loadbalancers:
+            changed, results = self.ensure_loadbalancers(
+                alias=loadbalancer_alias,
+                location=loadbalancer_location,
+                loadbalancers=loadbalancers,
+                state=state,
+                concurrency=concurrency)
+            self.module.exit_json(changed=changed, loadbalancers=results)
+
         if state == 'present':
             changed, result_lb, lb_id = self.ensure_loadbalancer_present(
                 name=loadbalancer_name,
@@ -494,18 +566,15 @@ class ClcLoadBalancer:
                 port=port,
                 lb_id=lb_id)
             if pool_id:
-                nodes_exist = self._loadbalancerpool_nodes_exists(alias=alias,
-                                                                  location=location,
-                                                                  lb_id=lb_id,
-                                                                  pool_id=pool_id,
-                                                                  nodes_to_check=nodes)
-                if not nodes_exist:
-                    changed = True
+                current_nodes = self._get_lbpool_nodes(alias, location, lb_id, pool_id)
+                changed, new_nodes = self._diff_lbpool_nodes(
+                    current_nodes, nodes, 'set')
+                if changed:
                     result = self.set_loadbalancernodes(alias=alias,
                                                         location=location,
                                                         lb_id=lb_id,
                                                         pool_id=pool_id,
-                                                        nodes=nodes)
+                                                        nodes=new_nodes)
             else:
                 result = "Pool doesn't exist"
         else:
@@ -578,6 +647,158 @@ class ClcLoadBalancer:
             result = "Load balancer doesn't Exist"
         return changed, result
 
+    def ensure_loadbalancers(self, alias, location, loadbalancers, state, concurrency):
+        """
+        Converges a list of load balancer pools and their nodes. The pools and nodes
+        are fetched once, the node list each pool needs is computed in memory and at
+        most one update is submitted per pool. Independent requests run concurrently.
+        :param alias: The account alias
+        :param location: the datacenter the load balancers reside in
+        :param loadbalancers: a list of dictionaries describing the pools
+        :param state: the state for the items that do not set one
+        :param concurrency: the maximum number of concurrent API requests
+        :return: (changed, results) -
+            changed: Boolean whether a change was made
+            results: A list with the outcome for each requested pool
+        """
+        specs = self._get_loadbalancer_specs(loadbalancers, state)
+        lb_index = dict((lb.get('name'), lb.get('id')) for lb in self.lb_dict)
+        created = set()
+
+        # Create the missing load balancers
+        to_create = []
+        for spec in specs:
+            if spec['state'] == 'present' and spec['name'] not in lb_index:
+                lb_index[spec['name']] = None
+                to_create.append(spec)
+        if to_create and not self.module.check_mode:
+            responses = self._call_api_concurrently(
+                [('POST', '/v2/sharedLoadBalancers/%s/%s' % (alias, location),
+                  json.dumps({"name": spec['name'],
+                              "description": spec['description'],
+                              "status": spec['status']}))
+                 for spec in to_create], concurrency)
+            for spec, response in zip(to_create, responses):
+                lb_index[spec['name']] = response.get('id')
+            sleep(1)
+        created.update(spec['name'] for spec in to_create)
+
+        # Index the pools of every existing load balancer by port, the items of
+        # missing ones are reported below
+        lb_names = []
+        for spec in specs:
+            if (spec['port'] and lb_index.get(spec['name']) and
+                    spec['name'] not in created and spec['name'] not in lb_names):
+                lb_names.append(spec['name'])
+        responses = self._call_api_concurrently(
+            [('GET', '/v2/sharedLoadBalancers/%s/%s/%s/pools' %
+              (alias, location, lb_index[name])) for name in lb_names], concurrency)
+        pool_index = {}
+        for name, pools in zip(lb_names, responses):
+            for pool in pools or []:
+                pool_index[(name, int(pool.get('port')))] = pool.get('id')
+
+        # Create the missing pools
+        to_create = []
+        for spec in specs:
+            key = (spec['name'], spec['port'])
+            if spec['state'] == 'present' and spec['port'] and key not in pool_index:
+                pool_index[key] = None
+                to_create.append(spec)
+        if to_create and not self.module.check_mode:
+            responses = self._call_api_concurrently(
+                [('POST', '/v2/sharedLoadBalancers/%s/%s/%s/pools' %
+                  (alias, location, lb_index[spec['name']]),
+                  json.dumps({"port": spec['port'],
+                              "method": spec['method'],
+                              "persistence": spec['persistence']}))
+                 for spec in to_create], concurrency)
+            for spec, response in zip(to_create, responses):
+                pool_index[(spec['name'], spec['port'])] = response.get('id')
+        created.update((spec['name'], spec['port']) for spec in to_create)
+
+        # Fetch the current nodes of every pool that is reconciled
+        keys = []
+        for spec in specs:
+            key = (spec['name'], spec['port'])
+            if key in pool_index and key not in keys and (
+                    spec['state'] != 'present' or spec['nodes']):
+                keys.append(key)
+        fetch = [key for key in keys if key not in created]
+        responses = self._call_api_concurrently(
+            [('GET', '/v2/sharedLoadBalancers/%s/%s/%s/pools/%s/nodes' %
+              (alias, location, lb_index[key[0]], pool_index[key])) for key in fetch],
+            concurrency)
+        current = dict((key, []) for key in keys)
+        current.update(zip(fetch, responses))
+
+        # Compute the node list of every pool from all the items targeting it
+        desired = dict(current)
+        results = []
+        for spec in specs:
+            key = (spec['name'], spec['port'])
+            result = dict(name=spec['name'], port=spec['port'],
+                          changed=spec['name'] in created or key in created)
+            if spec['name'] not in lb_index:
+                result['msg'] = "Load balancer doesn't Exist"
+            elif spec['port'] and key not in pool_index:
+                result['msg'] = "Pool doesn't exist"
+            elif key in desired:
+                mode = {'present': 'set',
+                        'nodes_present': 'add',
+                        'nodes_absent': 'remove'}[spec['state']]
+                nodes_changed, desired[key] = self._diff_lbpool_nodes(
+                    desired[key], spec['nodes'], mode)
+                result['changed'] = result['changed'] or nodes_changed
+            results.append((key, result))
+
+        # Submit one update per pool that needs one
+        updates = [key for key in keys
+                   if self._diff_lbpool_nodes(current[key], desired[key], 'set')[0]]
+        if not self.module.check_mode:
+            self._call_api_concurrently(
+                [('PUT', '/v2/sharedLoadBalancers/%s/%s/%s/pools/%s/nodes' %
+                  (alias, location, lb_index[key[0]], pool_index[key]),
+                  json.dumps(desired[key])) for key in updates], concurrency)
+
+        for key, result in results:
+            if key in desired:
+                result['nodes'] = desired[key]
+        changed = bool(created or updates)
+        return changed, [result for key, result in results]
+
+    def _get_loadbalancer_specs(self, loadbalancers, state):
+        """
+        Validate the loadbalancers option and fill in the defaults of each item
+        :param loadbalancers: the list of dictionaries given to the module
+        :param state: the state for the items that do not set one
+        :return: a list of normalized dictionaries
+        """
+        specs = []
+        for item in loadbalancers:
+            if not isinstance(item, dict) or not item.get('name'):
+                self.module.fail_json(
+                    msg='Each item of loadbalancers must be a dictionary with a name')
+            item_state = item.get('state') or state
+            if item_state not in ('present', 'nodes_present', 'nodes_absent'):
+                self.module.fail_json(
+                    msg='Unsupported state "{0}" for load balancer "{1}"'.format(
+                        item_state, item['name']))
+            port = item.get('port')
+            if port is None and (item_state != 'present' or item.get('nodes')):
+                self.module.fail_json(
+                    msg='A port is required to manage the nodes of load balancer "{0}"'.format(
+                        item['name']))
+            specs.append(dict(name=item['name'],
+                              port=int(port) if port is not None else None,
+                              nodes=item.get('nodes') or [],
+                              description=item.get('description') or item['name'],
+                              method=item.get('method'),
+                              persistence=item.get('persistence'),
+                              status=item.get('status') or 'enabled',
+                              state=item_state))
+        return specs
+
     def create_loadbalancer(self, name, alias, location, description, status):
         """
         Create a loadbalancer w/ params
@@ -734,28 +955,6 @@ class ClcLoadBalancer:
                 result = pool.get('id')
         return result
 
-    def _loadbalancerpool_nodes_exists(
-            self, alias, location, lb_id, pool_id, nodes_to_check):
-        """
-        Checks to see if a set of nodes exists on the specified port on the provided load balancer
-        :param alias: the account alias
-        :param location: the datacenter the load balancer resides in
-        :param lb_id: the id string of the provided load balancer
-        :param pool_id: the id string of the load balancer pool
-        :param nodes_to_check: the list of nodes to check for
-        :return: result: True / False indicating if the given nodes exist
-        """
-        result = False
-        nodes = self._get_lbpool_nodes(alias, location, lb_id, pool_id)
-        for node in nodes_to_check:
-            if not node.get('status'):
-                node['status'] = 'enabled'
-            if node in nodes:
-                result = True
-            else:
-                result = False
-        return result
-
     def set_loadbalancernodes(self, alias, location, lb_id, pool_id, nodes):
         """
         Updates nodes to the provided pool
@@ -792,16 +991,11 @@ class ClcLoadBalancer:
             changed: Boolean whether a change was made
             result: The result from the CLC API call
         """
-        changed = False
         result = {}
-        nodes = self._get_lbpool_nodes(alias, location, lb_id, pool_id)
-        for node in nodes_to_add:
-            if not node.get('status'):
-                node['status'] = 'enabled'
-            if not node in nodes:
-                changed = True
-                nodes.append(node)
-        if changed == True and not self.module.check_mode:
+        current_nodes = self._get_lbpool_nodes(alias, location, lb_id, pool_id)
+        changed, nodes = self._diff_lbpool_nodes(
+            current_nodes, nodes_to_add, 'add')
+        if changed and not self.module.check_mode:
             result = self.set_loadbalancernodes(
                 alias,
                 location,
@@ -823,16 +1017,11 @@ class ClcLoadBalancer:
             changed: Boolean whether a change was made
             result: The result from the CLC API call
         """
-        changed = False
         result = {}
-        nodes = self._get_lbpool_nodes(alias, location, lb_id, pool_id)
-        for node in nodes_to_remove:
-            if not node.get('status'):
-                node['status'] = 'enabled'
-            if node in nodes:
-                changed = True
-                nodes.remove(node)
-        if changed == True and not self.module.check_mode:
+        current_nodes = self._get_lbpool_nodes(alias, location, lb_id, pool_id)
+        changed, nodes = self._diff_lbpool_nodes(
+            current_nodes, nodes_to_remove, 'remove')
+        if changed and not self.module.check_mode:
             result = self.set_loadbalancernodes(
                 alias,
                 location,
@@ -861,6 +1050,96 @@ class ClcLoadBalancer:
                     pool_id, str(e.response_text)))
         return result
 
+    @staticmethod
+    def _node_state(node):
+        """
+        Return the comparable state of a pool node
+        :param node: a node dictionary
+        :return: a tuple of the address, private port and status of the node
+        """
+        return (node.get('ipAddress'),
+                str(node.get('privatePort')),
+                node.get('status') or 'enabled')
+
+    @classmethod
+    def _diff_lbpool_nodes(cls, current_nodes, nodes, mode):
+        """
+        Compute the node list a pool has to be set to, indexing the nodes by
+        address and private port so the comparison is linear
+        :param current_nodes: the list of nodes currently in the pool
+        :param nodes: the list of requested nodes
+        :param mode: 'set' to replace the nodes, 'add' or 'remove' to merge them
+        :return: (changed, new_nodes) -
+            changed: Boolean whether the pool has to be updated
+            new_nodes: The full list of nodes the pool has to be set to
+        """
+        current_keys = []
+        current = {}
+        for node in current_nodes or []:
+            key = cls._node_state(node)[:2]
+            if key not in current:
+                current_keys.append(key)
+            current[key] = node
+        requested_keys = []
+        requested = {}
+        for node in nodes or []:
+            node = dict(node)
+            if not node.get('status'):
+                node['status'] = 'enabled'
+            key = cls._node_state(node)[:2]
+            if key not in requested:
+                requested_keys.append(key)
+            requested[key] = node
+
+        if mode == 'set':
+            new_nodes = [requested[key] for key in requested_keys]
+        elif mode == 'add':
+            new_nodes = [requested.get(key, current[key]) for key in current_keys]
+            new_nodes.extend(requested[key] for key in requested_keys
+                             if key not in current)
+        else:
+            new_nodes = [current[key] for key in current_keys
+                         if key not in requested]
+
+        changed = (set(cls._node_state(node) for node in new_nodes) !=
+                   set(cls._node_state(node) for node in current.values()))
+        return changed, new_nodes
+
+    def _call_api_concurrently(self, calls, concurrency):
+        """
+        Issue several CLC API calls from a pool of worker threads
+        :param calls: a list of argument tuples for clc.v2.API.Call
+        :param concurrency: the maximum number of requests in flight
+        :return: the list of results, in the same order as the calls
+        """
+        if not calls:
+            return []
+        pool = ThreadPool(processes=max(1, min(concurrency, len(calls))))
+        try:
+            responses = pool.map(self._call_api, calls)
+        finally:
+            pool.close()
+            pool.join()
+        errors = [error for result, error in responses if error]
+        if errors:
+            self.module.fail_json(
+                msg='Unable to update the load balancers. {0}'.format(' '.join(errors)))
+        return [result for result, error in responses]
+
+    def _call_api(self, call):
+        """
+        Issue a single CLC API call. Failures are returned rather than reported
+        since fail_json cannot be called from a worker thread.
+        :param call: an argument tuple for clc.v2.API.Call
+        :return: (result, error) -
+            result: The result from the CLC API call
+            error: A description of the failure or None
+        """
+        try:
+            return self.clc.v2.API.Call(*call), None
+        except APIFailedResponse as e:
+            return None, '{0} {1}: {2}'.format(call[0], call[1], str(e.response_text))
+
     @staticmethod
     def define_argument_spec():
         """
@@ -868,7 +1147,7 @@ class ClcLoadBalancer:
         :return: argument spec dictionary
         """
         argument_spec = dict(
-            name=dict(required=True),
+            name=dict(default=None),
             description=dict(default=None),
             location=dict(required=True),
             alias=dict(required=True),
@@ -884,7 +1163,9 @@ class ClcLoadBalancer:
                     'absent',
                     'port_absent',
                     'nodes_present',
-                    'nodes_absent'])
+                    'nodes_absent']),
+            loadbalancers=dict(type='list', default=None),
+            concurrency=dict(type='int', default=5)
         )
         return argument_spec
 
@@ -932,6 +1213,8 @@ def main():
     :return: none
     """
     module = AnsibleModule(argument_spec=ClcLoadBalancer.define_argument_spec(),
+                           required_one_of=[['name', 'loadbalancers']],
+                           mutually_exclusive=[['name', 'loadbalancers']],
                            supports_check_mode=True)
     clc_loadbalancer = ClcLoadBalancer(module)
     clc_loadbalancer.process_request()
@@ -40,8 +40,9 @@ options:
   vmid:
     description:
       - the instance id
+      - required unless I(containers) is given
     default: null
-    required: true
+    required: false
   validate_certs:
     description:
       - enable / disable https certificate verification
@@ -71,6 +72,7 @@ options:
     description:
       - the template for VM creating
       - required only for C(state=present)
+      - with C(state=started) and I(create_missing), used to create an instance which does not exist yet
     default: null
     required: false
   disk:
@@ -138,6 +140,7 @@ options:
   timeout:
     description:
       - timeout for operations
+      - task status is polled with a delay growing from half a second up to 5 seconds
     default: 30
     required: false
     type: integer
@@ -150,11 +153,37 @@ options:
     default: false
     required: false
     type: boolean
+  create_missing:
+    description:
+      - with C(state=started), create an instance which does not exist yet from I(ostemplate) before starting it
+        instead of failing
+    default: false
+    required: false
+    type: boolean
+    version_added: "2.2"
   state:
     description:
      - Indicate desired state of the instance
     choices: ['present', 'started', 'absent', 'stopped', 'restarted']
     default: present
+  containers:
+    description:
+      - list of instances to manage at once, mutually exclusive with I(vmid)
+      - every item is a hash with a required C(vmid) key and any of the I(node), I(password), I(hostname),
+        I(ostemplate), I(disk), I(cpus), I(memory), I(swap), I(netif), I(ip_address), I(onboot), I(storage),
+        I(cpuunits), I(nameserver), I(searchdomain), I(timeout), I(force), I(create_missing) and I(state) keys
+      - keys which are not given default to the module options of the same name
+      - the results are returned per instance in C(containers)
+    default: null
+    required: false
+    version_added: "2.2"
+  concurrency:
+    description:
+      - how many instances of I(containers) are managed at the same time
+    default: 4
+    required: false
+    type: integer
+    version_added: "2.2"
 notes:
   - Requires proxmoxer and requests modules on host. This modules can be installed with pip.
 requirements: [ "proxmoxer", "requests" ]
@@ -188,10 +217,27 @@ EXAMPLES = '''
 
 # Remove container
 - proxmox: vmid=100 api_user='root@pam' api_password='1q2w3e' api_host='node1' state=absent
+
+# Create and start several containers across nodes, four at a time
+- proxmox:
+    api_user: root@pam
+    api_password: 1q2w3e
+    api_host: node1
+    password: 123456
+    ostemplate: 'local:vztmpl/ubuntu-14.04-x86_64.tar.gz'
+    state: started
+    create_missing: yes
+    concurrency: 4
+    containers:
+      - { vmid: 101, node: uk-mc01, hostname: web1.example.org }
+      - { vmid: 102, node: uk-mc02, hostname: web2.example.org }
+      - { vmid: 103, node: uk-mc02, hostname: db1.example.org, memory: 2048 }
 '''
 
 import os
+import threading
 import time
+from multiprocessing.pool import ThreadPool
 
 try:
   from proxmoxer import ProxmoxAPI
@@ -201,16 +247,75 @@ except ImportError:
 
 VZ_TYPE=None
 
-def get_instance(proxmox, vmid):
-  return [ vm for vm in proxmox.cluster.resources.get(type='vm') if vm['vmid'] == int(vmid) ]
-
-def content_check(proxmox, node, ostemplate, storage):
-  return [ True for cnt in proxmox.nodes(node).storage(storage).content.get() if cnt['volid'] == ostemplate ]
-
-def node_check(proxmox, node):
-  return [ True for nd in proxmox.nodes.get() if nd['node'] == node ]
-
-def create_instance(module, proxmox, vmid, node, disk, storage, cpus, memory, swap, timeout, **kwargs):
+CONTAINER_OPTIONS = ['vmid', 'node', 'password', 'hostname', 'ostemplate', 'disk', 'cpus', 'memory', 'swap',
+                     'netif', 'ip_address', 'onboot', 'storage', 'cpuunits', 'nameserver', 'searchdomain',
+                     'timeout', 'force', 'create_missing', 'state']
+
+STATE_ERRORS = {
+  'present': 'creation of VM %s failed with exception: %s',
+  'started': 'starting of VM %s failed with exception: %s',
+  'stopped': 'stopping of VM %s failed with exception: %s',
+  'restarted': 'restarting of VM %s failed with exception: %s',
+  'absent': 'deletion of VM %s failed with exception: %s',
+}
+
+class ProxmoxError(Exception):
+  pass
+
+class ClusterResources(object):
+  """
+  Cluster resources, nodes and storage contents, each listed at most once
+  per run instead of once per lookup. Nodes and contents are listed over the
+  session of the caller, as they are looked up from the worker threads.
+  """
+  def __init__(self, proxmox):
+    self.proxmox = proxmox
+    self.vms = None
+    self.nodes = None
+    self.contents = {}
+
+  def get_instance(self, vmid):
+    if self.vms is None:
+      self.vms = dict((vm['vmid'], vm) for vm in self.proxmox.cluster.resources.get(type='vm'))
+    vm = self.vms.get(int(vmid))
+    return [ vm ] if vm else []
+
+  def add_instance(self, vmid, node):
+    if self.vms is not None:
+      self.vms[int(vmid)] = dict(vmid=int(vmid), node=node)
+
+  def node_check(self, proxmox, node):
+    if self.nodes is None:
+      self.nodes = set(nd['node'] for nd in proxmox.nodes.get())
+    return node in self.nodes
+
+  def content_check(self, proxmox, node, ostemplate, storage):
+    if (node, storage) not in self.contents:
+      self.contents[(node, storage)] = set(cnt['volid'] for cnt in
+                                           proxmox.nodes(node).storage(storage).content.get(content='vztmpl'))
+    return ostemplate in self.contents[(node, storage)]
+
+def wait_for_task(proxmox_node, taskid, timeout, action):
+  """
+  Waits up to timeout seconds for a task to finish. The status is read once
+  per poll and the delay between polls grows up to 5 seconds.
+  """
+  deadline = time.time() + timeout
+  delay = 0.5
+  while True:
+    status = proxmox_node.tasks(taskid).status.get()
+    if status['status'] == 'stopped':
+      if status.get('exitstatus') == 'OK':
+        return True
+      raise ProxmoxError('Task for %s VM failed with exit status: %s' % (action, status.get('exitstatus')))
+    if time.time() >= deadline:
+      raise ProxmoxError('Reached timeout while waiting for %s VM. Last line in task before timeout: %s'
+                         % (action, proxmox_node.tasks(taskid).log.get()[:1]))
+
+    time.sleep(min(delay, max(deadline - time.time(), 0.1)))
+    delay = min(delay * 2, 5)
+
+def create_instance(proxmox, vmid, node, disk, storage, cpus, memory, swap, timeout, **kwargs):
   proxmox_node = proxmox.nodes(node)
   kwargs = dict((k,v) for k, v in kwargs.iteritems() if v is not None)
   if VZ_TYPE =='lxc':
@@ -223,63 +328,182 @@ def create_instance(module, proxmox, vmid, node, disk, storage, cpus, memory, sw
       kwargs['cpus']=cpus
       kwargs['disk']=disk
   taskid = getattr(proxmox_node, VZ_TYPE).create(vmid=vmid, storage=storage, memory=memory, swap=swap, **kwargs)
+  return wait_for_task(proxmox_node, taskid, timeout, 'creating')
+
+def start_instance(proxmox, vm, vmid, timeout):
+  proxmox_node = proxmox.nodes(vm[0]['node'])
+  taskid = getattr(proxmox_node, VZ_TYPE)(vmid).status.start.post()
+  return wait_for_task(proxmox_node, taskid, timeout, 'starting')
 
-  while timeout:
-    if ( proxmox_node.tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox_node.tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for creating VM. Last line in task before timeout: %s'
-                       % proxmox_node.tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
-
-def start_instance(module, proxmox, vm, vmid, timeout):
-  taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.start.post()
-  while timeout:
-    if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for starting VM. Last line in task before timeout: %s'
-                       % proxmox.nodes(vm[0]['node']).tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
-
-def stop_instance(module, proxmox, vm, vmid, timeout, force):
+def stop_instance(proxmox, vm, vmid, timeout, force):
+  proxmox_node = proxmox.nodes(vm[0]['node'])
   if force:
-    taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.shutdown.post(forceStop=1)
+    taskid = getattr(proxmox_node, VZ_TYPE)(vmid).status.shutdown.post(forceStop=1)
   else:
-    taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.shutdown.post()
-  while timeout:
-    if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for stopping VM. Last line in task before timeout: %s'
-                       % proxmox_node.tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
-
-def umount_instance(module, proxmox, vm, vmid, timeout):
-  taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.umount.post()
-  while timeout:
-    if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for unmounting VM. Last line in task before timeout: %s'
-                       % proxmox_node.tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
+    taskid = getattr(proxmox_node, VZ_TYPE)(vmid).status.shutdown.post()
+  return wait_for_task(proxmox_node, taskid, timeout, 'stopping')
+
+def umount_instance(proxmox, vm, vmid, timeout):
+  proxmox_node = proxmox.nodes(vm[0]['node'])
+  taskid = getattr(proxmox_node, VZ_TYPE)(vmid).status.umount.post()
+  return wait_for_task(proxmox_node, taskid, timeout, 'unmounting')
+
+def get_status(proxmox, vm, vmid):
+  return getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.current.get()['status']
+
+def deploy_instance(proxmox, resources, params):
+  vmid = params['vmid']
+  node = params['node']
+  storage = params['storage']
+  if not (node and params['hostname'] and params['password'] and params['ostemplate']):
+    raise ProxmoxError('node, hostname, password and ostemplate are mandatory for creating vm')
+  elif not resources.node_check(proxmox, node):
+    raise ProxmoxError("node '%s' not exists in cluster" % node)
+  elif not resources.content_check(proxmox, node, params['ostemplate'], storage):
+    raise ProxmoxError("ostemplate '%s' not exists on node %s and storage %s"
+                       % (params['ostemplate'], node, storage))
+
+  create_instance(proxmox, vmid, node, params['disk'], storage, params['cpus'], params['memory'],
+                  params['swap'], params['timeout'],
+                  password = params['password'],
+                  hostname = params['hostname'],
+                  ostemplate = params['ostemplate'],
+                  netif = params['netif'],
+                  ip_address = params['ip_address'],
+                  onboot = int(params['onboot']),
+                  cpuunits = params['cpuunits'],
+                  nameserver = params['nameserver'],
+                  searchdomain = params['searchdomain'],
+                  force = int(params['force']))
+  resources.add_instance(vmid, node)
+  return [ dict(vmid=int(vmid), node=node) ]
+
+def ensure_instance(proxmox, resources, params):
+  """
+  Brings one instance into params['state'] and returns (changed, msg).
+  Failures are raised as ProxmoxError.
+  """
+  state = params['state']
+  vmid = params['vmid']
+  timeout = params['timeout']
+  force = params['force']
+
+  if state == 'present':
+    if resources.get_instance(vmid) and not force:
+      return False, "VM with vmid = %s is already exists" % vmid
+    deploy_instance(proxmox, resources, params)
+    return True, "deployed VM %s from template %s" % (vmid, params['ostemplate'])
+
+  vm = resources.get_instance(vmid)
+
+  if state == 'started':
+    if not vm:
+      if not params['create_missing']:
+        raise ProxmoxError('VM with vmid = %s not exists in cluster' % vmid)
+      vm = deploy_instance(proxmox, resources, params)
+    elif get_status(proxmox, vm, vmid) == 'running':
+      return False, "VM %s is already running" % vmid
+
+    start_instance(proxmox, vm, vmid, timeout)
+    return True, "VM %s started" % vmid
+
+  elif state == 'stopped':
+    if not vm:
+      raise ProxmoxError('VM with vmid = %s not exists in cluster' % vmid)
+
+    status = get_status(proxmox, vm, vmid)
+    if status == 'mounted':
+      if force:
+        umount_instance(proxmox, vm, vmid, timeout)
+        return True, "VM %s is shutting down" % vmid
+      return False, ("VM %s is already shutdown, but mounted. "
+                     "You can use force option to umount it.") % vmid
+
+    if status == 'stopped':
+      return False, "VM %s is already shutdown" % vmid
+
+    stop_instance(proxmox, vm, vmid, timeout, force)
+    return True, "VM %s is shutting down" % vmid
+
+  elif state == 'restarted':
+    if not vm:
+      raise ProxmoxError('VM with vmid = %s not exists in cluster' % vmid)
+    if get_status(proxmox, vm, vmid) in ('stopped', 'mounted'):
+      return False, "VM %s is not running" % vmid
+
+    stop_instance(proxmox, vm, vmid, timeout, force)
+    start_instance(proxmox, vm, vmid, timeout)
+    return True, "VM %s is restarted" % vmid
+
+  elif state == 'absent':
+    if not vm:
+      return False, "VM %s does not exist" % vmid
+
+    status = get_status(proxmox, vm, vmid)
+    if status == 'running':
+      return False, "VM %s is running. Stop it before deletion." % vmid
+
+    if status == 'mounted':
+      return False, "VM %s is mounted. Stop it with force option before deletion." % vmid
+
+    proxmox_node = proxmox.nodes(vm[0]['node'])
+    taskid = getattr(proxmox_node, VZ_TYPE).delete(vmid)
+    wait_for_task(proxmox_node, taskid, timeout, 'removing')
+    return True, "VM %s removed" % vmid
+
+def get_container_specs(module):
+  specs = []
+  for container in module.params['containers']:
+    for key in container:
+      if key not in CONTAINER_OPTIONS:
+        module.fail_json(msg='%s is not a valid option for a container' % key)
+    if not container.get('vmid'):
+      module.fail_json(msg='vmid is required for every container')
+    spec = dict((option, module.params[option]) for option in CONTAINER_OPTIONS)
+    spec.update(container)
+    if spec['state'] not in STATE_ERRORS:
+      module.fail_json(msg='state of a container must be one of %s' % ', '.join(sorted(STATE_ERRORS)))
+    specs.append(spec)
+  return specs
+
+def ensure_instances(module, connect, resources, specs):
+  """
+  Brings every container of specs into its state, with at most concurrency
+  containers at a time. Every thread talks to the API over its own session.
+  """
+  concurrency = module.params['concurrency']
+  sessions = threading.local()
+
+  def run(params):
+    result = dict(vmid=params['vmid'], state=params['state'], changed=False)
+    try:
+      if not hasattr(sessions, 'proxmox'):
+        sessions.proxmox = connect()
+      result['changed'], result['msg'] = ensure_instance(sessions.proxmox, resources, params)
+    except ProxmoxError, e:
+      result.update(failed=True, msg=str(e))
+    except Exception, e:
+      result.update(failed=True, msg=STATE_ERRORS[params['state']] % (params['vmid'], e))
+    return result
+
+  # list the cluster resources once, before the threads share the index
+  resources.get_instance(specs[0]['vmid'])
+
+  if len(specs) > 1 and concurrency > 1:
+    pool = ThreadPool(min(concurrency, len(specs)))
+    try:
+      results = pool.map(run, specs)
+    finally:
+      pool.close()
+      pool.join()
+  else:
+    results = map(run, specs)
+
+  changed = any(result['changed'] for result in results)
+  failed = [str(result['vmid']) for result in results if result.get('failed')]
+  if failed:
+    module.fail_json(msg='Failed to manage containers: %s' % ', '.join(failed), changed=changed, containers=results)
+  module.exit_json(changed=changed, containers=results)
 
 def main():
   module = AnsibleModule(
@@ -287,7 +511,7 @@ def main():
       api_host = dict(required=True),
       api_user = dict(required=True),
       api_password = dict(no_log=True),
-      vmid = dict(required=True),
+      vmid = dict(),
       validate_certs = dict(type='bool', default='no'),
       node = dict(),
       password = dict(no_log=True),
@@ -306,8 +530,13 @@ def main():
       searchdomain = dict(),
       timeout = dict(type='int', default=30),
       force = dict(type='bool', default='no'),
+      create_missing = dict(type='bool', default='no'),
       state = dict(default='present', choices=['present', 'absent', 'stopped', 'started', 'restarted']),
-    )
+      containers = dict(type='list'),
+      concurrency = dict(type='int', default=4),
+    ),
+    mutually_exclusive = [['vmid', 'containers']],
+    required_one_of = [['vmid', 'containers']],
   )
 
   if not HAS_PROXMOXER:
@@ -319,13 +548,6 @@ def main():
   api_password = module.params['api_password']
   vmid = module.params['vmid']
   validate_certs = module.params['validate_certs']
-  node = module.params['node']
-  disk = module.params['disk']
-  cpus = module.params['cpus']
-  memory = module.params['memory']
-  swap = module.params['swap']
-  storage = module.params['storage']
-  timeout = module.params['timeout']
 
   # If password not set get it from PROXMOX_PASSWORD env
   if not api_password:
@@ -334,117 +556,33 @@ def main():
     except KeyError, e:
       module.fail_json(msg='You should set api_password param or use PROXMOX_PASSWORD environment variable')
 
+  def connect():
+    return ProxmoxAPI(api_host, user=api_user, password=api_password, verify_ssl=validate_certs)
+
   try:
-    proxmox = ProxmoxAPI(api_host, user=api_user, password=api_password, verify_ssl=validate_certs)
+    proxmox = connect()
     global VZ_TYPE
     VZ_TYPE = 'openvz' if float(proxmox.version.get()['version']) < 4.0 else 'lxc'
 
   except Exception, e:
     module.fail_json(msg='authorization on proxmox cluster failed with exception: %s' % e)
 
-  if state == 'present':
-    try:
-      if get_instance(proxmox, vmid) and not module.params['force']:
-        module.exit_json(changed=False, msg="VM with vmid = %s is already exists" % vmid)
-      elif not (node, module.params['hostname'] and module.params['password'] and module.params['ostemplate']):
-        module.fail_json(msg='node, hostname, password and ostemplate are mandatory for creating vm')
-      elif not node_check(proxmox, node):
-        module.fail_json(msg="node '%s' not exists in cluster" % node)
-      elif not content_check(proxmox, node, module.params['ostemplate'], storage):
-        module.fail_json(msg="ostemplate '%s' not exists on node %s and storage %s"
-                         % (module.params['ostemplate'], node, storage))
-
-      create_instance(module, proxmox, vmid, node, disk, storage, cpus, memory, swap, timeout,
-                      password = module.params['password'],
-                      hostname = module.params['hostname'],
-                      ostemplate = module.params['ostemplate'],
-                      netif = module.params['netif'],
-                      ip_address = module.params['ip_address'],
-                      onboot = int(module.params['onboot']),
-                      cpuunits = module.params['cpuunits'],
-                      nameserver = module.params['nameserver'],
-                      searchdomain = module.params['searchdomain'],
-                      force = int(module.params['force']))
-
-      module.exit_json(changed=True, msg="deployed VM %s from template %s"  % (vmid, module.params['ostemplate']))
-    except Exception, e:
-      module.fail_json(msg="creation of %s VM %s failed with exception: %s" % ( VZ_TYPE, vmid, e ))
-
-  elif state == 'started':
-    try:
-      vm = get_instance(proxmox, vmid)
-      if not vm:
-        module.fail_json(msg='VM with vmid = %s not exists in cluster' % vmid)
-      if getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.current.get()['status'] == 'running':
-        module.exit_json(changed=False, msg="VM %s is already running" % vmid)
-
-      if start_instance(module, proxmox, vm, vmid, timeout):
-        module.exit_json(changed=True, msg="VM %s started" % vmid)
-    except Exception, e:
-      module.fail_json(msg="starting of VM %s failed with exception: %s" % ( vmid, e ))
+  resources = ClusterResources(proxmox)
 
-  elif state == 'stopped':
-    try:
-      vm = get_instance(proxmox, vmid)
-      if not vm:
-        module.fail_json(msg='VM with vmid = %s not exists in cluster' % vmid)
-
-      if getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.current.get()['status'] == 'mounted':
-        if module.params['force']:
-          if umount_instance(module, proxmox, vm, vmid, timeout):
-            module.exit_json(changed=True, msg="VM %s is shutting down" % vmid)
-        else:
-          module.exit_json(changed=False, msg=("VM %s is already shutdown, but mounted. "
-                                               "You can use force option to umount it.") % vmid)
-
-      if getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.current.get()['status'] == 'stopped':
-        module.exit_json(changed=False, msg="VM %s is already shutdown" % vmid)
-
-      if stop_instance(module, proxmox, vm, vmid, timeout, force = module.params['force']):
-        module.exit_json(changed=True, msg="VM %s is shutting down" % vmid)
-    except Exception, e:
-      module.fail_json(msg="stopping of VM %s failed with exception: %s" % ( vmid, e ))
+  if module.params['containers'] is not None:
+    specs = get_container_specs(module)
+    if not specs:
+      module.exit_json(changed=False, containers=[])
+    ensure_instances(module, connect, resources, specs)
 
-  elif state == 'restarted':
-    try:
-      vm = get_instance(proxmox, vmid)
-      if not vm:
-        module.fail_json(msg='VM with vmid = %s not exists in cluster' % vmid)
-      if ( getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.current.get()['status'] == 'stopped'
-          or getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.current.get()['status'] == 'mounted' ):
-        module.exit_json(changed=False, msg="VM %s is not running" % vmid)
-
-      if ( stop_instance(module, proxmox, vm, vmid, timeout, force = module.params['force']) and
-          start_instance(module, proxmox, vm, vmid, timeout) ):
-        module.exit_json(changed=True, msg="VM %s is restarted" % vmid)
-    except Exception, e:
-      module.fail_json(msg="restarting of VM %s failed with exception: %s" % ( vmid, e ))
+  try:
+    changed, msg = ensure_instance(proxmox, resources, module.params)
+  except ProxmoxError, e:
+    module.fail_json(msg=str(e))
+  except Exception, e:
+    module.fail_json(msg=STATE_ERRORS[state] % (vmid, e))
 
-  elif state == 'absent':
-    try:
-      vm = get_instance(proxmox, vmid)
-      if not vm:
-        module.exit_json(changed=False, msg="VM %s does not exist" % vmid)
-
-      if getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.current.get()['status'] == 'running':
-        module.exit_json(changed=False, msg="VM %s is running. Stop it before deletion." % vmid)
-
-      if getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.current.get()['status'] == 'mounted':
-        module.exit_json(changed=False, msg="VM %s is mounted. Stop it with force option before deletion." % vmid)
-
-      taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE).delete(vmid)
-      while timeout:
-        if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-            and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-          module.exit_json(changed=True, msg="VM %s removed" % vmid)
-        timeout = timeout - 1
-        if timeout == 0:
-          module.fail_json(msg='Reached timeout while waiting for removing VM. Last line in task before timeout: %s'
-                           % proxmox_node.tasks(taskid).log.get()[:1])
-
-        time.sleep(1)
-    except Exception, e:
-      module.fail_json(msg="deletion of VM %s failed with exception: %s" % ( vmid, e ))
+  module.exit_json(changed=changed, msg=msg)
 
 # import module snippets
 from ansible.module_utils.basic import *
@@ -27,9 +27,24 @@ options:
     description:
       - name of the guest VM being managed. Note that VM must be previously
         defined with xml.
-    required: true
+    required: false
+    default: null
+    aliases: ['guest']
+  names:
+    description:
+      - list of guest VMs to apply I(state), or one of the commands C(create), C(start), C(shutdown),
+        C(destroy), C(pause), C(unpause) or C(status), to concurrently, instead of I(name).
+        The result of every guest is returned in C(results).
+    required: false
     default: null
-    aliases: []
+    aliases: ['guests']
+    version_added: "2.2"
+  concurrency:
+    description:
+      - maximum number of guests of I(names) to change at the same time.
+    required: false
+    default: 8
+    version_added: "2.2"
   state:
     description:
       - Note that there may be some lag for state requests like C(shutdown)
@@ -82,6 +97,14 @@ tasks:
           uri=lxc:///
   - name: start vm
     virt: name=foo state=running uri=lxc:///
+
+# shut down several guests at once
+- virt:
+    names:
+      - alpha
+      - beta
+      - gamma
+    state: shutdown
 '''
 
 RETURN = '''
@@ -100,12 +123,19 @@ status:
     type: string
     sample: "success"
     returned: success
+# for names
+results:
+    description: The name, changed and msg (or the command result) of every guest
+    type: list
+    returned: when names is given
+    sample: [{"name": "alpha", "changed": true, "msg": 0}, {"name": "beta", "changed": false}]
 '''
 VIRT_FAILED = 1
 VIRT_SUCCESS = 0
 VIRT_UNAVAILABLE=2
 
 import sys
+from multiprocessing.pool import ThreadPool
 
 try:
     import libvirt
@@ -118,6 +148,7 @@ ALL_COMMANDS = []
 VM_COMMANDS = ['create','status', 'start', 'stop', 'pause', 'unpause',
                 'shutdown', 'undefine', 'destroy', 'get_xml', 'autostart', 'define']
 HOST_COMMANDS = ['freemem', 'list_vms', 'info', 'nodeinfo', 'virttype']
+BULK_COMMANDS = ['create', 'start', 'shutdown', 'destroy', 'pause', 'unpause', 'status']
 ALL_COMMANDS.extend(VM_COMMANDS)
 ALL_COMMANDS.extend(HOST_COMMANDS)
 
@@ -155,13 +186,15 @@ class LibvirtConnection(object):
             raise Exception("hypervisor connection failure")
 
         self.conn = conn
+        self.domains = None
 
-    def find_vm(self, vmid):
-        """
-        Extra bonus feature: vmid = -1 returns a list of everything
-        """
+    def list_domains(self):
         conn = self.conn
 
+        # listAllDomains returns every domain in one call
+        if hasattr(conn, 'listAllDomains'):
+            return conn.listAllDomains(0)
+
         vms = []
 
         # this block of code borrowed from virt-manager:
@@ -175,15 +208,34 @@ class LibvirtConnection(object):
         for name in names:
             vm = conn.lookupByName(name)
             vms.append(vm)
+        return vms
+
+    def index_vms(self):
+        """
+        Looks up every domain once and keeps them by name, so that later
+        find_vm calls need no round trip to the hypervisor.
+        """
+        self.domains = dict((vm.name(), vm) for vm in self.list_domains())
+        return self.domains
 
+    def find_vm(self, vmid):
+        """
+        Extra bonus feature: vmid = -1 returns a list of everything
+        """
         if vmid == -1:
-            return vms
+            return self.list_domains()
 
-        for vm in vms:
-            if vm.name() == vmid:
-                return vm
+        if self.domains is not None:
+            if vmid in self.domains:
+                return self.domains[vmid]
+            raise VMNotFound("virtual machine %s not found" % vmid)
 
-        raise VMNotFound("virtual machine %s not found" % vmid)
+        try:
+            return self.conn.lookupByName(vmid)
+        except libvirt.libvirtError, e:
+            if e.get_error_code() == libvirt.VIR_ERR_NO_DOMAIN:
+                raise VMNotFound("virtual machine %s not found" % vmid)
+            raise
 
     def shutdown(self, vmid):
         return self.find_vm(vmid).shutdown()
@@ -239,11 +291,11 @@ class LibvirtConnection(object):
         return self.conn.getFreeMemory()
 
     def get_autostart(self, vmid):
-        vm = self.conn.lookupByName(vmid)
+        vm = self.find_vm(vmid)
         return vm.autostart()
 
     def set_autostart(self, vmid, val):
-        vm = self.conn.lookupByName(vmid)
+        vm = self.find_vm(vmid)
         return vm.setAutostart(val)
 
     def define_from_xml(self, xml):
@@ -255,11 +307,19 @@ class Virt(object):
     def __init__(self, uri, module):
         self.module = module
         self.uri = uri
+        self.conn = None
 
     def __get_conn(self):
-        self.conn = LibvirtConnection(self.uri, self.module)
+        # one connection serves every call of a task; libvirt connections
+        # can be used from several threads at once
+        if self.conn is None:
+            self.conn = LibvirtConnection(self.uri, self.module)
         return self.conn
 
+    def index_vms(self):
+        self.__get_conn()
+        return self.conn.index_vms()
+
     def get_vm(self, vmid):
         self.__get_conn()
         return self.conn.find_vm(vmid)
@@ -311,7 +371,7 @@ class Virt(object):
 
     def list_vms(self, state=None):
         self.conn = self.__get_conn()
-        vms = self.conn.find_vm(-1)
+        vms = self.conn.index_vms().values()
         results = []
         for x in vms:
             try:
@@ -417,6 +477,77 @@ class Virt(object):
         self.__get_conn()
         return self.conn.define_from_xml(xml)
 
+def apply_state(v, guest, state):
+    """
+    Brings guest into state and returns (changed, msg), where msg is the
+    result of the action taken, if any.
+    """
+    status = v.status(guest)
+    if state == 'running':
+        if status == 'paused':
+            return True, v.unpause(guest)
+        elif status != 'running':
+            return True, v.start(guest)
+    elif state == 'shutdown':
+        if status != 'shutdown':
+            return True, v.shutdown(guest)
+    elif state == 'destroyed':
+        if status != 'shutdown':
+            return True, v.destroy(guest)
+    elif state == 'paused':
+        if status == 'running':
+            return True, v.pause(guest)
+    return False, None
+
+
+def core_bulk(module, v, guests, state, command):
+    """
+    Applies state or command to every guest of guests, with at most
+    concurrency guests at a time, over one shared connection.
+    """
+    concurrency = module.params.get('concurrency')
+
+    if not state and command not in BULK_COMMANDS:
+        module.fail_json(msg="names requires state or one of the commands %s" % ", ".join(BULK_COMMANDS))
+
+    domains = v.index_vms()
+    missing = [guest for guest in guests if guest not in domains]
+    if missing:
+        module.fail_json(msg="virtual machines not found: %s" % ", ".join(missing))
+
+    def run(guest):
+        result = dict(name=guest, changed=False)
+        try:
+            if state:
+                changed, msg = apply_state(v, guest, state)
+                result['changed'] = changed
+                if changed:
+                    result['msg'] = msg
+            else:
+                result[command] = getattr(v, command)(guest)
+                result['changed'] = command != 'status'
+        except Exception, e:
+            result.update(failed=True, msg=str(e))
+        return result
+
+    if len(guests) > 1 and concurrency > 1:
+        pool = ThreadPool(min(concurrency, len(guests)))
+        try:
+            results = pool.map(run, guests)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = map(run, guests)
+
+    changed = any(result['changed'] for result in results)
+    failed = [result['name'] for result in results if result.get('failed')]
+    if failed:
+        module.fail_json(msg="failed to change virtual machines: %s" % ", ".join(failed),
+                         changed=changed, results=results)
+    return VIRT_SUCCESS, dict(changed=changed, results=results)
+
+
 def core(module):
 
     state      = module.params.get('state', None)
@@ -424,10 +555,14 @@ def core(module):
     command    = module.params.get('command', None)
     uri        = module.params.get('uri', None)
     xml        = module.params.get('xml', None)
+    guests     = module.params.get('names', None)
 
     v = Virt(uri, module)
     res = {}
 
+    if guests:
+        return core_bulk(module, v, guests, state, command)
+
     if state and command=='list_vms':
         res = v.list_vms(state=state)
         if type(res) != dict:
@@ -438,28 +573,9 @@ def core(module):
         if not guest:
             module.fail_json(msg = "state change requires a guest specified")
 
-        res['changed'] = False
-        if state == 'running':
-            if v.status(guest) is 'paused':
-                res['changed'] = True
-                res['msg'] = v.unpause(guest)
-            elif v.status(guest) is not 'running':
-                res['changed'] = True
-                res['msg'] = v.start(guest)
-        elif state == 'shutdown':
-            if v.status(guest) is not 'shutdown':
-                res['changed'] = True
-                res['msg'] = v.shutdown(guest)
-        elif state == 'destroyed':
-            if v.status(guest) is not 'shutdown':
-                res['changed'] = True
-                res['msg'] = v.destroy(guest)
-        elif state == 'paused':
-            if v.status(guest) is 'running':
-                res['changed'] = True
-                res['msg'] = v.pause(guest)
-        else:
-            module.fail_json(msg="unexpected state")
+        res['changed'], msg = apply_state(v, guest, state)
+        if res['changed']:
+            res['msg'] = msg
 
         return VIRT_SUCCESS, res
 
@@ -494,13 +610,18 @@ def core(module):
 
 def main():
 
-    module = AnsibleModule(argument_spec=dict(
+    module = AnsibleModule(
+        argument_spec=dict(
         name = dict(aliases=['guest']),
+        names = dict(aliases=['guests'], type='list'),
+        concurrency = dict(default=8, type='int'),
         state = dict(choices=['running', 'shutdown', 'destroyed', 'paused']),
         command = dict(choices=ALL_COMMANDS),
         uri = dict(default='qemu:///system'),
         xml = dict(),
-    ))
+        ),
+        mutually_exclusive=[['name', 'names']],
+    )
 
     if not HAS_VIRT:
         module.fail_json(
@@ -67,7 +67,8 @@ options:
     required: false
   count:
     description:
-      - The number of virtual machines to create.
+      - The number of virtual machines to create. Their volumes and then the
+        servers themselves are all requested at once and waited on together.
     required: false
     default: 1
   location:
@@ -197,60 +198,78 @@ uuid_match = re.compile(
     '[\w]{8}-[\w]{4}-[\w]{4}-[\w]{4}-[\w]{12}', re.I)
 
 
-def _wait_for_completion(profitbricks, promise, wait_timeout, msg):
-    if not promise: return
-    wait_timeout = time.time() + wait_timeout
-    while wait_timeout > time.time():
-        time.sleep(5)
-        operation_result = profitbricks.get_request(
-            request_id=promise['requestId'],
-            status=True)
+class RequestTracker(object):
+    """
+    Tracks asynchronous ProfitBricks requests. Requests are added as they
+    are submitted, and wait() polls all outstanding ones in a single loop
+    with a delay growing from 1 up to 10 seconds between rounds.
+    """
 
-        if operation_result['metadata']['status'] == "DONE":
-            return
-        elif operation_result['metadata']['status'] == "FAILED":
+    def __init__(self, profitbricks, wait_timeout):
+        self.profitbricks = profitbricks
+        self.wait_timeout = wait_timeout
+        self.pending = {}
+
+    def add(self, promise, msg):
+        # some calls, DELETE ones among them, return True instead of a request
+        if isinstance(promise, dict) and 'requestId' in promise:
+            self.pending[promise['requestId']] = msg
+
+    def wait(self):
+        deadline = time.time() + self.wait_timeout
+        delay = 1
+        while self.pending and deadline > time.time():
+            time.sleep(delay)
+            for request_id, msg in self.pending.items():
+                operation_result = self.profitbricks.get_request(
+                    request_id=request_id,
+                    status=True)
+
+                if operation_result['metadata']['status'] == "DONE":
+                    del self.pending[request_id]
+                elif operation_result['metadata']['status'] == "FAILED":
+                    raise Exception(
+                        'Request failed to complete ' + msg + ' "' + str(
+                            request_id) + '" to complete.')
+            delay = min(delay * 2, 10)
+
+        if self.pending:
+            request_id, msg = self.pending.items()[0]
             raise Exception(
-                'Request failed to complete ' + msg + ' "' + str(
-                    promise['requestId']) + '" to complete.')
+                'Timed out waiting for async operation ' + msg + ' "' + str(
+                    request_id) + '" to complete.')
 
-    raise Exception(
-        'Timed out waiting for async operation ' + msg + ' "' + str(
-            promise['requestId']
-            ) + '" to complete.')
 
-def _create_machine(module, profitbricks, datacenter, name):
+def _create_machines(module, profitbricks, datacenter, names):
     image = module.params.get('image')
     cores = module.params.get('cores')
     ram = module.params.get('ram')
     volume_size = module.params.get('volume_size')
     bus = module.params.get('bus')
     lan = module.params.get('lan')
-    assign_public_ip = module.params.get('assign_public_ip')
-    subscription_user = module.params.get('subscription_user')
-    subscription_password = module.params.get('subscription_password')
-    location = module.params.get('location')
-    image = module.params.get('image')
     assign_public_ip = module.boolean(module.params.get('assign_public_ip'))
     wait = module.params.get('wait')
     wait_timeout = module.params.get('wait_timeout')
 
+    # The volumes and the public LAN do not depend on each other, so they
+    # are all submitted before waiting on any of them.
+    tracker = RequestTracker(profitbricks, wait_timeout)
+    volume_responses = []
+
     try:
-        # Generate name, but grab first 10 chars so we don't
-        # screw up the uuid match routine.
-        v = Volume(
-            name=str(uuid.uuid4()).replace('-','')[:10],
-            size=volume_size,
-            image=image,
-            bus=bus)
-
-        volume_response = profitbricks.create_volume(
-            datacenter_id=datacenter, volume=v)
-
-        # We're forced to wait on the volume creation since
-        # server create relies upon this existing.
-
-        _wait_for_completion(profitbricks, volume_response,
-                             wait_timeout, "create_volume")
+        for name in names:
+            # Generate name, but grab first 10 chars so we don't
+            # screw up the uuid match routine.
+            v = Volume(
+                name=str(uuid.uuid4()).replace('-','')[:10],
+                size=volume_size,
+                image=image,
+                bus=bus)
+
+            volume_response = profitbricks.create_volume(
+                datacenter_id=datacenter, volume=v)
+            tracker.add(volume_response, "create_volume")
+            volume_responses.append(volume_response)
     except Exception as e:
         module.fail_json(msg="failed to create the new volume: %s" % str(e))
 
@@ -258,10 +277,11 @@ def _create_machine(module, profitbricks, datacenter, name):
         public_found = False
 
         lans = profitbricks.list_lans(datacenter)
-        for lan in lans['items']:
-            if lan['properties']['public']:
+        for l in lans['items']:
+            if l['properties']['public']:
                 public_found = True
-                lan = lan['id']
+                lan = l['id']
+                break
 
         if not public_found:
             i = LAN(
@@ -271,34 +291,41 @@ def _create_machine(module, profitbricks, datacenter, name):
             lan_response = profitbricks.create_lan(datacenter, i)
 
             lan = lan_response['id']
+            tracker.add(lan_response, "_create_machine")
 
-            _wait_for_completion(profitbricks, lan_response,
-                                 wait_timeout, "_create_machine")
-
+    # We're forced to wait on the volume creation since
+    # server create relies upon this existing.
     try:
-        n = NIC(
-            lan=int(lan)
-            )
-
-        nics = [n]
-
-        s = Server(
-            name=name,
-            ram=ram,
-            cores=cores,
-            nics=nics,
-            boot_volume_id=volume_response['id']
-            )
+        tracker.wait()
+    except Exception as e:
+        module.fail_json(msg="failed to create the new volume: %s" % str(e))
 
-        server_response = profitbricks.create_server(
-            datacenter_id=datacenter, server=s)
+    try:
+        server_responses = []
+        for name, volume_response in zip(names, volume_responses):
+            n = NIC(
+                lan=int(lan)
+                )
+
+            nics = [n]
+
+            s = Server(
+                name=name,
+                ram=ram,
+                cores=cores,
+                nics=nics,
+                boot_volume_id=volume_response['id']
+                )
+
+            server_response = profitbricks.create_server(
+                datacenter_id=datacenter, server=s)
+            tracker.add(server_response, "create_virtual_machine")
+            server_responses.append(server_response)
 
         if wait:
-            _wait_for_completion(profitbricks, server_response,
-                                 wait_timeout, "create_virtual_machine")
-
+            tracker.wait()
 
-        return (server_response)
+        return server_responses
     except Exception as e:
         module.fail_json(msg="failed to create the new server: %s" % str(e))
 
@@ -357,8 +384,9 @@ def _create_datacenter(module, profitbricks):
     try:
         datacenter_response = profitbricks.create_datacenter(datacenter=i)
 
-        _wait_for_completion(profitbricks, datacenter_response,
-                             wait_timeout, "_create_datacenter")
+        tracker = RequestTracker(profitbricks, wait_timeout)
+        tracker.add(datacenter_response, "_create_datacenter")
+        tracker.wait()
 
         return datacenter_response
     except Exception as e:
@@ -379,7 +407,6 @@ def create_virtual_machine(module, profitbricks):
     auto_increment = module.params.get('auto_increment')
     count = module.params.get('count')
     lan = module.params.get('lan')
-    wait_timeout = module.params.get('wait_timeout')
     failed = True
     datacenter_found = False
 
@@ -400,9 +427,6 @@ def create_virtual_machine(module, profitbricks):
         datacenter_response = _create_datacenter(module, profitbricks)
         datacenter = datacenter_response['id']
 
-        _wait_for_completion(profitbricks, datacenter_response,
-                             wait_timeout, "create_virtual_machine")
-
     if auto_increment:
         numbers = set()
         count_offset = 1
@@ -424,8 +448,7 @@ def create_virtual_machine(module, profitbricks):
     else:
         names = [name] * count
 
-    for name in  names: 
-        create_response = _create_machine(module, profitbricks, str(datacenter), name)
+    for create_response in _create_machines(module, profitbricks, str(datacenter), names):
         nics = profitbricks.list_nics(datacenter,create_response['id'])
         for n in nics['items']:
             if lan == n['properties']['lan']:
@@ -564,7 +587,7 @@ def main():
             volume_size=dict(default=10),
             bus=dict(default='VIRTIO'),
             lan=dict(default=1),
-            count=dict(default=1),
+            count=dict(type='int', default=1),
             auto_increment=dict(type='bool', default=True),
             instance_ids=dict(),
             subscription_user=dict(),
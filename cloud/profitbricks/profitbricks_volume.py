@@ -318,7 +318,7 @@ def main():
             image=dict(),
             disk_type=dict(default='HDD'),
             licence_type=dict(default='UNKNOWN'),
-            count=dict(default=1),
+            count=dict(type='int', default=1),
             auto_increment=dict(type='bool', default=True),
             instance_ids=dict(),
             subscription_user=dict(),
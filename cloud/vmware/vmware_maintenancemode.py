@@ -26,6 +26,7 @@ short_description: Place a host into maintenance mode
 description:
     - Place an ESXI host into maintenance mode
     - Support for VSAN compliant maintenance mode when selected
+    - Several hosts can be put into or taken out of maintenance mode in one task with I(esxi_hostnames)
 author: "Jay Jahns <jjahns@vmware.com>"
 version_added: "2.1"
 notes:
@@ -36,8 +37,26 @@ requirements:
 options:
     esxi_hostname:
         description:
-            - Name of the host as defined in vCenter
-        required: True
+            - Name of the host as defined in vCenter. Required unless I(esxi_hostnames) is given.
+        required: False
+    esxi_hostnames:
+        description:
+            - Names of several hosts as defined in vCenter, instead of I(esxi_hostname).
+            - At most I(concurrency) hosts are changed at the same time; the next host is started as soon as
+              one finishes. No more hosts of a cluster are put into maintenance mode than its HA admission
+              control policy tolerates (failover level, failover host count or the share of failover
+              resources), counting the hosts already in maintenance mode; hosts beyond that are skipped.
+            - When a host fails, no further hosts are started and the module fails once the running hosts
+              are done. The result of every host is returned in C(hosts).
+        required: False
+        default: None
+        version_added: "2.2"
+    concurrency:
+        description:
+            - Maximum number of hosts of I(esxi_hostnames) to change at the same time.
+        required: False
+        default: 1
+        version_added: "2.2"
     vsan_mode:
         description:
             - Specify which VSAN compliant mode to enter
@@ -67,6 +86,20 @@ options:
             - absent
         default: present
         required: False
+    inventory_cache:
+        description:
+            - Path of a file to keep the inventory index in, so that later tasks against the same server
+              look up hosts without walking the inventory.
+              Entries are checked against the server when used.
+        required: False
+        default: None
+        version_added: "2.2"
+    inventory_cache_ttl:
+        description:
+            - Number of seconds the I(inventory_cache) file is used before the inventory is walked again.
+        required: False
+        default: 300
+        version_added: "2.2"
 extends_documentation_fragment: vmware.documentation
 '''
 
@@ -82,6 +115,18 @@ EXAMPLES = '''
     evacuate: yes
     timeout: 3600
     state: present
+
+- name: Enter maintenance mode on the hosts of a cluster, two at a time
+  local_action:
+    module: vmware_maintenancemode
+    hostname: vc_host
+    username: vc_user
+    password: vc_pass
+    esxi_hostnames: "{{ groups['cluster1'] }}"
+    concurrency: 2
+    evacuate: yes
+    timeout: 3600
+    state: present
 '''
 RETURN = '''
 hostsystem:
@@ -99,16 +144,144 @@ status:
     return: always
     type: string
     sample: "ENTER"
+hosts:
+    description: With esxi_hostnames, the hostsystem, hostname, status, changed and msg of every host
+    returned: when esxi_hostnames is given
+    type: list
+    sample: [{"hostname": "esx1.local.domain", "hostsystem": "'vim.HostSystem:host-236'", "status": "ENTER",
+              "changed": true, "msg": "Host entered maintenance mode"}]
 '''
 
+import json
+import os
+import time
+
 try:
-    from pyVmomi import vim
+    from pyVmomi import vim, vmodl
     HAS_PYVMOMI = True
 
 except ImportError:
     HAS_PYVMOMI = False
 
 
+class InventoryIndex(object):
+    """
+    Maps the names, managed object ids and virtual machine uuids of the
+    inventory objects of vimtypes to managed object references.
+
+    The index is built with one PropertyCollector pass over the inventory.
+    With cache_file it is also kept on disk for cache_ttl seconds, so that
+    later tasks against the same server skip the inventory walk. Cached
+    entries are checked against the server when they are used and the index
+    is rebuilt once when an entry turns out to be stale or missing.
+    """
+
+    def __init__(self, content, server, vimtypes, cache_file=None, cache_ttl=300):
+        self.content = content
+        self.server = server
+        self.vimtypes = dict((vimtype._wsdlName, vimtype) for vimtype in vimtypes)
+        self.cache_file = cache_file
+        self.cache_ttl = cache_ttl
+        self.entries = None
+        self.cached = False
+
+    def build(self):
+        view = self.content.viewManager.CreateContainerView(self.content.rootFolder, self.vimtypes.values(), True)
+        try:
+            traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(
+                name='traverseView', path='view', skip=False, type=vim.view.ContainerView)
+            object_spec = vmodl.query.PropertyCollector.ObjectSpec(obj=view, skip=True, selectSet=[traversal_spec])
+            property_specs = []
+            for vimtype in self.vimtypes.values():
+                paths = ['name']
+                if vimtype is vim.VirtualMachine:
+                    paths.append('config.uuid')
+                property_specs.append(vmodl.query.PropertyCollector.PropertySpec(type=vimtype, pathSet=paths))
+            filter_spec = vmodl.query.PropertyCollector.FilterSpec(objectSet=[object_spec], propSet=property_specs)
+
+            collector = self.content.propertyCollector
+            entries = []
+            result = collector.RetrievePropertiesEx(specSet=[filter_spec],
+                                                    options=vmodl.query.PropertyCollector.RetrieveOptions())
+            while result is not None:
+                for obj in result.objects:
+                    properties = dict((prop.name, prop.val) for prop in obj.propSet)
+                    entries.append([obj.obj._wsdlName, obj.obj._moId,
+                                    properties.get('name'), properties.get('config.uuid')])
+                if not result.token:
+                    break
+                result = collector.ContinueRetrievePropertiesEx(token=result.token)
+        finally:
+            view.Destroy()
+
+        self.entries = entries
+        self.cached = False
+        self.save()
+
+    def load(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return False
+        try:
+            f = open(self.cache_file)
+            try:
+                cache = json.load(f)
+            finally:
+                f.close()
+        except (IOError, ValueError):
+            return False
+        if cache.get('server') != self.server or sorted(cache.get('types', [])) != sorted(self.vimtypes) or \
+                time.time() - cache.get('time', 0) > self.cache_ttl:
+            return False
+        self.entries = cache['entries']
+        self.cached = True
+        return True
+
+    def save(self):
+        if not self.cache_file:
+            return
+        # write to a temporary file first, so that concurrent tasks never
+        # read a half written cache
+        tmp_file = '%s.%d.tmp' % (self.cache_file, os.getpid())
+        f = open(tmp_file, 'w')
+        try:
+            json.dump(dict(server=self.server, types=list(self.vimtypes), time=time.time(),
+                           entries=self.entries), f)
+        finally:
+            f.close()
+        os.rename(tmp_file, self.cache_file)
+
+    def _find(self, vimtype, field, value):
+        for entry in self.entries:
+            if entry[0] == vimtype._wsdlName and entry[field] == value:
+                return vimtype(str(entry[1]), self.content.rootFolder._stub)
+        return None
+
+    def _is_current(self, ref, name):
+        try:
+            current_name = ref.name
+        except vmodl.fault.ManagedObjectNotFound:
+            return False
+        return name is None or current_name == name
+
+    def find(self, vimtype, name=None, moid=None, uuid=None):
+        """ Returns the object of vimtype with the given name, moid or uuid, or None. """
+        if self.entries is None and not self.load():
+            self.build()
+
+        field, value = 2, name
+        if moid is not None:
+            field, value = 1, moid
+        elif uuid is not None:
+            field, value = 3, uuid
+
+        ref = self._find(vimtype, field, value)
+        if self.cached:
+            if ref is None or not self._is_current(ref, name):
+                self.build()
+                ref = self._find(vimtype, field, value)
+        return ref
+
+
 def EnterMaintenanceMode(module, host):
 
     if host.runtime.inMaintenanceMode:
@@ -170,10 +343,186 @@ def ExitMaintenanceMode(module, host):
             msg='Host failed to exit maintenance mode')
 
 
+class TaskTracker(object):
+    """
+    Follows the state of many tasks with one property collector, which
+    reports the tasks that changed in a single WaitForUpdatesEx call instead
+    of polling every task on its own.
+    """
+
+    def __init__(self, content):
+        self.collector = content.propertyCollector.CreatePropertyCollector()
+        self.version = ''
+        self.filters = {}
+        self.properties = {}
+
+    def add(self, task):
+        object_spec = vmodl.query.PropertyCollector.ObjectSpec(obj=task, skip=False)
+        property_spec = vmodl.query.PropertyCollector.PropertySpec(type=vim.Task, pathSet=['info.state', 'info.error'],
+                                                                   all=False)
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec(objectSet=[object_spec], propSet=[property_spec])
+        self.filters[task._moId] = self.collector.CreateFilter(filter_spec, True)
+
+    def wait(self, max_wait=60):
+        """
+        Waits up to max_wait seconds for tasks to finish and returns a
+        dictionary of task moid -> error (None on success) of the tasks which
+        finished.
+        """
+        options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=max_wait)
+        update = self.collector.WaitForUpdatesEx(self.version, options)
+        finished = {}
+        if update is None:
+            return finished
+
+        self.version = update.version
+        for filter_update in update.filterSet:
+            for object_update in filter_update.objectSet:
+                moid = object_update.obj._moId
+                properties = self.properties.setdefault(moid, {})
+                for change in object_update.changeSet:
+                    properties[change.name] = change.val
+                state = properties.get('info.state')
+                if state == vim.TaskInfo.State.success:
+                    finished[moid] = None
+                elif state == vim.TaskInfo.State.error:
+                    error = properties.get('info.error')
+                    finished[moid] = getattr(error, 'msg', None) or 'An unknown error has occurred'
+                else:
+                    continue
+                self.filters.pop(moid).DestroyPropertyFilter()
+        return finished
+
+    def destroy(self):
+        self.collector.DestroyPropertyCollector()
+
+
+def get_ha_capacity(cluster):
+    """
+    Returns how many more hosts of cluster may enter maintenance mode at the
+    same time without violating its HA admission control policy, or None when
+    HA admission control does not limit it.
+    """
+    if not isinstance(cluster, vim.ClusterComputeResource):
+        return None
+
+    das_config = cluster.configurationEx.dasConfig
+    if not das_config.enabled or not das_config.admissionControlEnabled:
+        return None
+
+    policy = das_config.admissionControlPolicy
+    hosts = cluster.host
+    if isinstance(policy, vim.cluster.FailoverLevelAdmissionControlPolicy):
+        capacity = policy.failoverLevel
+    elif isinstance(policy, vim.cluster.FailoverHostAdmissionControlPolicy):
+        capacity = len(policy.failoverHosts or [])
+    elif isinstance(policy, vim.cluster.FailoverResourcesAdmissionControlPolicy):
+        percent = min(policy.cpuFailoverResourcesPercent, policy.memoryFailoverResourcesPercent)
+        capacity = len(hosts) * percent // 100
+    else:
+        return None
+
+    capacity -= len([host for host in hosts if host.runtime.inMaintenanceMode])
+    return max(capacity, 0)
+
+
+def start_maintenance_task(module, host):
+    if module.params['state'] == 'absent':
+        return host.ExitMaintenanceMode_Task(int(module.params['timeout']))
+
+    spec = vim.host.MaintenanceSpec()
+    if module.params['vsan']:
+        spec.vsanMode = vim.vsan.host.DecommissionMode()
+        spec.vsanMode.objectAction = module.params['vsan']
+    return host.EnterMaintenanceMode_Task(int(module.params['timeout']), module.params['evacuate'], spec)
+
+
+def change_maintenance_modes(module, content, hosts):
+    """
+    Puts hosts, a list of (hostname, host), into or out of maintenance mode,
+    running at most concurrency tasks at a time, and exits the module with
+    the result of every host.
+    """
+    entering = module.params['state'] == 'present'
+    concurrency = max(module.params['concurrency'], 1)
+    results = {}
+    pending = []
+
+    for hostname, host in hosts:
+        result = dict(hostname=hostname, hostsystem=str(host), changed=False, status='NO_ACTION')
+        results[hostname] = result
+        if host.runtime.inMaintenanceMode == entering:
+            result['msg'] = 'Host already in maintenance mode' if entering else 'Host not in maintenance mode'
+        else:
+            pending.append((hostname, host))
+
+    # remaining HA capacity of every cluster, looked up once per cluster
+    capacities = {}
+    running = {}
+    failed = False
+    tracker = TaskTracker(content)
+    try:
+        while pending or running:
+            for hostname, host in list(pending):
+                if failed or len(running) >= concurrency:
+                    break
+                cluster = host.parent
+                if entering:
+                    if cluster._moId not in capacities:
+                        capacities[cluster._moId] = get_ha_capacity(cluster)
+                    if capacities[cluster._moId] is not None and capacities[cluster._moId] <= 0:
+                        continue
+                    if capacities[cluster._moId] is not None:
+                        capacities[cluster._moId] -= 1
+
+                task = start_maintenance_task(module, host)
+                tracker.add(task)
+                running[task._moId] = (hostname, cluster)
+                pending.remove((hostname, host))
+
+            if not running:
+                # nothing left to wait for: the remaining hosts are held back
+                # by a failed host or by HA admission control
+                if failed:
+                    msg = 'Host not started because another host failed'
+                else:
+                    msg = 'HA admission control of the cluster does not allow more hosts in maintenance mode'
+                for hostname, host in pending:
+                    results[hostname].update(status='SKIPPED', msg=msg)
+                failed = failed or bool(pending)
+                break
+
+            for moid, error in tracker.wait().items():
+                hostname, cluster = running.pop(moid)
+                result = results[hostname]
+                if error:
+                    # a host which entered maintenance mode keeps using the
+                    # HA capacity of its cluster, only a failed one frees it
+                    if entering and capacities.get(cluster._moId) is not None:
+                        capacities[cluster._moId] += 1
+                    failed = True
+                    result.update(status='FAILED',
+                                  msg='Host failed to %s maintenance mode: %s' % ('enter' if entering else 'exit', error))
+                else:
+                    result.update(changed=True, status='ENTER' if entering else 'EXIT',
+                                  msg='Host entered maintenance mode' if entering else 'Host exited maintenance mode')
+    finally:
+        tracker.destroy()
+
+    host_results = [results[hostname] for hostname, host in hosts]
+    changed = any(result['changed'] for result in host_results)
+    if failed:
+        module.fail_json(msg='Some hosts failed to %s maintenance mode' % ('enter' if entering else 'exit'),
+                         changed=changed, hosts=host_results)
+    module.exit_json(changed=changed, hosts=host_results)
+
+
 def main():
     spec = vmware_argument_spec()
     spec.update(dict(
-        esxi_hostname=dict(required=True),
+        esxi_hostname=dict(required=False),
+        esxi_hostnames=dict(required=False, type='list'),
+        concurrency=dict(required=False, type='int', default=1),
         vsan=dict(required=False, choices=['ensureObjectAccessibility',
                                            'evacuateAllData',
                                            'noAction']),
@@ -181,15 +530,31 @@ def main():
         timeout=dict(required=False, default=0),
         state=dict(required=False,
                    default='present',
-                   choices=['present', 'absent'])))
+                   choices=['present', 'absent']),
+        inventory_cache=dict(required=False, type='path'),
+        inventory_cache_ttl=dict(required=False, type='int', default=300)))
 
-    module = AnsibleModule(argument_spec=spec)
+    module = AnsibleModule(argument_spec=spec,
+                           mutually_exclusive=[['esxi_hostname', 'esxi_hostnames']],
+                           required_one_of=[['esxi_hostname', 'esxi_hostnames']])
 
     if not HAS_PYVMOMI:
         module.fail_json(msg='pyvmomi is required for this module')
 
     content = connect_to_api(module)
-    host = find_hostsystem_by_name(content, module.params['esxi_hostname'])
+    index = InventoryIndex(content, module.params['hostname'], [vim.HostSystem],
+                           module.params['inventory_cache'], module.params['inventory_cache_ttl'])
+
+    if module.params['esxi_hostnames']:
+        hosts = []
+        for hostname in module.params['esxi_hostnames']:
+            host = index.find(vim.HostSystem, name=hostname)
+            if not host:
+                module.fail_json(msg='Host %s not found in vCenter' % hostname)
+            hosts.append((hostname, host))
+        change_maintenance_modes(module, content, hosts)
+
+    host = index.find(vim.HostSystem, name=module.params['esxi_hostname'])
 
     if not host:
         module.fail_json(
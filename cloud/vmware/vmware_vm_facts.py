@@ -24,6 +24,8 @@ module: vmware_vm_facts
 short_description: Return basic facts pertaining to a vSphere virtual machine guest
 description:
     - Return basic facts pertaining to a vSphere virtual machine guest
+    - The facts of all virtual machines are fetched with paged PropertyCollector calls, so only the
+      requested properties are transferred and no per virtual machine round trips are made.
 version_added: 2.0
 author: "Joseph Callen (@jcpowermac)"
 notes:
@@ -31,6 +33,34 @@ notes:
 requirements:
     - "python >= 2.6"
     - PyVmomi
+options:
+    properties:
+        description:
+            - List of virtual machine property paths to return, for example C(config.hardware.numCPU) or
+              C(runtime.host). Each virtual machine is then returned with the requested paths as keys instead
+              of the default facts (guest_fullname, power_state, ip_address).
+            - Data objects are returned as dictionaries and managed objects as their managed object id.
+        required: False
+        default: None
+        version_added: "2.2"
+    cluster:
+        description:
+            - Only return the virtual machines of this cluster.
+        required: False
+        default: None
+        version_added: "2.2"
+    folder:
+        description:
+            - Only return the virtual machines below this inventory path, for example C(DC1/vm/production).
+        required: False
+        default: None
+        version_added: "2.2"
+    page_size:
+        description:
+            - Maximum number of virtual machines to retrieve per call.
+        required: False
+        default: 1000
+        version_added: "2.2"
 extends_documentation_fragment: vmware.documentation
 '''
 
@@ -41,8 +71,22 @@ EXAMPLES = '''
     hostname: esxi_or_vcenter_ip_or_hostname
     username: username
     password: password
+
+- name: Gather the CPU and memory sizing of the virtual machines of a cluster
+  local_action:
+    module: vmware_vm_facts
+    hostname: esxi_or_vcenter_ip_or_hostname
+    username: username
+    password: password
+    cluster: production
+    properties:
+      - config.hardware.numCPU
+      - config.hardware.memoryMB
+      - runtime.powerState
 '''
 
+import datetime
+
 try:
     from pyVmomi import vim, vmodl
     HAS_PYVMOMI = True
@@ -50,42 +94,113 @@ except ImportError:
     HAS_PYVMOMI = False
 
 
-# https://github.com/vmware/pyvmomi-community-samples/blob/master/samples/getallvms.py
-def get_all_virtual_machines(content):
-    virtual_machines = get_all_objs(content, [vim.VirtualMachine])
-    _virtual_machines = {}
+# default fact -> property path
+DEFAULT_PROPERTIES = [
+    ('guest_fullname', 'summary.config.guestFullName'),
+    ('power_state', 'summary.runtime.powerState'),
+    ('ip_address', 'summary.guest.ipAddress'),
+]
+
+
+def to_facts(value):
+    """ Converts a property value into something which can be returned as JSON. """
+    if isinstance(value, vmodl.ManagedObject):
+        return value._moId
+    if isinstance(value, vmodl.DynamicData):
+        return dict((prop.name, to_facts(getattr(value, prop.name))) for prop in value._GetPropertyList())
+    if isinstance(value, (list, tuple)):
+        return [to_facts(item) for item in value]
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def get_scope(content, module):
+    cluster_name = module.params['cluster']
+    folder_path = module.params['folder']
+
+    if cluster_name:
+        cluster = find_cluster_by_name(content, cluster_name)
+        if cluster is None:
+            module.fail_json(msg="Cluster %s not found" % cluster_name)
+        return cluster
+    if folder_path:
+        folder = content.searchIndex.FindByInventoryPath(inventoryPath=folder_path)
+        if folder is None:
+            module.fail_json(msg="Folder %s not found" % folder_path)
+        return folder
+    return content.rootFolder
+
+
+def retrieve_vm_properties(content, scope, paths, page_size):
+    """
+    Yields (name, properties) for every virtual machine below scope, where
+    properties maps the requested paths to their values. Properties which
+    are not set are left out.
+    """
+    view = content.viewManager.CreateContainerView(scope, [vim.VirtualMachine], True)
+    try:
+        traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(
+            name='traverseView', path='view', skip=False, type=vim.view.ContainerView)
+        object_spec = vmodl.query.PropertyCollector.ObjectSpec(obj=view, skip=True, selectSet=[traversal_spec])
+        property_spec = vmodl.query.PropertyCollector.PropertySpec(
+            type=vim.VirtualMachine, pathSet=['name'] + paths, all=False)
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec(objectSet=[object_spec], propSet=[property_spec])
+        options = vmodl.query.PropertyCollector.RetrieveOptions(maxObjects=page_size)
+
+        collector = content.propertyCollector
+        result = collector.RetrievePropertiesEx(specSet=[filter_spec], options=options)
+        while result is not None:
+            for obj in result.objects:
+                properties = dict((prop.name, prop.val) for prop in obj.propSet)
+                yield properties.pop('name', obj.obj._moId), properties
+            if not result.token:
+                break
+            result = collector.ContinueRetrievePropertiesEx(token=result.token)
+    finally:
+        view.Destroy()
+
+
+def get_all_virtual_machines(content, scope=None, properties=None, page_size=1000):
+    if scope is None:
+        scope = content.rootFolder
 
-    for vm in virtual_machines:
-        _ip_address = ""
-        summary = vm.summary
-        if summary.guest is not None:
-            _ip_address = summary.guest.ipAddress
-            if _ip_address is None:
-                _ip_address = ""
-
-        virtual_machine = {
-            summary.config.name: {
-                "guest_fullname": summary.config.guestFullName,
-                "power_state": summary.runtime.powerState,
-                "ip_address": _ip_address
-            }
-        }
-
-        _virtual_machines.update(virtual_machine)
+    _virtual_machines = {}
+    if properties:
+        for name, values in retrieve_vm_properties(content, scope, properties, page_size):
+            _virtual_machines[name] = dict((path, to_facts(values.get(path))) for path in properties)
+        return _virtual_machines
+
+    paths = [path for fact, path in DEFAULT_PROPERTIES]
+    for name, values in retrieve_vm_properties(content, scope, paths, page_size):
+        virtual_machine = dict((fact, values.get(path)) for fact, path in DEFAULT_PROPERTIES)
+        if virtual_machine['ip_address'] is None:
+            virtual_machine['ip_address'] = ""
+        _virtual_machines[name] = virtual_machine
     return _virtual_machines
 
 
 def main():
 
     argument_spec = vmware_argument_spec()
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False)
+    argument_spec.update(dict(
+        properties=dict(type='list', required=False),
+        cluster=dict(type='str', required=False),
+        folder=dict(type='str', required=False),
+        page_size=dict(type='int', default=1000),
+    ))
+    module = AnsibleModule(argument_spec=argument_spec,
+                           mutually_exclusive=[['cluster', 'folder']],
+                           supports_check_mode=False)
 
     if not HAS_PYVMOMI:
         module.fail_json(msg='pyvmomi is required for this module')
 
     try:
         content = connect_to_api(module)
-        _virtual_machines = get_all_virtual_machines(content)
+        scope = get_scope(content, module)
+        _virtual_machines = get_all_virtual_machines(content, scope, module.params['properties'],
+                                                     module.params['page_size'])
         module.exit_json(changed=False, virtual_machines=_virtual_machines)
     except vmodl.RuntimeFault as runtime_fault:
         module.fail_json(msg=runtime_fault.msg)
@@ -24,6 +24,8 @@ module: vmware_vm_shell
 short_description: Execute a process in VM
 description:
     - Start a program in a VM without the need for network connection
+    - The program can be started in many VMs at once with I(vm_ids), optionally waiting for it to finish and
+      returning its exit code and output
 version_added: 2.1
 author: "Ritesh Khadgaray (@ritzk)"
 notes:
@@ -47,8 +49,15 @@ options:
         default: None
     vm_id:
         description:
-            - The identification for the VM
-        required: True
+            - The identification for the VM. Required unless I(vm_ids) is given.
+        required: False
+    vm_ids:
+        description:
+            - List of identifications of VMs, of type I(vm_id_type), to start the program in concurrently
+              instead of I(vm_id). The result of every VM is returned in C(results).
+        required: False
+        default: None
+        version_added: "2.2"
     vm_id_type:
         description:
             - The identification tag for the VM
@@ -88,6 +97,34 @@ options:
             - The current working directory of the application from which it will be run
         required: False
         default: None
+    wait_for_process:
+        description:
+            - Wait for the program to finish and return its C(exit_code). The processes of all VMs are polled
+              with one ListProcessesInGuest call per VM and round, backing off while they run.
+        required: False
+        default: False
+        version_added: "2.2"
+    capture_output:
+        description:
+            - Redirect the output of the program into temporary files in the guest and return it as C(stdout) and
+              C(stderr), fetched through guest file transfer once the program finished. Implies I(wait_for_process).
+            - The redirection is appended to I(vm_shell_args), so it relies on the program being run through a
+              shell, as it is on Linux guests.
+        required: False
+        default: False
+        version_added: "2.2"
+    wait_timeout:
+        description:
+            - Number of seconds to wait for the program to finish.
+        required: False
+        default: 3600
+        version_added: "2.2"
+    concurrency:
+        description:
+            - Maximum number of VMs to make guest operations calls against at the same time.
+        required: False
+        default: 10
+        version_added: "2.2"
 extends_documentation_fragment: vmware.documentation
 '''
 
@@ -109,8 +146,28 @@ EXAMPLES = '''
           - "VAR=test"
         vm_shell_cwd: "/tmp"
 
+    - name: collect the uptime of several VMs
+      local_action:
+        module: vmware_vm_shell
+        hostname: myVSphere
+        username: myUsername
+        password: mySecret
+        vm_ids:
+          - web01
+          - web02
+          - db01
+        vm_username: root
+        vm_password: superSecret
+        vm_shell: /usr/bin/uptime
+        capture_output: yes
+      register: uptimes
+
 '''
 
+import random
+import time
+from multiprocessing.pool import ThreadPool
+
 try:
     from pyVmomi import vim, vmodl
     HAS_PYVMOMI = True
@@ -126,21 +183,161 @@ def execute_command(content, vm, vm_username, vm_password, program_path, args=""
 
     return cmdpid
 
+
+def run_concurrently(func, items, concurrency):
+    """
+    Calls func(item) for every item on a thread pool and returns (result,
+    error) tuples in the order of the items.
+    """
+    def run(item):
+        try:
+            return func(item), None
+        except vmodl.MethodFault as method_fault:
+            return None, method_fault.msg
+        except Exception as e:
+            return None, str(e)
+
+    if len(items) <= 1 or concurrency <= 1:
+        return [run(item) for item in items]
+
+    pool = ThreadPool(min(concurrency, len(items)))
+    try:
+        return pool.map(run, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def fetch_guest_file(module, content, vm, creds, path):
+    """ Returns the content of a file in the guest and deletes the file. """
+    file_manager = content.guestOperationsManager.fileManager
+    transfer = file_manager.InitiateFileTransferFromGuest(vm=vm, auth=creds, guestFilePath=path)
+    # the host name in the URL is * when it is the one of the connection
+    url = transfer.url.replace('https://*', 'https://%s' % module.params['hostname'], 1)
+    data = open_url(url, validate_certs=module.params['validate_certs']).read()
+    file_manager.DeleteFileInGuest(vm=vm, auth=creds, filePath=path)
+    return data
+
+
+def wait_for_processes(content, creds, processes, timeout, concurrency):
+    """
+    Waits for processes, a list of (vm, pid), to finish. Returns a list of
+    (exit_code, error) in the order of processes; exit_code is None when the
+    process did not finish within timeout seconds.
+    """
+    process_manager = content.guestOperationsManager.processManager
+    results = [(None, None)] * len(processes)
+    pending = range(len(processes))
+    deadline = time.time() + timeout
+    delay = 1
+
+    def list_process(i):
+        vm, pid = processes[i]
+        return process_manager.ListProcessesInGuest(vm=vm, auth=creds, pids=[pid])
+
+    while pending:
+        still_pending = []
+        for i, (infos, error) in zip(pending, run_concurrently(list_process, pending, concurrency)):
+            if error:
+                results[i] = (None, error)
+            elif infos and infos[0].endTime is None:
+                still_pending.append(i)
+            else:
+                results[i] = (infos[0].exitCode if infos else None, None)
+        pending = still_pending
+
+        if not pending or time.time() >= deadline:
+            break
+        time.sleep(min(delay + random.uniform(0, delay), max(deadline - time.time(), 0)))
+        delay = min(delay * 2, 10)
+    return results
+
+
+def execute_commands(module, content, vms):
+    """
+    Starts the program in every VM of vms, a list of (vm_id, vm), and returns
+    a list with the result of every VM, with the error of a VM in msg.
+    """
+    p = module.params
+    concurrency = p['concurrency']
+    creds = vim.vm.guest.NamePasswordAuthentication(username=p['vm_username'], password=p['vm_password'])
+    file_manager = content.guestOperationsManager.fileManager
+    capture_output = p['capture_output']
+
+    def start(item):
+        vm_id, vm = item
+        args = p['vm_shell_args']
+        output_files = None
+        if capture_output:
+            output_files = (file_manager.CreateTemporaryFileInGuest(vm=vm, auth=creds, prefix='ansible-', suffix='.stdout'),
+                            file_manager.CreateTemporaryFileInGuest(vm=vm, auth=creds, prefix='ansible-', suffix='.stderr'))
+            args = '%s > %s 2> %s' % (args, output_files[0], output_files[1])
+        pid = execute_command(content, vm, p['vm_username'], p['vm_password'],
+                              p['vm_shell'], args, p['vm_shell_env'], p['vm_shell_cwd'])
+        return vm.summary.config.uuid, pid, output_files
+
+    results = []
+    started = []
+    for (vm_id, vm), (info, error) in zip(vms, run_concurrently(start, vms, concurrency)):
+        result = dict(vm_id=vm_id, failed=bool(error))
+        if error:
+            result['msg'] = error
+        else:
+            result.update(uuid=info[0], msg=info[1], pid=info[1])
+            started.append((vm, info[1], info[2], result))
+        results.append(result)
+
+    if not (p['wait_for_process'] or capture_output) or not started:
+        return results
+
+    exits = wait_for_processes(content, creds, [(vm, pid) for vm, pid, output_files, result in started],
+                               p['wait_timeout'], concurrency)
+    finished = []
+    for (vm, pid, output_files, result), (exit_code, error) in zip(started, exits):
+        if error:
+            result.update(failed=True, msg=error)
+        elif exit_code is None:
+            result.update(failed=True, msg='Timeout waiting for process %s to finish' % pid)
+        else:
+            result['exit_code'] = exit_code
+            if output_files:
+                finished.append((vm, output_files, result))
+
+    def fetch(item):
+        vm, output_files, result = item
+        return [fetch_guest_file(module, content, vm, creds, path) for path in output_files]
+
+    for (vm, output_files, result), (output, error) in zip(finished, run_concurrently(fetch, finished, concurrency)):
+        if error:
+            result.update(failed=True, msg='Failed to fetch the output of the process: %s' % error)
+        else:
+            result.update(stdout=output[0], stderr=output[1])
+    return results
+
+
 def main():
 
     argument_spec = vmware_argument_spec()
     argument_spec.update(dict(datacenter=dict(default=None, type='str'),
                               cluster=dict(default=None, type='str'),
-                              vm_id=dict(required=True, type='str'),
+                              vm_id=dict(required=False, type='str'),
+                              vm_ids=dict(required=False, type='list'),
                               vm_id_type=dict(default='vm_name', type='str', choices=['inventory_path', 'uuid', 'dns_name', 'vm_name']),
                               vm_username=dict(required=False, type='str'),
                               vm_password=dict(required=False, type='str', no_log=True),
                               vm_shell=dict(required=True, type='str'),
                               vm_shell_args=dict(default=" ", type='str'),
                               vm_shell_env=dict(default=None, type='list'),
-                              vm_shell_cwd=dict(default=None, type='str')))
+                              vm_shell_cwd=dict(default=None, type='str'),
+                              wait_for_process=dict(default=False, type='bool'),
+                              capture_output=dict(default=False, type='bool'),
+                              wait_timeout=dict(default=3600, type='int'),
+                              concurrency=dict(default=10, type='int')))
 
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False)
+    module = AnsibleModule(argument_spec=argument_spec,
+                           mutually_exclusive=[['vm_id', 'vm_ids']],
+                           required_one_of=[['vm_id', 'vm_ids']],
+                           supports_check_mode=False)
 
     if not HAS_PYVMOMI:
         module.fail_json(changed=False, msg='pyvmomi is required for this module')
@@ -164,14 +361,33 @@ def main():
             if not cluster:
                 module.fail_json(changed=False, msg="cluster not found")
 
-        vm = find_vm_by_id(content, p['vm_id'], p['vm_id_type'], datacenter, cluster)
-        if not vm:
-            module.fail_json(msg='VM not found')
+        vms = []
+        for vm_id in p['vm_ids'] or [p['vm_id']]:
+            vm = find_vm_by_id(content, vm_id, p['vm_id_type'], datacenter, cluster)
+            if not vm:
+                module.fail_json(msg='VM not found' if not p['vm_ids'] else 'VM %s not found' % vm_id)
+            vms.append((vm_id, vm))
+
+        if not p['vm_ids'] and not p['wait_for_process'] and not p['capture_output']:
+            vm = vms[0][1]
+            msg = execute_command(content, vm, p['vm_username'], p['vm_password'],
+                                  p['vm_shell'], p['vm_shell_args'], p['vm_shell_env'], p['vm_shell_cwd'])
+
+            module.exit_json(changed=True, uuid=vm.summary.config.uuid, msg=msg)
 
-        msg = execute_command(content, vm, p['vm_username'], p['vm_password'],
-                              p['vm_shell'], p['vm_shell_args'], p['vm_shell_env'], p['vm_shell_cwd'])
+        results = execute_commands(module, content, vms)
+        if not p['vm_ids']:
+            result = results[0]
+            del result['vm_id']
+            if result.pop('failed'):
+                module.fail_json(changed='pid' in result, **result)
+            module.exit_json(changed=True, **result)
 
-        module.exit_json(changed=True, uuid=vm.summary.config.uuid, msg=msg)
+        failed = [result['vm_id'] for result in results if result['failed']]
+        if failed:
+            module.fail_json(changed=any('pid' in result for result in results), results=results,
+                             msg='Failed to run the program in: %s' % ', '.join(failed))
+        module.exit_json(changed=True, results=results)
     except vmodl.RuntimeFault as runtime_fault:
         module.fail_json(changed=False, msg=runtime_fault.msg)
     except vmodl.MethodFault as method_fault:
@@ -181,6 +397,7 @@ def main():
 
 from ansible.module_utils.vmware import *
 from ansible.module_utils.basic import *
+from ansible.module_utils.urls import open_url
 
 if __name__ == '__main__':
     main()
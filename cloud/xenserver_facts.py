@@ -22,12 +22,45 @@ version_added: "2.0"
 short_description: get facts reported on xenserver
 description:
   - Reads data out of XenAPI, can be used instead of multiple xe commands.
+  - The records of every class are read with one call per class, or incrementally with I(cache).
 author:
     - Andy Hill (@andyhky)
     - Tim Rupp
+options:
+  classes:
+    description:
+      - The object classes to collect facts about.
+    required: false
+    default: ['network', 'PIF', 'VLAN', 'VM', 'SR']
+    choices: ['network', 'PIF', 'VLAN', 'VM', 'SR']
+    version_added: "2.2"
+  fields:
+    description:
+      - Only return these fields of every record (plus C(ref)), for example C(name_label) and C(power_state).
+        By default all fields are returned.
+    required: false
+    default: null
+    version_added: "2.2"
+  filters:
+    description:
+      - Dictionary of class to a XenAPI query expression, evaluated by the server with get_all_records_where,
+        for example C(field "is_a_template"="false") for the class C(VM).
+    required: false
+    default: null
+    version_added: "2.2"
+  cache:
+    description:
+      - Path of a file to keep a snapshot of the records in. Later runs only fetch the changes since the
+        snapshot with event.from, instead of all records. Classes with a filter are always read in full.
+    required: false
+    default: null
+    version_added: "2.2"
 '''
 
+import json
+import os
 import platform
+import xmlrpclib
 import XenAPI
 
 EXAMPLES = '''
@@ -39,6 +72,14 @@ EXAMPLES = '''
   with_items: xs_vms.keys()
   when: xs_vms[item]['power_state'] == "Running"
 
+- name: Gather the power state of the VMs which are not templates
+  xenserver_facts:
+    classes: ['VM']
+    fields: ['name_label', 'power_state']
+    filters:
+      VM: 'field "is_a_template"="false" and field "is_control_domain"="false"'
+    cache: /var/cache/ansible/xenserver_facts.json
+
 TASK: [Print running VMs] ***********************************************************
 skipping: [10.13.0.22] => (item=CentOS 4.7 (32-bit))
 ok: [10.13.0.22] => (item=Control domain on host: 10.0.13.22) => {
@@ -79,8 +120,96 @@ def get_xenapi_session():
     return session
 
 
-def get_networks(session):
-    recs = session.xenapi.network.get_all_records()
+FACT_CLASSES = ['network', 'PIF', 'VLAN', 'VM', 'SR']
+
+
+def to_json(value):
+    """ Converts the XML-RPC dates of a record into strings. """
+    if isinstance(value, xmlrpclib.DateTime):
+        return value.value
+    if isinstance(value, dict):
+        return dict((key, to_json(item)) for key, item in value.iteritems())
+    if isinstance(value, list):
+        return [to_json(item) for item in value]
+    return value
+
+
+def get_records(session, cls, expression=None):
+    api = getattr(session.xenapi, cls)
+    if expression:
+        return api.get_all_records_where(expression)
+    return api.get_all_records()
+
+
+def load_snapshot(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        f = open(path)
+        try:
+            return json.load(f)
+        finally:
+            f.close()
+    except (IOError, ValueError):
+        return None
+
+
+def save_snapshot(path, snapshot):
+    # os.rename replaces the old snapshot atomically
+    tmp_path = '%s.%d.tmp' % (path, os.getpid())
+    f = open(tmp_path, 'w')
+    try:
+        json.dump(snapshot, f)
+    finally:
+        f.close()
+    os.rename(tmp_path, path)
+
+
+def refresh_snapshot(session, classes, snapshot=None):
+    """
+    Returns the records of classes by class and ref, together with the
+    event token they are current at. Starting from snapshot, only the events
+    since its token are fetched; without one, event.from with an empty token
+    returns every record as an add event.
+    """
+    event_from = getattr(session.xenapi.event, 'from')
+
+    if snapshot and sorted(snapshot.get('classes', [])) == sorted(classes):
+        token = snapshot['token']
+        records = snapshot['records']
+    else:
+        token = ''
+        records = dict((cls, {}) for cls in classes)
+
+    try:
+        result = event_from(classes, token, 0.0)
+    except XenAPI.Failure:
+        # the token is too old or belongs to a restarted server
+        if not token:
+            raise
+        return refresh_snapshot(session, classes)
+
+    class_names = dict((cls.lower(), cls) for cls in classes)
+    for event in result['events']:
+        cls = class_names.get(event['class'].lower())
+        if cls is None:
+            continue
+        if event['operation'] == 'del':
+            records[cls].pop(event['ref'], None)
+        elif 'snapshot' in event:
+            records[cls][event['ref']] = to_json(event['snapshot'])
+
+    return dict(classes=classes, token=result['token'], records=records)
+
+
+def select_fields(recs, fields):
+    if not fields:
+        return recs
+    return dict((key, dict((field, rec[field]) for field in fields + ['ref'] if field in rec))
+                for key, rec in recs.iteritems())
+
+
+def get_networks(recs):
     xs_networks = {}
     networks = change_keys(recs, key='uuid')
     for network in networks.itervalues():
@@ -88,8 +217,7 @@ def get_networks(session):
     return xs_networks
 
 
-def get_pifs(session):
-    recs = session.xenapi.PIF.get_all_records()
+def get_pifs(recs):
     pifs = change_keys(recs, key='uuid')
     xs_pifs = {}
     devicenums = range(0, 7)
@@ -104,8 +232,7 @@ def get_pifs(session):
     return xs_pifs
 
 
-def get_vlans(session):
-    recs = session.xenapi.VLAN.get_all_records()
+def get_vlans(recs):
     return change_keys(recs, key='tag')
 
 
@@ -133,9 +260,8 @@ def get_host(session):
     # We only have one host, so just return its entry
     return session.xenapi.host.get_record(host_recs[0])
 
-def get_vms(session):
+def get_vms(recs):
     xs_vms = {}
-    recs = session.xenapi.VM.get_all()
     if not recs:
         return None
 
@@ -145,9 +271,8 @@ def get_vms(session):
     return xs_vms
 
 
-def get_srs(session):
+def get_srs(recs):
     xs_srs = {}
-    recs = session.xenapi.SR.get_all()
     if not recs:
         return None
     srs = change_keys(recs, key='uuid')
@@ -156,7 +281,22 @@ def get_srs(session):
     return xs_srs
 
 def main():
-    module = AnsibleModule({})
+    module = AnsibleModule(
+        argument_spec=dict(
+            classes=dict(type='list', default=FACT_CLASSES),
+            fields=dict(type='list', default=None),
+            filters=dict(type='dict', default=None),
+            cache=dict(type='path', default=None),
+        ),
+        supports_check_mode=True,
+    )
+
+    classes = module.params['classes']
+    filters = module.params['filters'] or {}
+    cache = module.params['cache']
+    for cls in classes + filters.keys():
+        if cls not in FACT_CLASSES:
+            module.fail_json(msg='%s is not one of the classes %s' % (cls, ', '.join(FACT_CLASSES)))
 
     obj = XenServerFacts()
     try:
@@ -169,24 +309,34 @@ def main():
         'xenserver_codename': obj.codename
     }
 
-    xs_networks = get_networks(session)
-    xs_pifs = get_pifs(session)
-    xs_vlans = get_vlans(session)
-    xs_vms = get_vms(session)
-    xs_srs = get_srs(session)
-
-    if xs_vlans:
-        data['xs_vlans'] = xs_vlans
-    if xs_pifs:
-        data['xs_pifs'] = xs_pifs
-    if xs_networks:
-        data['xs_networks'] = xs_networks
-
-    if xs_vms:
-        data['xs_vms'] = xs_vms
-
-    if xs_srs:
-        data['xs_srs'] = xs_srs
+    records = {}
+    try:
+        cached_classes = [cls for cls in classes if cls not in filters] if cache else []
+        if cached_classes:
+            snapshot = refresh_snapshot(session, cached_classes, load_snapshot(cache))
+            save_snapshot(cache, snapshot)
+            records.update(snapshot['records'])
+        for cls in classes:
+            if cls not in records:
+                records[cls] = to_json(get_records(session, cls, filters.get(cls)))
+    except XenAPI.Failure, e:
+        module.fail_json(msg='%s' % e)
+    except (IOError, OSError), e:
+        module.fail_json(msg='Failed to write the cache %s: %s' % (cache, e))
+
+    facts = [
+        ('VLAN', 'xs_vlans', get_vlans),
+        ('PIF', 'xs_pifs', get_pifs),
+        ('network', 'xs_networks', get_networks),
+        ('VM', 'xs_vms', get_vms),
+        ('SR', 'xs_srs', get_srs),
+    ]
+    for cls, key, get_facts in facts:
+        if cls not in records:
+            continue
+        xs_facts = get_facts(records[cls])
+        if xs_facts:
+            data[key] = select_fields(xs_facts, module.params['fields'])
 
     module.exit_json(ansible=data)
 
@@ -63,7 +63,8 @@ options:
         description:
             - Name of the host in Zabbix.
             - host_name is the unique identifier used and cannot be updated using this module.
-        required: true
+            - Required unless C(hosts) is given.
+        required: false
     host_groups:
         description:
             - List of host groups the host is part of.
@@ -117,6 +118,16 @@ options:
         default: "yes"
         choices: [ "yes", "no" ]
         version_added: "2.0"
+    hosts:
+        description:
+            - List of hosts to manage in a single task, mutually exclusive with C(host_name).
+            - Each item is a dictionary with a C(host_name) and any of C(host_groups), C(link_templates),
+              C(inventory_mode), C(status), C(state), C(interfaces), C(force) and C(proxy). Options missing
+              from an item default to the value of the module option.
+            - The groups, templates, proxies and hosts of all the items are resolved with one API call each.
+        required: false
+        default: None
+        version_added: "2.2"
 '''
 
 EXAMPLES = '''
@@ -150,13 +161,47 @@ EXAMPLES = '''
         dns: ""
         port: 12345
     proxy: a.zabbix.proxy
+
+- name: Create or update many hosts in one task
+  local_action:
+    module: zabbix_host
+    server_url: http://monitor.example.com
+    login_user: username
+    login_password: password
+    host_groups:
+      - Example group1
+    link_templates:
+      - Example template1
+    hosts:
+      - host_name: ExampleHost1
+        interfaces:
+          - type: 1
+            main: 1
+            useip: 1
+            ip: 10.xx.xx.1
+            dns: ""
+            port: 10050
+      - host_name: ExampleHost2
+        host_groups:
+          - Example group2
+        interfaces:
+          - type: 1
+            main: 1
+            useip: 1
+            ip: 10.xx.xx.2
+            dns: ""
+            port: 10050
+      - host_name: RetiredHost
+        state: absent
 '''
 
 import logging
 import copy
+import json
 
 try:
     from zabbix_api import ZabbixAPI, ZabbixAPISubClass
+    from zabbix_api import ZabbixAPIException
 
     HAS_ZABBIX_API = True
 except ImportError:
@@ -174,22 +219,91 @@ class ZabbixAPIExtends(ZabbixAPI):
         ZabbixAPI.__init__(self, server, timeout=timeout, user=user, passwd=passwd)
         self.hostinterface = ZabbixAPISubClass(self, dict({"prefix": "hostinterface"}, **kwargs))
 
+    # send several api calls in a single JSON-RPC batch request,
+    # the results are returned in the order of the calls
+    def batch(self, calls):
+        if not calls:
+            return []
+        request = []
+        for call_id, (method, params) in enumerate(calls):
+            request.append({'jsonrpc': '2.0', 'method': method, 'params': params,
+                            'auth': self.auth, 'id': call_id})
+        response = self.do_request(json.dumps(request))
+        results = [None] * len(calls)
+        for item in response:
+            if 'error' in item:
+                raise ZabbixAPIException("%s failed: %s" % (calls[item['id']][0], item['error']))
+            results[item['id']] = item['result']
+        return results
+
 
 class Host(object):
     def __init__(self, module, zbx):
         self._module = module
         self._zapi = zbx
+        self._host_cache = {}
+        self._id_cache = {'hostgroup': {}, 'template': {}, 'proxy': {}}
+
+    # fetch the named hosts in one call, along with their groups, templates and interfaces
+    def fetch_hosts(self, host_names):
+        missing = [name for name in set(host_names) if name not in self._host_cache]
+        if missing:
+            host_list = self._zapi.host.get({'output': 'extend', 'filter': {'host': missing},
+                                             'selectGroups': 'extend',
+                                             'selectParentTemplates': ['templateid'],
+                                             'selectInterfaces': 'extend'})
+            for name in missing:
+                self._host_cache[name] = None
+            for host in host_list:
+                self._host_cache[host['host']] = host
+        return [self._host_cache[name] for name in host_names if self._host_cache[name]]
+
+    # look up the ids of the named groups, templates or proxies in one call,
+    # names resolved before are served from the cache
+    def get_ids_by_names(self, kind, names):
+        cache = self._id_cache[kind]
+        missing = [name for name in set(names) if name not in cache]
+        if missing:
+            if kind == 'hostgroup':
+                api, name_key, id_key = self._zapi.hostgroup, 'name', 'groupid'
+            elif kind == 'template':
+                api, name_key, id_key = self._zapi.template, 'host', 'templateid'
+            else:
+                api, name_key, id_key = self._zapi.proxy, 'host', 'proxyid'
+            for name in missing:
+                cache[name] = None
+            for item in api.get({'output': 'extend', 'filter': {name_key: missing}}):
+                cache[item[name_key]] = item[id_key]
+        return dict((name, cache[name]) for name in names)
+
+    # resolve all groups, templates, proxies and hosts of a list of hosts up front
+    def prefetch(self, host_params):
+        group_names = set()
+        template_names = set()
+        proxy_names = set()
+        for params in host_params:
+            group_names.update(params['host_groups'] or [])
+            template_names.update(params['link_templates'] or [])
+            if params['proxy']:
+                proxy_names.add(params['proxy'])
+        if group_names:
+            self.get_ids_by_names('hostgroup', group_names)
+        if template_names:
+            self.get_ids_by_names('template', template_names)
+        if proxy_names:
+            self.get_ids_by_names('proxy', proxy_names)
+        self.fetch_hosts([params['host_name'] for params in host_params])
 
     # exist host
     def is_host_exist(self, host_name):
-        result = self._zapi.host.get({'filter': {'host': host_name}})
+        result = self.fetch_hosts([host_name])
         return result
 
     # check if host group exists
     def check_host_group_exist(self, group_names):
+        group_ids = self.get_ids_by_names('hostgroup', group_names)
         for group_name in group_names:
-            result = self._zapi.hostgroup.get({'filter': {'name': group_name}})
-            if not result:
+            if not group_ids[group_name]:
                 self._module.fail_json(msg="Hostgroup not found: %s" % group_name)
         return True
 
@@ -197,19 +311,18 @@ class Host(object):
         template_ids = []
         if template_list is None or len(template_list) == 0:
             return template_ids
+        found_ids = self.get_ids_by_names('template', template_list)
         for template in template_list:
-            template_list = self._zapi.template.get({'output': 'extend', 'filter': {'host': template}})
-            if len(template_list) < 1:
+            if not found_ids[template]:
                 self._module.fail_json(msg="Template not found: %s" % template)
             else:
-                template_id = template_list[0]['templateid']
-                template_ids.append(template_id)
+                template_ids.append(found_ids[template])
         return template_ids
 
     def add_host(self, host_name, group_ids, status, interfaces, proxy_id):
         try:
             if self._module.check_mode:
-                self._module.exit_json(changed=True)
+                return None
             parameters = {'host': host_name, 'interfaces': interfaces, 'groups': group_ids, 'status': status}
             if proxy_id:
                 parameters['proxy_hostid'] = proxy_id
@@ -222,13 +335,15 @@ class Host(object):
     def update_host(self, host_name, group_ids, status, host_id, interfaces, exist_interface_list, proxy_id):
         try:
             if self._module.check_mode:
-                self._module.exit_json(changed=True)
+                return
             parameters = {'hostid': host_id, 'groups': group_ids, 'status': status}
             if proxy_id:
                 parameters['proxy_hostid'] = proxy_id
             self._zapi.host.update(parameters)
             interface_list_copy = exist_interface_list
             if interfaces:
+                # collect the interface changes and send them in a single batch request
+                calls = []
                 for interface in interfaces:
                     flag = False
                     interface_str = interface
@@ -238,35 +353,36 @@ class Host(object):
                         if interface_type == exist_interface_type:
                             # update
                             interface_str['interfaceid'] = exist_interface['interfaceid']
-                            self._zapi.hostinterface.update(interface_str)
+                            calls.append(('hostinterface.update', interface_str))
                             flag = True
                             interface_list_copy.remove(exist_interface)
                             break
                     if not flag:
                         # add
                         interface_str['hostid'] = host_id
-                        self._zapi.hostinterface.create(interface_str)
+                        calls.append(('hostinterface.create', interface_str))
                         # remove
                 remove_interface_ids = []
                 for remove_interface in interface_list_copy:
                     interface_id = remove_interface['interfaceid']
                     remove_interface_ids.append(interface_id)
                 if len(remove_interface_ids) > 0:
-                    self._zapi.hostinterface.delete(remove_interface_ids)
+                    calls.append(('hostinterface.delete', remove_interface_ids))
+                self._zapi.batch(calls)
         except Exception, e:
             self._module.fail_json(msg="Failed to update host %s: %s" % (host_name, e))
 
     def delete_host(self, host_id, host_name):
         try:
             if self._module.check_mode:
-                self._module.exit_json(changed=True)
+                return
             self._zapi.host.delete([host_id])
         except Exception, e:
             self._module.fail_json(msg="Failed to delete host %s: %s" % (host_name, e))
 
     # get host by host name
     def get_host_by_host_name(self, host_name):
-        host_list = self._zapi.host.get({'output': 'extend', 'filter': {'host': [host_name]}})
+        host_list = self.fetch_hosts([host_name])
         if len(host_list) < 1:
             self._module.fail_json(msg="Host not found: %s" % host_name)
         else:
@@ -274,19 +390,18 @@ class Host(object):
 
     # get proxyid by proxy name
     def get_proxyid_by_proxy_name(self, proxy_name):
-        proxy_list = self._zapi.proxy.get({'output': 'extend', 'filter': {'host': [proxy_name]}})
-        if len(proxy_list) < 1:
+        proxy_id = self.get_ids_by_names('proxy', [proxy_name])[proxy_name]
+        if not proxy_id:
             self._module.fail_json(msg="Proxy not found: %s" % proxy_name)
         else:
-            return proxy_list[0]['proxyid']
+            return proxy_id
 
     # get group ids by group names
     def get_group_ids_by_group_names(self, group_names):
         group_ids = []
         if self.check_host_group_exist(group_names):
-            group_list = self._zapi.hostgroup.get({'output': 'extend', 'filter': {'name': group_names}})
-            for group in group_list:
-                group_id = group['groupid']
+            found_ids = self.get_ids_by_names('hostgroup', group_names)
+            for group_id in set(found_ids.values()):
                 group_ids.append({'groupid': group_id})
         return group_ids
 
@@ -308,6 +423,12 @@ class Host(object):
                 exist_host_groups.append(host_groups_name['name'])
         return exist_host_groups
 
+    # get host interfaces by host, using the interfaces fetched along with the host
+    def get_host_interfaces_by_host(self, host):
+        if 'interfaces' in host:
+            return copy.deepcopy(host['interfaces'])
+        return self._zapi.hostinterface.get({'output': 'extend', 'hostids': host['hostid']})
+
     # check the exist_interfaces whether it equals the interfaces or not
     def check_interface_properties(self, exist_interface_list, interfaces):
         interfaces_port_list = []
@@ -344,7 +465,10 @@ class Host(object):
     def check_all_properties(self, host_id, host_groups, status, interfaces, template_ids,
                              exist_interfaces, host, proxy_id):
         # get the existing host's groups
-        exist_host_groups = self.get_host_groups_by_host_id(host_id)
+        if 'groups' in host:
+            exist_host_groups = [group['name'] for group in host['groups']]
+        else:
+            exist_host_groups = self.get_host_groups_by_host_id(host_id)
         if set(host_groups) != set(exist_host_groups):
             return True
 
@@ -358,7 +482,10 @@ class Host(object):
             return True
 
         # get the existing templates
-        exist_template_ids = self.get_host_templates_by_host_id(host_id)
+        if 'parentTemplates' in host:
+            exist_template_ids = [template['templateid'] for template in host['parentTemplates']]
+        else:
+            exist_template_ids = self.get_host_templates_by_host_id(host_id)
         if set(list(template_ids)) != set(exist_template_ids):
             return True
 
@@ -369,9 +496,15 @@ class Host(object):
         return False
 
     # link or clear template of the host
-    def link_or_clear_template(self, host_id, template_id_list):
+    def link_or_clear_template(self, host_id, template_id_list, host=None):
+        if self._module.check_mode:
+            return
+
         # get host's exist template ids
-        exist_template_id_list = self.get_host_templates_by_host_id(host_id)
+        if host and 'parentTemplates' in host:
+            exist_template_id_list = [template['templateid'] for template in host['parentTemplates']]
+        else:
+            exist_template_id_list = self.get_host_templates_by_host_id(host_id)
 
         exist_template_ids = set(exist_template_id_list)
         template_ids = set(template_id_list)
@@ -382,8 +515,6 @@ class Host(object):
         templates_clear_list = list(templates_clear)
         request_str = {'hostid': host_id, 'templates': template_id_list, 'templates_clear': templates_clear_list}
         try:
-            if self._module.check_mode:
-                self._module.exit_json(changed=True)
             self._zapi.host.update(request_str)
         except Exception, e:
             self._module.fail_json(msg="Failed to link template to host: %s" % e)
@@ -406,18 +537,115 @@ class Host(object):
         request_str = {'hostid': host_id, 'inventory_mode': inventory_mode}
         try:
             if self._module.check_mode:
-                self._module.exit_json(changed=True)
+                return
             self._zapi.host.update(request_str)
         except Exception, e:
             self._module.fail_json(msg="Failed to set inventory_mode to host: %s" % e)
 
+    # create, update or delete a single host, returns (changed, result)
+    def ensure_host(self, host_name, host_groups, link_templates, inventory_mode, status, state,
+                    interfaces, force, proxy):
+        # convert enabled to 0; disabled to 1
+        status = 1 if status == "disabled" else 0
+
+        template_ids = []
+        if link_templates:
+            template_ids = self.get_template_ids(link_templates)
+
+        group_ids = []
+
+        if host_groups:
+            group_ids = self.get_group_ids_by_group_names(host_groups)
+
+        ip = ""
+        if interfaces:
+            for interface in interfaces:
+                if interface['type'] == 1:
+                    ip = interface['ip']
+
+        # check if host exist
+        is_host_exist = self.is_host_exist(host_name)
+
+        if is_host_exist:
+            # Use proxy specified, or set to None when updating host
+            if proxy:
+                proxy_id = self.get_proxyid_by_proxy_name(proxy)
+            else:
+                proxy_id = None
+
+            # get host id by host name
+            zabbix_host_obj = self.get_host_by_host_name(host_name)
+            host_id = zabbix_host_obj['hostid']
+
+            if state == "absent":
+                # remove host
+                self.delete_host(host_id, host_name)
+                return True, "Successfully delete host %s" % host_name
+
+            if not group_ids:
+                self._module.fail_json(msg="Specify at least one group for updating host '%s'." % host_name)
+
+            if not force:
+                self._module.fail_json(changed=False, result="Host present, Can't update configuration without force")
+
+            # get exist host's interfaces
+            exist_interfaces = self.get_host_interfaces_by_host(zabbix_host_obj)
+            exist_interfaces_copy = copy.deepcopy(exist_interfaces)
+
+            # update host
+            interfaces_len = len(interfaces) if interfaces else 0
+
+            if len(exist_interfaces) > interfaces_len:
+                if self.check_all_properties(host_id, host_groups, status, interfaces, template_ids,
+                                             exist_interfaces, zabbix_host_obj, proxy_id):
+                    self.link_or_clear_template(host_id, template_ids, zabbix_host_obj)
+                    self.update_host(host_name, group_ids, status, host_id,
+                                     interfaces, exist_interfaces, proxy_id)
+                    return True, ("Successfully update host %s (%s) and linked with template '%s'"
+                                  % (host_name, ip, link_templates))
+            else:
+                if self.check_all_properties(host_id, host_groups, status, interfaces, template_ids,
+                                             exist_interfaces_copy, zabbix_host_obj, proxy_id):
+                    self.update_host(host_name, group_ids, status, host_id, interfaces, exist_interfaces, proxy_id)
+                    self.link_or_clear_template(host_id, template_ids, zabbix_host_obj)
+                    self.update_inventory_mode(host_id, inventory_mode)
+                    return True, ("Successfully update host %s (%s) and linked with template '%s'"
+                                  % (host_name, ip, link_templates))
+            return False, None
+
+        if state == "absent":
+            # the host is already deleted.
+            return False, None
+
+        # Use proxy specified, or set to 0 when adding new host
+        if proxy:
+            proxy_id = self.get_proxyid_by_proxy_name(proxy)
+        else:
+            proxy_id = 0
+
+        if not group_ids:
+            self._module.fail_json(msg="Specify at least one group for creating host '%s'." % host_name)
+
+        if not interfaces or (interfaces and len(interfaces) == 0):
+            self._module.fail_json(msg="Specify at least one interface for creating host '%s'." % host_name)
+
+        # create host
+        host_id = self.add_host(host_name, group_ids, status, interfaces, proxy_id)
+        self.link_or_clear_template(host_id, template_ids, {'parentTemplates': []})
+        self.update_inventory_mode(host_id, inventory_mode)
+        return True, "Successfully added host %s (%s) and linked with template '%s'" % (
+            host_name, ip, link_templates)
+
+HOST_OPTIONS = ['host_groups', 'link_templates', 'inventory_mode', 'status', 'state', 'interfaces', 'force', 'proxy']
+
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
             server_url=dict(type='str', required=True, aliases=['url']),
             login_user=dict(rtype='str', equired=True),
             login_password=dict(type='str', required=True, no_log=True),
-            host_name=dict(type='str', required=True),
+            host_name=dict(type='str', required=False),
             http_login_user=dict(type='str', required=False, default=None),
             http_login_password=dict(type='str', required=False, default=None, no_log=True),
             host_groups=dict(type='list', required=False),
@@ -428,8 +656,11 @@ def main():
             timeout=dict(type='int', default=10),
             interfaces=dict(type='list', required=False),
             force=dict(type='bool', default=True),
-            proxy=dict(type='str', required=False)
+            proxy=dict(type='str', required=False),
+            hosts=dict(type='list', required=False)
         ),
+        required_one_of=[['host_name', 'hosts']],
+        mutually_exclusive=[['host_name', 'hosts']],
         supports_check_mode=True
     )
 
@@ -442,18 +673,8 @@ def main():
     http_login_user = module.params['http_login_user']
     http_login_password = module.params['http_login_password']
     host_name = module.params['host_name']
-    host_groups = module.params['host_groups']
-    link_templates = module.params['link_templates']
-    inventory_mode = module.params['inventory_mode']
-    status = module.params['status']
-    state = module.params['state']
     timeout = module.params['timeout']
-    interfaces = module.params['interfaces']
-    force = module.params['force']
-    proxy = module.params['proxy']
-
-    # convert enabled to 0; disabled to 1
-    status = 1 if status == "disabled" else 0
+    hosts = module.params['hosts']
 
     zbx = None
     # login to zabbix
@@ -465,98 +686,34 @@ def main():
 
     host = Host(module, zbx)
 
-    template_ids = []
-    if link_templates:
-        template_ids = host.get_template_ids(link_templates)
-
-    group_ids = []
-
-    if host_groups:
-        group_ids = host.get_group_ids_by_group_names(host_groups)
-
-    ip = ""
-    if interfaces:
-        for interface in interfaces:
-            if interface['type'] == 1:
-                ip = interface['ip']
-
-    # check if host exist
-    is_host_exist = host.is_host_exist(host_name)
-
-    if is_host_exist:
-        # Use proxy specified, or set to None when updating host
-        if proxy:
-            proxy_id = host.get_proxyid_by_proxy_name(proxy)
-        else:
-            proxy_id = None
-
-        # get host id by host name
-        zabbix_host_obj = host.get_host_by_host_name(host_name)
-        host_id = zabbix_host_obj['hostid']
-
-        if state == "absent":
-            # remove host
-            host.delete_host(host_id, host_name)
-            module.exit_json(changed=True, result="Successfully delete host %s" % host_name)
-        else:
-            if not group_ids:
-                module.fail_json(msg="Specify at least one group for updating host '%s'." % host_name)
-
-            if not force:
-                module.fail_json(changed=False, result="Host present, Can't update configuration without force")
-
-            # get exist host's interfaces
-            exist_interfaces = host._zapi.hostinterface.get({'output': 'extend', 'hostids': host_id})
-            exist_interfaces_copy = copy.deepcopy(exist_interfaces)
-
-            # update host
-            interfaces_len = len(interfaces) if interfaces else 0
-
-            if len(exist_interfaces) > interfaces_len:
-                if host.check_all_properties(host_id, host_groups, status, interfaces, template_ids,
-                                             exist_interfaces, zabbix_host_obj, proxy_id):
-                    host.link_or_clear_template(host_id, template_ids)
-                    host.update_host(host_name, group_ids, status, host_id,
-                                     interfaces, exist_interfaces, proxy_id)
-                    module.exit_json(changed=True,
-                                     result="Successfully update host %s (%s) and linked with template '%s'"
-                                     % (host_name, ip, link_templates))
-                else:
-                    module.exit_json(changed=False)
-            else:
-                if host.check_all_properties(host_id, host_groups, status, interfaces, template_ids,
-                                             exist_interfaces_copy, zabbix_host_obj, proxy_id):
-                    host.update_host(host_name, group_ids, status, host_id, interfaces, exist_interfaces, proxy_id)
-                    host.link_or_clear_template(host_id, template_ids)
-                    host.update_inventory_mode(host_id, inventory_mode)
-                    module.exit_json(changed=True,
-                                     result="Successfully update host %s (%s) and linked with template '%s'"
-                                     % (host_name, ip, link_templates))
-                else:
-                    module.exit_json(changed=False)
-    else:
-        if state == "absent":
-            # the host is already deleted.
-            module.exit_json(changed=False)
-
-        # Use proxy specified, or set to 0 when adding new host
-        if proxy:
-            proxy_id = host.get_proxyid_by_proxy_name(proxy)
-        else:
-            proxy_id = 0
-
-        if not group_ids:
-            module.fail_json(msg="Specify at least one group for creating host '%s'." % host_name)
-
-        if not interfaces or (interfaces and len(interfaces) == 0):
-            module.fail_json(msg="Specify at least one interface for creating host '%s'." % host_name)
-
-        # create host
-        host_id = host.add_host(host_name, group_ids, status, interfaces, proxy_id)
-        host.link_or_clear_template(host_id, template_ids)
-        host.update_inventory_mode(host_id, inventory_mode)
-        module.exit_json(changed=True, result="Successfully added host %s (%s) and linked with template '%s'" % (
-            host_name, ip, link_templates))
+    if not hosts:
+        params = dict((key, module.params[key]) for key in HOST_OPTIONS)
+        changed, result = host.ensure_host(host_name, **params)
+        if result:
+            module.exit_json(changed=changed, result=result)
+        module.exit_json(changed=changed)
+
+    # the options of each item default to the module options
+    host_params = []
+    for item in hosts:
+        if not isinstance(item, dict) or not item.get('host_name'):
+            module.fail_json(msg="Each item of hosts must be a dictionary with a host_name")
+        params = dict((key, item.get(key, module.params[key])) for key in HOST_OPTIONS)
+        if params['state'] not in ('present', 'absent'):
+            module.fail_json(msg="Invalid state '%s' for host '%s'" % (params['state'], item['host_name']))
+        if params['status'] not in ('enabled', 'disabled'):
+            module.fail_json(msg="Invalid status '%s' for host '%s'" % (params['status'], item['host_name']))
+        params['force'] = module.boolean(params['force'])
+        params['host_name'] = item['host_name']
+        host_params.append(params)
+
+    host.prefetch(host_params)
+
+    results = []
+    for params in host_params:
+        changed, result = host.ensure_host(**params)
+        results.append({'host_name': params['host_name'], 'changed': changed, 'result': result})
+    module.exit_json(changed=any(result['changed'] for result in results), hosts=results)
 
 from ansible.module_utils.basic import *
 main()
@@ -188,14 +188,13 @@ class Screen(object):
             return host_ids
 
     # get screen
-    def get_screen_id(self, screen_name):
+    def get_screen(self, screen_name):
         if screen_name == "":
             self._module.fail_json(msg="screen_name is required")
         try:
-            screen_id_list = self._zapi.screen.get({'output': 'extend', 'search': {"name": screen_name}})
-            if len(screen_id_list) >= 1:
-                screen_id = screen_id_list[0]['screenid']
-                return screen_id
+            screen_list = self._zapi.screen.get({'output': 'extend', 'search': {"name": screen_name}})
+            if len(screen_list) >= 1:
+                return screen_list[0]
             return None
         except Exception as e:
             self._module.fail_json(msg="Failed to get screen %s from Zabbix: %s" % (screen_name, e))
@@ -228,31 +227,34 @@ class Screen(object):
         except Exception as e:
             self._module.fail_json(msg="Failed to delete screen %s: %s" % (screen_name, e))
 
-    # get graph ids
-    def get_graph_ids(self, hosts, graph_name_list):
-        graph_id_lists = []
+    # get the largest number of graphs of a single host
+    def get_graph_vsize(self, hosts, graphs_by_host):
         vsize = 1
         for host in hosts:
-            graph_id_list = self.get_graphs_by_host_id(graph_name_list, host)
-            size = len(graph_id_list)
-            if size > 0:
-                graph_id_lists.extend(graph_id_list)
-                if vsize < size:
-                    vsize = size
-        return graph_id_lists, vsize
-
-    #  getGraphs
-    def get_graphs_by_host_id(self, graph_name_list, host_id):
-        graph_ids = []
-        for graph_name in graph_name_list:
-            graphs_list = self._zapi.graph.get({'output': 'extend', 'search': {'name': graph_name}, 'hostids': host_id})
-            graph_id_list = []
-            if len(graphs_list) > 0:
-                for graph in graphs_list:
-                    graph_id = graph['graphid']
-                    graph_id_list.append(graph_id)
-            if len(graph_id_list) > 0:
-                graph_ids.extend(graph_id_list)
+            size = len(graphs_by_host[host])
+            if vsize < size:
+                vsize = size
+        return vsize
+
+    # get the graph ids of every host with a single graph.get call
+    def get_graphs_by_host_ids(self, graph_name_list, host_ids):
+        graphs_list = self._zapi.graph.get({'output': ['graphid', 'name'], 'hostids': host_ids,
+                                            'search': {'name': graph_name_list}, 'searchByAny': True,
+                                            'selectHosts': ['hostid']})
+        host_graphs = dict((host_id, []) for host_id in host_ids)
+        for graph in graphs_list:
+            for graph_host in graph['hosts']:
+                if graph_host['hostid'] in host_graphs:
+                    host_graphs[graph_host['hostid']].append(graph)
+
+        # keep the graphs of each host in the order of graph_name_list
+        graph_ids = {}
+        for host_id in host_ids:
+            graph_ids[host_id] = []
+            for graph_name in graph_name_list:
+                for graph in host_graphs[host_id]:
+                    if graph_name.lower() in graph['name'].lower():
+                        graph_ids[host_id].append(graph['graphid'])
         return graph_ids
 
     # get screen items
@@ -265,13 +267,10 @@ class Screen(object):
         try:
             if len(screen_item_id_list) == 0:
                 return True
-            screen_item_list = self.get_screen_items(screen_id)
-            if len(screen_item_list) > 0:
-                if self._module.check_mode:
-                    self._module.exit_json(changed=True)
-                self._zapi.screenitem.delete(screen_item_id_list)
-                return True
-            return False
+            if self._module.check_mode:
+                self._module.exit_json(changed=True)
+            self._zapi.screenitem.delete(screen_item_id_list)
+            return True
         except ZabbixAPIException:
             pass
 
@@ -288,8 +287,8 @@ class Screen(object):
             v_size = (v_size - 1) / h_size + 1
         return h_size, v_size
 
-    # create screen_items
-    def create_screen_items(self, screen_id, hosts, graph_name_list, width, height, h_size):
+    # compute the graph cells of the screen
+    def get_screen_items_layout(self, hosts, graphs_by_host, width, height, h_size):
         if len(hosts) < 4:
             if width is None or width < 0:
                 width = 500
@@ -299,27 +298,56 @@ class Screen(object):
         if height is None or height < 0:
             height = 100
 
-        try:
-            # when there're only one host, only one row is not good.
-            if len(hosts) == 1:
-                graph_id_list = self.get_graphs_by_host_id(graph_name_list, hosts[0])
-                for i, graph_id in enumerate(graph_id_list):
-                    if graph_id is not None:
-                        self._zapi.screenitem.create({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
-                                                      'width': width, 'height': height,
-                                                      'x': i % h_size, 'y': i / h_size, 'colspan': 1, 'rowspan': 1,
-                                                      'elements': 0, 'valign': 0, 'halign': 0,
-                                                      'style': 0, 'dynamic': 0, 'sort_triggers': 0})
+        cells = []
+        # when there're only one host, only one row is not good.
+        if len(hosts) == 1:
+            for i, graph_id in enumerate(graphs_by_host[hosts[0]]):
+                cells.append((i % h_size, i / h_size, graph_id))
+        else:
+            for i, host in enumerate(hosts):
+                for j, graph_id in enumerate(graphs_by_host[host]):
+                    cells.append((i, j, graph_id))
+
+        screen_items = []
+        for x, y, graph_id in cells:
+            screen_items.append({'resourcetype': 0, 'resourceid': graph_id,
+                                 'width': width, 'height': height,
+                                 'x': x, 'y': y, 'colspan': 1, 'rowspan': 1,
+                                 'elements': 0, 'valign': 0, 'halign': 0,
+                                 'style': 0, 'dynamic': 0, 'sort_triggers': 0})
+        return screen_items
+
+    # compare the existing screen items with the wanted ones cell by cell,
+    # returns the ids of the items to delete and the items to create
+    def diff_screen_items(self, screen_item_list, screen_items):
+        keys = ('resourcetype', 'resourceid', 'width', 'height', 'colspan', 'rowspan')
+        wanted = {}
+        for screen_item in screen_items:
+            wanted[(str(screen_item['x']), str(screen_item['y']))] = screen_item
+
+        delete_ids = []
+        kept = set()
+        for screen_item in screen_item_list:
+            cell = (str(screen_item['x']), str(screen_item['y']))
+            item = wanted.get(cell)
+            if cell not in kept and item and all(str(screen_item[key]) == str(item[key]) for key in keys):
+                kept.add(cell)
             else:
-                for i, host in enumerate(hosts):
-                    graph_id_list = self.get_graphs_by_host_id(graph_name_list, host)
-                    for j, graph_id in enumerate(graph_id_list):
-                        if graph_id is not None:
-                            self._zapi.screenitem.create({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
-                                                          'width': width, 'height': height,
-                                                          'x': i, 'y': j, 'colspan': 1, 'rowspan': 1,
-                                                          'elements': 0, 'valign': 0, 'halign': 0,
-                                                          'style': 0, 'dynamic': 0, 'sort_triggers': 0})
+                delete_ids.append(screen_item['screenitemid'])
+
+        create_items = [item for cell, item in sorted(wanted.items()) if cell not in kept]
+        return delete_ids, create_items
+
+    # create screen_items with a single call
+    def create_screen_items(self, screen_id, screen_items):
+        if len(screen_items) == 0:
+            return
+        try:
+            if self._module.check_mode:
+                self._module.exit_json(changed=True)
+            for screen_item in screen_items:
+                screen_item['screenid'] = screen_id
+            self._zapi.screenitem.create(screen_items)
         except Already_Exists:
             pass
 
@@ -364,7 +392,8 @@ def main():
 
     for zabbix_screen in screens:
         screen_name = zabbix_screen['screen_name']
-        screen_id = screen.get_screen_id(screen_name)
+        screen_obj = screen.get_screen(screen_name)
+        screen_id = screen_obj['screenid'] if screen_obj else None
         state = "absent" if "state" in zabbix_screen and zabbix_screen['state'] == "absent" else "present"
 
         if state == "absent":
@@ -390,32 +419,27 @@ def main():
             host_group_id = screen.get_host_group_id(host_group)
             hosts = screen.get_host_ids_by_group_id(host_group_id)
 
-            screen_item_id_list = []
-            resource_id_list = []
-
-            graph_ids, v_size = screen.get_graph_ids(hosts, graph_names)
+            graphs_by_host = screen.get_graphs_by_host_ids(graph_names, hosts)
+            v_size = screen.get_graph_vsize(hosts, graphs_by_host)
             h_size, v_size = screen.get_hsize_vsize(hosts, v_size)
+            screen_items = screen.get_screen_items_layout(hosts, graphs_by_host, graph_width, graph_height, h_size)
 
             if not screen_id:
                 # create screen
                 screen_id = screen.create_screen(screen_name, h_size, v_size)
-                screen.create_screen_items(screen_id, hosts, graph_names, graph_width, graph_height, h_size)
+                screen.create_screen_items(screen_id, screen_items)
                 created_screens.append(screen_name)
             else:
                 screen_item_list = screen.get_screen_items(screen_id)
+                delete_ids, create_items = screen.diff_screen_items(screen_item_list, screen_items)
+                resized = (int(screen_obj['hsize']), int(screen_obj['vsize'])) != (h_size, v_size)
 
-                for screen_item in screen_item_list:
-                    screen_item_id = screen_item['screenitemid']
-                    resource_id = screen_item['resourceid']
-                    screen_item_id_list.append(screen_item_id)
-                    resource_id_list.append(resource_id)
-
-                # when the screen items changed, then update
-                if graph_ids != resource_id_list:
-                    deleted = screen.delete_screen_items(screen_id, screen_item_id_list)
+                # only touch the cells that changed
+                if delete_ids or create_items or resized:
+                    deleted = screen.delete_screen_items(screen_id, delete_ids)
                     if deleted:
                         screen.update_screen(screen_id, screen_name, h_size, v_size)
-                        screen.create_screen_items(screen_id, hosts, graph_names, graph_width, graph_height, h_size)
+                        screen.create_screen_items(screen_id, create_items)
                         changed_screens.append(screen_name)
 
     if created_screens and changed_screens:
@@ -111,6 +111,22 @@ options:
       - The name of the Zone to work with (e.g. "example.com"). The Zone must already exist.
     required: true
     aliases: ["domain"]
+  records:
+    description:
+      - A list of records to manage in C(zone) with a single task. Each item is a dictionary accepting the
+        C(record), C(type), C(value), C(ttl), C(priority), C(port), C(proto), C(service), C(weight), C(solo)
+        and C(state) options, which default to the module options when missing.
+      - The records of the zone are fetched once and every item is reconciled against them, so only the
+        required creations, updates and deletions are sent.
+    required: false
+    default: null
+    version_added: "2.2"
+  concurrency:
+    description:
+      - Maximum number of concurrent API requests, used to fetch result pages and to apply the changes of C(records).
+    required: false
+    default: 4
+    version_added: "2.2"
 '''
 
 EXAMPLES = '''
@@ -174,6 +190,23 @@ EXAMPLES = '''
     weight: 20
     type: SRV
     value: fooserver.my.com
+
+# manage several records of my.com in one task
+- cloudflare_dns:
+    zone: my.com
+    account_email: test@example.com
+    account_api_token: dummyapitoken
+    records:
+      - record: www
+        type: A
+        value: 192.0.2.10
+      - record: mail
+        type: MX
+        value: mx.my.com
+        priority: 10
+      - record: old
+        type: CNAME
+        state: absent
 '''
 
 RETURN = '''
@@ -265,6 +298,35 @@ record:
             returned: success
             type: string
             sample: sample.com
+records:
+    description: the outcome for each item of C(records)
+    returned: success, when records is given
+    type: list
+    contains:
+        record:
+            description: the record name as FQDN
+            returned: success
+            type: string
+            sample: www.sample.com
+        type:
+            description: the record type
+            returned: success
+            type: string
+            sample: A
+        state:
+            description: the requested state of the record
+            returned: success
+            type: string
+            sample: present
+        changed:
+            description: whether the record was created, updated or deleted
+            returned: success
+            type: boolean
+            sample: True
+        record_data:
+            description: dictionary containing the record data, see C(record)
+            returned: success, except on record deletion and in check mode for new records
+            type: dictionary
 '''
 
 class CloudflareAPI(object):
@@ -272,40 +334,53 @@ class CloudflareAPI(object):
     cf_api_endpoint = 'https://api.cloudflare.com/client/v4'
     changed = False
 
+    # largest page sizes accepted by the API
+    zones_per_page = 50
+    records_per_page = 100
+
     def __init__(self, module):
         self.module            = module
         self.account_api_token = module.params['account_api_token']
         self.account_email     = module.params['account_email']
+        self.concurrency       = module.params['concurrency']
         self.port              = module.params['port']
         self.priority          = module.params['priority']
-        self.proto             = module.params['proto']
-        self.record            = module.params['record']
-        self.service           = module.params['service']
         self.is_solo           = module.params['solo']
         self.state             = module.params['state']
         self.timeout           = module.params['timeout']
         self.ttl               = module.params['ttl']
         self.type              = module.params['type']
-        self.value             = module.params['value']
         self.weight            = module.params['weight']
         self.zone              = module.params['zone']
-
-        if self.record == '@':
-            self.record = self.zone
-
-        if (self.type in ['CNAME','NS','MX','SRV']) and (self.value is not None):
-            self.value = self.value.rstrip('.')
-
-        if (self.type == 'SRV'):
-            if (self.proto is not None) and (not self.proto.startswith('_')):
-                self.proto = '_' + self.proto
-            if (self.service is not None) and (not self.service.startswith('_')):
-                self.service = '_' + self.service
-
-        if not self.record.endswith(self.zone):
-            self.record = self.record + '.' + self.zone
-
-    def _cf_simple_api_call(self,api_call,method='GET',payload=None):
+        self._zone_ids         = {}
+
+        params = self._normalize_record_params(module.params)
+        self.proto             = params['proto']
+        self.record            = params['record']
+        self.service           = params['service']
+        self.value             = params['value']
+
+    def _normalize_record_params(self,params):
+        params = dict(params)
+        if params['record'] == '@':
+            params['record'] = self.zone
+
+        if (params['type'] in ['CNAME','NS','MX','SRV']) and (params['value'] is not None):
+            params['value'] = params['value'].rstrip('.')
+
+        if (params['type'] == 'SRV'):
+            if (params['proto'] is not None) and (not params['proto'].startswith('_')):
+                params['proto'] = '_' + params['proto']
+            if (params['service'] is not None) and (not params['service'].startswith('_')):
+                params['service'] = '_' + params['service']
+
+        if not params['record'].endswith(self.zone):
+            params['record'] = params['record'] + '.' + self.zone
+        return params
+
+    def _cf_request(self,api_call,method='GET',payload=None):
+        # never calls fail_json so it can be used from worker threads,
+        # returns the parsed response, the HTTP status and an error message
         headers = { 'X-Auth-Email': self.account_email,
                     'X-Auth-Key': self.account_api_token,
                     'Content-Type': 'application/json' }
@@ -314,7 +389,7 @@ class CloudflareAPI(object):
             try:
                 data = json.dumps(payload)
             except Exception, e:
-                self.module.fail_json(msg="Failed to encode payload as JSON: {0}".format(e))
+                return None, None, "Failed to encode payload as JSON: {0}".format(e)
 
         resp, info = fetch_url(self.module,
                                self.cf_api_endpoint + api_call,
@@ -324,7 +399,7 @@ class CloudflareAPI(object):
                                timeout=self.timeout)
 
         if info['status'] not in [200,304,400,401,403,429,405,415]:
-            self.module.fail_json(msg="Failed API call {0}; got unexpected HTTP code {1}".format(api_call,info['status']))
+            return None, info['status'], "Failed API call {0}; got unexpected HTTP code {1}".format(api_call,info['status'])
 
         error_msg = ''
         if info['status'] == 401:
@@ -357,7 +432,7 @@ class CloudflareAPI(object):
 
         # received an error status but no data with details on what failed
         if  (info['status'] not in [200,304]) and (result is None):
-            self.module.fail_json(msg=error_msg)
+            return None, info['status'], error_msg
 
         if not result['success']:
             error_msg += "; Error details: "
@@ -366,9 +441,41 @@ class CloudflareAPI(object):
                 if 'error_chain' in error:
                     for chain_error in error['error_chain']:
                         error_msg += "code: {0}, error: {1}; ".format(chain_error['code'],chain_error['message'])
-            self.module.fail_json(msg=error_msg)
+            return result, info['status'], error_msg
+
+        return result, info['status'], None
 
-        return result, info['status']
+    def _cf_simple_api_call(self,api_call,method='GET',payload=None):
+        result, status, error_msg = self._cf_request(api_call,method,payload)
+        if error_msg is not None:
+            self.module.fail_json(msg=error_msg)
+        return result, status
+
+    def _cf_concurrent_api_calls(self,calls):
+        # run independent (api_call, method, payload) calls from a pool of
+        # worker threads, the results are returned in the order of the calls
+        if not calls:
+            return []
+        responses = None
+        if len(calls) > 1 and self.concurrency > 1:
+            try:
+                # multiprocessing is only available from python 2.6 on
+                from multiprocessing.pool import ThreadPool
+            except ImportError:
+                pass
+            else:
+                pool = ThreadPool(min(self.concurrency,len(calls)))
+                try:
+                    responses = pool.map(lambda call: self._cf_request(*call), calls)
+                finally:
+                    pool.close()
+                    pool.join()
+        if responses is None:
+            responses = [self._cf_request(*call) for call in calls]
+        for result, status, error_msg in responses:
+            if error_msg is not None:
+                self.module.fail_json(msg=error_msg)
+        return [result for result, status, error_msg in responses]
 
     def _cf_api_call(self,api_call,method='GET',payload=None):
         result, status = self._cf_simple_api_call(api_call,method,payload)
@@ -379,18 +486,19 @@ class CloudflareAPI(object):
             pagination = result['result_info']
             if pagination['total_pages'] > 1:
                 next_page = int(pagination['page']) + 1
-                parameters = ['page={0}'.format(next_page)]
                 # strip "page" parameter from call parameters (if there are any)
                 if '?' in api_call:
                     raw_api_call,query = api_call.split('?',1)
-                    parameters += [param for param in query.split('&') if not param.startswith('page')]
+                    parameters = [param for param in query.split('&') if not param.startswith('page=')]
                 else:
                     raw_api_call = api_call
-                while next_page <= pagination['total_pages']:
-                    raw_api_call += '?' + '&'.join(parameters)
-                    result, status = self._cf_simple_api_call(raw_api_call,method,payload)
-                    data += result['result']
-                    next_page += 1
+                    parameters = []
+                # the number of pages is known now, fetch the remaining ones concurrently
+                calls = []
+                for page in range(next_page, pagination['total_pages'] + 1):
+                    calls.append((raw_api_call + '?' + '&'.join(parameters + ['page={0}'.format(page)]),method,payload))
+                for page_result in self._cf_concurrent_api_calls(calls):
+                    data += page_result['result']
 
         return data, status
 
@@ -398,6 +506,9 @@ class CloudflareAPI(object):
         if not zone:
             zone = self.zone
 
+        if zone in self._zone_ids:
+            return self._zone_ids[zone]
+
         zones = self.get_zones(zone)
         if len(zones) > 1:
             self.module.fail_json(msg="More than one zone matches {0}".format(zone))
@@ -405,14 +516,16 @@ class CloudflareAPI(object):
         if len(zones) < 1:
             self.module.fail_json(msg="No zone found with name {0}".format(zone))
 
-        return zones[0]['id']
+        self._zone_ids[zone] = zones[0]['id']
+        return self._zone_ids[zone]
 
     def get_zones(self,name=None):
         if not name:
             name = self.zone
-        param = ''
+        query = {'per_page': self.zones_per_page}
         if name:
-            param = '?' + urllib.urlencode({'name' : name})
+            query['name'] = name
+        param = '?' + urllib.urlencode(query)
         zones,status = self._cf_api_call('/zones' + param)
         return zones
 
@@ -428,21 +541,28 @@ class CloudflareAPI(object):
         if (not value) and (value is not None):
             value = self.value
 
-        zone_id = self._get_zone_id()
+        zone_id = self._get_zone_id(zone_name)
         api_call = '/zones/{0}/dns_records'.format(zone_id)
-        query = {}
+        query = {'per_page': self.records_per_page}
         if type:
             query['type'] = type
         if record:
             query['name'] = record
         if value:
             query['content'] = value
-        if query:
-            api_call += '?' + urllib.urlencode(query)
+        api_call += '?' + urllib.urlencode(query)
 
         records,status = self._cf_api_call(api_call)
         return records
 
+    def _get_delete_search(self,params):
+        content = params['value']
+        search_record = params['record']
+        if params['type'] == 'SRV':
+            content = str(params['weight']) + '\t' + str(params['port']) + '\t' + params['value']
+            search_record = params['service'] + '.' + params['proto'] + '.' + params['record']
+        return search_record, content
+
     def delete_dns_records(self,**kwargs):
         params = {}
         for param in ['port','proto','service','solo','type','record','value','weight','zone']:
@@ -452,11 +572,7 @@ class CloudflareAPI(object):
                 params[param] = getattr(self,param)
 
         records = []
-        content = params['value']
-        search_record = params['record']
-        if params['type'] == 'SRV':
-            content = str(params['weight']) + '\t' + str(params['port']) + '\t' + params['value']
-            search_record = params['service'] + '.' + params['proto'] + '.' + params['record']
+        search_record, content = self._get_delete_search(params)
         if params['solo']:
             search_value = None
         else:
@@ -476,14 +592,8 @@ class CloudflareAPI(object):
                     result, info = self._cf_api_call('/zones/{0}/dns_records/{1}'.format(rr['zone_id'],rr['id']),'DELETE')
         return self.changed
 
-    def ensure_dns_record(self,**kwargs):
-        params = {}
-        for param in ['port','priority','proto','service','ttl','type','record','value','weight','zone']:
-          if param in kwargs:
-              params[param] = kwargs[param]
-          else:
-              params[param] = getattr(self,param)
-
+    def _build_dns_record(self,params):
+        # returns the record payload and the name and content to search for
         search_value = params['value']
         search_record = params['record']
         new_record = None
@@ -537,6 +647,30 @@ class CloudflareAPI(object):
             search_value = str(params['weight']) + '\t' + str(params['port']) + '\t' + params['value']
             search_record = params['service'] + '.' + params['proto'] + '.' + params['record']
 
+        return new_record, search_record, search_value
+
+    def _dns_record_needs_update(self,params,cur_record,new_record):
+        if (params['ttl'] is not None) and (cur_record['ttl'] != params['ttl'] ):
+            return True
+        if (params['priority'] is not None) and ('priority' in cur_record) and (cur_record['priority'] != params['priority']):
+            return True
+        if ('data' in new_record) and ('data' in cur_record):
+            if (cur_record['data'] > new_record['data']) - (cur_record['data'] < new_record['data']):
+                return True
+        if (params['type'] == 'CNAME') and (cur_record['content'] != new_record['content']):
+            return True
+        return False
+
+    def ensure_dns_record(self,**kwargs):
+        params = {}
+        for param in ['port','priority','proto','service','ttl','type','record','value','weight','zone']:
+          if param in kwargs:
+              params[param] = kwargs[param]
+          else:
+              params[param] = getattr(self,param)
+
+        new_record, search_record, search_value = self._build_dns_record(params)
+
         zone_id = self._get_zone_id(params['zone'])
         records = self.get_dns_records(params['zone'],params['type'],search_record,search_value)
         # in theory this should be impossible as cloudflare does not allow
@@ -544,19 +678,10 @@ class CloudflareAPI(object):
         if len(records) > 1:
             self.module.fail_json(msg="More than one record already exists for the given attributes. That should be impossible, please open an issue!")
         # record already exists, check if it must be updated
+        result = None
         if len(records) == 1:
             cur_record = records[0]
-            do_update = False
-            if (params['ttl'] is not None) and (cur_record['ttl'] != params['ttl'] ):
-                do_update = True
-            if (params['priority'] is not None) and ('priority' in cur_record) and (cur_record['priority'] != params['priority']):
-                do_update = True
-            if ('data' in new_record) and ('data' in cur_record):
-                if (cur_record['data'] > new_record['data']) - (cur_record['data'] < new_record['data']):
-                    do_update = True
-            if (type == 'CNAME') and (cur_record['content'] != new_record['content']):
-                do_update = True
-            if do_update:
+            if self._dns_record_needs_update(params,cur_record,new_record):
                 if not self.module.check_mode:
                     result, info = self._cf_api_call('/zones/{0}/dns_records/{1}'.format(zone_id,records[0]['id']),'PUT',new_record)
                 self.changed = True
@@ -568,11 +693,86 @@ class CloudflareAPI(object):
         self.changed = True
         return result,self.changed
 
+    def sync_dns_records(self,records):
+        # fetch the records of the zone once and reconcile all the
+        # requested records against an index of them
+        zone_id = self._get_zone_id()
+        zone_records, status = self._cf_api_call('/zones/{0}/dns_records?{1}'.format(
+            zone_id, urllib.urlencode({'per_page': self.records_per_page})))
+        index = {}
+        for rr in zone_records:
+            index.setdefault(rr['name'], []).append(rr)
+
+        def matching(type, name, content):
+            return [rr for rr in index.get(name, [])
+                    if ((not type) or (rr['type'] == type)) and ((not content) or (rr['content'] == content))]
+
+        results = []
+        deletes = []
+        writes = []
+        for item in records:
+            item = dict(item)
+            for alias, param in [('name','record'),('content','value'),('domain','zone')]:
+                if alias in item:
+                    item.setdefault(param, item.pop(alias))
+            params = {}
+            for param in ['port','priority','proto','service','solo','state','ttl','type','record','value','weight']:
+                params[param] = item.get(param, self.module.params[param])
+            params['zone'] = self.zone
+            params = self._normalize_record_params(params)
+            if params['solo'] and params['state'] == 'absent':
+                self.module.fail_json(msg="solo=true can only be used with state=present")
+
+            result = {'record': params['record'], 'type': params['type'], 'state': params['state'], 'changed': False}
+            results.append(result)
+
+            if params['state'] == 'absent':
+                search_record, content = self._get_delete_search(params)
+                for rr in matching(params['type'], search_record, content):
+                    deletes.append((rr, result))
+                    index[rr['name']].remove(rr)
+                continue
+
+            if params['solo']:
+                search_record, content = self._get_delete_search(params)
+                for rr in matching(params['type'], search_record, None):
+                    if not ((rr['type'] == params['type']) and (rr['name'] == search_record) and (rr['content'] == content)):
+                        deletes.append((rr, result))
+                        index[rr['name']].remove(rr)
+
+            new_record, search_record, search_value = self._build_dns_record(params)
+            existing = matching(params['type'], search_record, search_value)
+            if len(existing) > 1:
+                self.module.fail_json(msg="More than one record already exists for the given attributes. That should be impossible, please open an issue!")
+            if len(existing) == 1:
+                result['record_data'] = existing[0]
+                if self._dns_record_needs_update(params,existing[0],new_record):
+                    writes.append((('/zones/{0}/dns_records/{1}'.format(zone_id,existing[0]['id']),'PUT',new_record), result))
+            else:
+                writes.append((('/zones/{0}/dns_records'.format(zone_id),'POST',new_record), result))
+
+        for rr, result in deletes:
+            result['changed'] = True
+        for call, result in writes:
+            result['changed'] = True
+
+        # deletions go first so that replaced records (e.g. CNAMEs) do not conflict
+        if not self.module.check_mode:
+            self._cf_concurrent_api_calls([('/zones/{0}/dns_records/{1}'.format(rr['zone_id'],rr['id']),'DELETE',None)
+                                           for rr, result in deletes])
+            responses = self._cf_concurrent_api_calls([call for call, result in writes])
+            for (call, result), response in zip(writes, responses):
+                result['record_data'] = response['result']
+
+        self.changed = bool(deletes or writes)
+        return results, self.changed
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
             account_api_token = dict(required=True, no_log=True, type='str'),
             account_email     = dict(required=True, type='str'),
+            concurrency       = dict(required=False, default=4, type='int'),
             port              = dict(required=False, default=None, type='int'),
             priority          = dict(required=False, default=1, type='int'),
             proto             = dict(required=False, default=None, choices=[ 'tcp', 'udp' ], type='str'),
@@ -586,10 +786,10 @@ def main():
             value             = dict(required=False, default=None, aliases=['content'], type='str'),
             weight            = dict(required=False, default=1, type='int'),
             zone              = dict(required=True, default=None, aliases=['domain'], type='str'),
+            records           = dict(required=False, default=None, type='list'),
         ),
         supports_check_mode = True,
         required_if = ([
-                ('state','present',['record','type']),
                 ('type','MX',['priority','value']),
                 ('type','SRV',['port','priority','proto','service','value','weight']),
                 ('type','A',['value']),
@@ -608,7 +808,13 @@ def main():
     changed = False
     cf_api = CloudflareAPI(module)
 
+    if module.params['records']:
+        results,changed = cf_api.sync_dns_records(module.params['records'])
+        module.exit_json(changed=changed,records=results)
+
     # sanity checks
+    if cf_api.state == 'present' and not cf_api.type:
+        module.fail_json(msg="state is present but the following are missing: type")
     if cf_api.is_solo and cf_api.state == 'absent':
         module.fail_json(msg="solo=true can only be used with state=present")
 
@@ -92,6 +92,35 @@ options:
     required: false
     default: null
 
+  records:
+    description:
+      - List of records to reconcile with C(domain) in a single task. Each item is a dictionary with the keys
+        C(record), C(type), C(value), C(ttl) (defaults to I(ttl)), C(priority) and C(state) (C(present) or
+        C(absent), defaults to C(present)).
+      - The records of the domain are downloaded once, indexed by name, type and value, and only the required
+        creations, updates and deletions are sent, with up to C(concurrency) requests in flight. Requests refused
+        because of the API rate limit are retried with an exponential backoff.
+      - All deletions complete before any creation or update is sent.
+    required: false
+    default: null
+    version_added: "2.2"
+
+  exclusive:
+    description:
+      - With C(records), delete every record of the domain that is not listed in C(records).
+      - The SOA record and the NS records of the zone apex, which DNSimple manages, are never deleted.
+    required: false
+    default: 'no'
+    choices: ['yes', 'no']
+    version_added: "2.2"
+
+  concurrency:
+    description:
+      - Maximum number of concurrent API requests used to apply the changes of C(records).
+    required: false
+    default: 4
+    version_added: "2.2"
+
 requirements: [ dnsimple ]
 author: "Alex Coomans (@drcapulet)"
 '''
@@ -127,9 +156,21 @@ EXAMPLES = '''
 # and delete the record
 - local_action: dnsimpledomain=my.com record= type=CNAME value=example.com state=absent
 
+# make the records of my.com match a list
+- local_action:
+    module: dnsimple
+    domain: my.com
+    exclusive: yes
+    records:
+      - { record: "www", type: "A", value: "127.0.0.1" }
+      - { record: "", type: "MX", value: "mail.my.com", priority: 10 }
+      - { record: "old", type: "CNAME", state: "absent" }
+
 '''
 
 import os
+import random
+import time
 try:
     from dnsimple import DNSimple
     from dnsimple.dnsimple import DNSimpleException
@@ -137,6 +178,135 @@ try:
 except ImportError:
     HAS_DNSIMPLE = False
 
+RECORD_TYPES = ['A', 'ALIAS', 'CNAME', 'MX', 'SPF', 'URL', 'TXT', 'NS', 'SRV', 'NAPTR', 'PTR', 'AAAA', 'SSHFP', 'HINFO', 'POOL']
+
+
+def call_with_backoff(call, retries=5):
+    # retry the calls refused because of the rate limit, returns the result and an error message
+    func, args = call
+    delay = 2
+    for attempt in range(retries + 1):
+        try:
+            return func(*args), None
+        except DNSimpleException, e:
+            message = str(e.message)
+            if attempt == retries or ('429' not in message and 'rate limit' not in message.lower()):
+                return None, message
+        time.sleep(delay + random.uniform(0, delay))
+        delay = min(delay * 2, 60)
+
+
+def run_calls(module, calls, concurrency):
+    if not calls:
+        return
+    responses = None
+    if len(calls) > 1 and concurrency > 1:
+        try:
+            # multiprocessing is only available from python 2.6 on
+            from multiprocessing.pool import ThreadPool
+        except ImportError:
+            pass
+        else:
+            pool = ThreadPool(min(concurrency, len(calls)))
+            try:
+                responses = pool.map(call_with_backoff, calls)
+            finally:
+                pool.close()
+                pool.join()
+    if responses is None:
+        responses = [call_with_backoff(call) for call in calls]
+    errors = [error for response, error in responses if error]
+    if errors:
+        module.fail_json(msg="%d of %d requests failed: %s" % (len(errors), len(calls), "; ".join(errors)))
+
+
+def is_system_record(rr):
+    if rr.get('system_record') or rr['record_type'] == 'SOA':
+        return True
+    return rr['record_type'] == 'NS' and not rr['name']
+
+
+def sync_records(module, client, domain, records, ttl, exclusive, concurrency):
+    # download the records once and index them by (name, type, value)
+    current = [r['record'] for r in client.records(domain)]
+    index = {}
+    for r in current:
+        index.setdefault((r['name'], r['record_type'], r['content']), r)
+
+    deletes = []
+    writes = []
+    results = []
+    kept_ids = set()
+    deleted_ids = set()
+    for item in records:
+        record = item.get('record', item.get('name'))
+        record_type = item.get('type')
+        value = item.get('value')
+        state = item.get('state', 'present')
+        record_ttl = item.get('ttl', ttl)
+        priority = item.get('priority')
+        if record is None or record_type not in RECORD_TYPES:
+            module.fail_json(msg="Each item of records needs a record and a supported type")
+        if state not in ('present', 'absent'):
+            module.fail_json(msg="'%s' is an unknown value for the state of record '%s'" % (state, record))
+        if state == 'present' and not value:
+            module.fail_json(msg="Missing the record value for record '%s'" % record)
+
+        result = {'record': record, 'type': record_type, 'value': value, 'state': state, 'changed': False}
+        results.append(result)
+
+        if state == 'absent':
+            if value is None:
+                matches = [r for r in current if r['name'] == record and r['record_type'] == record_type]
+            else:
+                matches = [r for r in [index.get((record, record_type, value))] if r]
+            for rr in matches:
+                if rr['id'] not in deleted_ids:
+                    deleted_ids.add(rr['id'])
+                    deletes.append((client.delete_record, (domain, rr['id'])))
+                    result['changed'] = True
+            continue
+
+        rr = index.get((record, record_type, value))
+        if rr:
+            kept_ids.add(rr['id'])
+            if rr['ttl'] != record_ttl or rr['prio'] != priority:
+                data = {}
+                if record_ttl: data['ttl']  = record_ttl
+                if priority:   data['prio'] = priority
+                writes.append((client.update_record, (domain, str(rr['id']), data)))
+                result['changed'] = True
+        else:
+            data = {
+                'name':        record,
+                'record_type': record_type,
+                'content':     value,
+            }
+            if record_ttl: data['ttl']  = record_ttl
+            if priority:   data['prio'] = priority
+            writes.append((client.add_record, (domain, data)))
+            result['changed'] = True
+
+    # remove every other record of the domain, except the system records
+    deleted = []
+    if exclusive:
+        for rr in current:
+            if is_system_record(rr):
+                continue
+            if rr['id'] not in kept_ids and rr['id'] not in deleted_ids:
+                deleted_ids.add(rr['id'])
+                deletes.append((client.delete_record, (domain, rr['id'])))
+                deleted.append(rr)
+
+    if not module.check_mode:
+        # deletions go first so that a record replaced by one of another
+        # type under the same name (e.g. a CNAME) does not conflict
+        run_calls(module, deletes, concurrency)
+        run_calls(module, writes, concurrency)
+
+    return bool(deletes or writes), results, deleted
+
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
@@ -145,16 +315,23 @@ def main():
             domain            = dict(required=False),
             record            = dict(required=False),
             record_ids        = dict(required=False, type='list'),
-            type              = dict(required=False, choices=['A', 'ALIAS', 'CNAME', 'MX', 'SPF', 'URL', 'TXT', 'NS', 'SRV', 'NAPTR', 'PTR', 'AAAA', 'SSHFP', 'HINFO', 'POOL']),
+            type              = dict(required=False, choices=RECORD_TYPES),
             ttl               = dict(required=False, default=3600, type='int'),
             value             = dict(required=False),
             priority          = dict(required=False, type='int'),
             state             = dict(required=False, choices=['present', 'absent']),
             solo              = dict(required=False, type='bool'),
+            records           = dict(required=False, type='list'),
+            exclusive         = dict(required=False, default='no', type='bool'),
+            concurrency       = dict(required=False, default=4, type='int'),
         ),
         required_together = (
             ['record', 'value']
         ),
+        mutually_exclusive = (
+            ['records', 'record'],
+            ['records', 'record_ids'],
+        ),
         supports_check_mode = True,
     )
 
@@ -172,6 +349,10 @@ def main():
     priority          = module.params.get('priority')
     state             = module.params.get('state')
     is_solo           = module.params.get('solo')
+    records           = module.params.get('records')
+
+    if records is not None and not domain:
+        module.fail_json(msg="domain is required when records is given")
 
     if account_email and account_api_token:
         client = DNSimple(email=account_email, api_token=account_api_token)
@@ -188,6 +369,12 @@ def main():
             domains = client.domains()
             module.exit_json(changed=False, result=[d['domain'] for d in domains])
 
+        # Domain & a list of records to reconcile
+        if domain and records:
+            changed, results, deleted = sync_records(module, client, str(domain), records, ttl,
+                                                     module.params.get('exclusive'), module.params.get('concurrency'))
+            module.exit_json(changed=changed, result=results, deleted=deleted)
+
         # Domain & No record
         if domain and record is None and not record_ids:
             domains = [d['domain'] for d in client.domains()]
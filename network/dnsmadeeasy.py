@@ -82,6 +82,35 @@ options:
     choices: ['yes', 'no']
     version_added: 1.5.1
 
+  records:
+    description:
+      - List of records to reconcile with the domain in a single task. Each item is a dictionary with the keys
+        C(record_name), C(record_type), C(record_value), C(record_ttl) (defaults to I(record_ttl)) and C(state)
+        (C(present) or C(absent), defaults to C(present)).
+      - The records of the domain are downloaded once and the creations, updates and deletions are computed
+        from that snapshot, then sent with up to C(concurrency) requests in flight. Requests refused because of
+        the API request limit are retried with an exponential backoff.
+      - All deletions complete before any creation or update is sent.
+      - Requires C(state=present). Mutually exclusive with I(record_name).
+    required: false
+    default: null
+    version_added: "2.2"
+
+  exclusive:
+    description:
+      - With C(records), delete every record of the domain that is not listed in C(records).
+    required: false
+    default: 'no'
+    choices: ['yes', 'no']
+    version_added: "2.2"
+
+  concurrency:
+    description:
+      - Maximum number of concurrent API requests used to apply the changes of C(records).
+    required: false
+    default: 4
+    version_added: "2.2"
+
 notes:
   - The DNS Made Easy service requires that machines interacting with the API have the proper time and timezone set. Be sure you are within a few seconds of actual time by using NTP. 
   - This module returns record(s) in the "result" element when 'state' is set to 'present'. This value can be be registered and used in your playbooks.
@@ -107,6 +136,18 @@ EXAMPLES = '''
   
 # delete a record / ensure it is absent
 - dnsmadeeasy: account_key=key account_secret=secret domain=my.com state=absent record_name="test"
+
+# make the records of the domain match a list
+- dnsmadeeasy:
+    account_key: key
+    account_secret: secret
+    domain: my.com
+    state: present
+    exclusive: yes
+    records:
+      - { record_name: "www", record_type: "A", record_value: "127.0.0.1" }
+      - { record_name: "", record_type: "MX", record_value: "10 mail.my.com." }
+      - { record_name: "old", record_type: "CNAME", state: "absent" }
 '''
 
 # ============================================
@@ -114,6 +155,8 @@ EXAMPLES = '''
 #
 
 import urllib
+import random
+import time
 
 IMPORT_ERROR = None
 try:
@@ -124,6 +167,10 @@ try:
 except ImportError, e:
     IMPORT_ERROR = str(e)
 
+# record types that can only have a single record per name
+SINGLE_VALUE_TYPES = ["A", "AAAA", "CNAME", "HTTPRED", "PTR"]
+MULTI_VALUE_TYPES = ["MX", "NS", "TXT", "SRV"]
+
 class DME2:
 
     def __init__(self, apikey, secret, domain, module):
@@ -159,19 +206,43 @@ class DME2:
     def _create_hash(self, rightnow):
         return hmac.new(self.secret.encode(), rightnow.encode(), hashlib.sha1).hexdigest()
 
-    def query(self, resource, method, data=None):
+    def _rateLimited(self, info):
+        # DNS Made Easy answers with a 400 once the request limit is reached
+        # and reports the remaining requests in the response headers
+        if info.get('x-dnsme-requestsremaining') == '0':
+            return True
+        return info['status'] == 400 and 'rate limit' in str(info.get('body', info.get('msg', ''))).lower()
+
+    def request(self, resource, method, data=None, retries=5):
+        # Does not call fail_json so it can be used from worker threads.
+        # Requests refused because of the rate limit are retried with an
+        # exponential backoff.
         url = self.baseurl + resource
         if data and not isinstance(data, basestring):
             data = urllib.urlencode(data)
 
-        response, info = fetch_url(self.module, url, data=data, method=method, headers=self._headers())
+        delay = 2
+        for attempt in range(retries + 1):
+            # the request is signed with the current time, so sign every attempt
+            response, info = fetch_url(self.module, url, data=data, method=method, headers=self._headers())
+            if info['status'] in (200, 201, 204) or attempt == retries or not self._rateLimited(info):
+                break
+            time.sleep(delay + random.uniform(0, delay))
+            delay = min(delay * 2, 60)
+
         if info['status'] not in (200, 201, 204):
-            self.module.fail_json(msg="%s returned %s, with body: %s" % (url, info['status'], info['msg']))
+            return None, "%s returned %s, with body: %s" % (url, info['status'], info['msg'])
 
         try:
-            return json.load(response)
+            return json.load(response), None
         except Exception, e:
-            return {}
+            return {}, None
+
+    def query(self, resource, method, data=None):
+        result, error = self.request(resource, method, data)
+        if error:
+            self.module.fail_json(msg=error)
+        return result
 
     def getDomain(self, domain_id):
         if not self.domain_map:
@@ -204,12 +275,12 @@ class DME2:
         if not self.all_records:
             self.all_records = self.getRecords()
 
-        if record_type in ["A", "AAAA", "CNAME", "HTTPRED", "PTR"]:
+        if record_type in SINGLE_VALUE_TYPES:
             for result in self.all_records:
                 if result['name'] == record_name and result['type'] == record_type:
                     return result
             return False
-        elif record_type in ["MX", "NS", "TXT", "SRV"]:
+        elif record_type in MULTI_VALUE_TYPES:
             for result in self.all_records:
                 if record_type == "MX":
                     value = record_value.split(" ")[1]
@@ -226,6 +297,136 @@ class DME2:
     def getRecords(self):
         return self.query(self.record_url, 'GET')['data']
 
+    # Key identifying a record, following the matching rules of
+    # getMatchingRecord: the value is only part of it for the types that
+    # allow several records with the same name.
+    def getRecordKey(self, record_name, record_type, value):
+        if record_type in MULTI_VALUE_TYPES:
+            return (record_name, record_type, value)
+        return (record_name, record_type)
+
+    def buildRecord(self, record_name, record_type, record_value, record_ttl):
+        new_record = {'name': record_name}
+        for key, value in [("value", record_value), ("type", record_type), ("ttl", record_ttl)]:
+            if not value is None:
+                new_record[key] = value
+        # Special handling for mx record
+        if new_record.get("type") == "MX":
+            new_record["mxLevel"] = new_record["value"].split(" ")[0]
+            new_record["value"] = new_record["value"].split(" ")[1]
+
+        # Special handling for SRV records
+        if new_record.get("type") == "SRV":
+            new_record["priority"] = new_record["value"].split(" ")[0]
+            new_record["weight"] = new_record["value"].split(" ")[1]
+            new_record["port"] = new_record["value"].split(" ")[2]
+            new_record["value"] = new_record["value"].split(" ")[3]
+        return new_record
+
+    def recordChanged(self, current_record, new_record):
+        for i in new_record:
+            if str(current_record.get(i)) != str(new_record[i]):
+                return True
+        return False
+
+    # Declaratively reconcile a list of records with the domain: the records
+    # are downloaded once, indexed by (name, type, value) and only the
+    # required creations, updates and deletions are sent, concurrently.
+    # Deletions all finish before any write starts, so that a record can be
+    # replaced by one of another type under the same name.
+    def syncRecords(self, records, record_ttl, exclusive, concurrency):
+        if not self.all_records:
+            self.all_records = self.getRecords()
+
+        index = {}
+        for record in self.all_records:
+            index.setdefault(self.getRecordKey(record['name'], record['type'], record['value']), record)
+
+        deletes = []
+        writes = []
+        results = []
+        wanted_ids = set()
+        deleted_ids = set()
+        for item in records:
+            record_name = item.get('record_name')
+            record_type = item.get('record_type')
+            record_value = item.get('record_value')
+            state = item.get('state', 'present')
+            if record_name is None or record_type not in SINGLE_VALUE_TYPES + MULTI_VALUE_TYPES:
+                self.module.fail_json(msg="Each item of records needs a record_name and a supported record_type")
+            if state not in ('present', 'absent'):
+                self.module.fail_json(msg="'%s' is an unknown value for the state of record '%s'" % (state, record_name))
+            if state == 'present' and record_value is None:
+                self.module.fail_json(msg="A record_value is required for record '%s'" % record_name)
+
+            result = {'record_name': record_name, 'record_type': record_type, 'state': state, 'changed': False}
+            results.append(result)
+
+            # absent items without a value are matched on name and type only
+            current_record = None
+            if record_value is not None:
+                new_record = self.buildRecord(record_name, record_type, record_value, item.get('record_ttl', record_ttl))
+                current_record = index.get(self.getRecordKey(record_name, record_type, new_record.get('value')))
+
+            if state == 'absent':
+                if record_value is None:
+                    matches = [r for r in self.all_records if r['name'] == record_name and r['type'] == record_type]
+                elif current_record:
+                    matches = [current_record]
+                else:
+                    matches = []
+                for record in matches:
+                    if record['id'] not in deleted_ids:
+                        deleted_ids.add(record['id'])
+                        deletes.append((self.record_url + '/' + str(record['id']), 'DELETE', None))
+                        result['changed'] = True
+            elif current_record:
+                wanted_ids.add(current_record['id'])
+                if self.recordChanged(current_record, new_record):
+                    new_record['id'] = str(current_record['id'])
+                    writes.append((self.record_url + '/' + str(current_record['id']), 'PUT', self.prepareRecord(new_record)))
+                    result['changed'] = True
+            else:
+                writes.append((self.record_url, 'POST', self.prepareRecord(new_record)))
+                result['changed'] = True
+
+        # remove every other record of the domain
+        deleted = []
+        if exclusive:
+            for record in self.all_records:
+                if record['id'] not in wanted_ids and record['id'] not in deleted_ids:
+                    deleted_ids.add(record['id'])
+                    deletes.append((self.record_url + '/' + str(record['id']), 'DELETE', None))
+                    deleted.append({'record_name': record['name'], 'record_type': record['type'], 'value': record['value']})
+
+        self.applyRequests(deletes, concurrency)
+        self.applyRequests(writes, concurrency)
+        return bool(deletes or writes), results, deleted
+
+    def applyRequests(self, calls, concurrency):
+        if not calls:
+            return []
+        responses = None
+        if len(calls) > 1 and concurrency > 1:
+            try:
+                # multiprocessing is only available from python 2.6 on
+                from multiprocessing.pool import ThreadPool
+            except ImportError:
+                pass
+            else:
+                pool = ThreadPool(min(concurrency, len(calls)))
+                try:
+                    responses = pool.map(lambda call: self.request(*call), calls)
+                finally:
+                    pool.close()
+                    pool.join()
+        if responses is None:
+            responses = [self.request(*call) for call in calls]
+        errors = [error for result, error in responses if error]
+        if errors:
+            self.module.fail_json(msg="%d of %d requests failed: %s" % (len(errors), len(calls), "; ".join(errors)))
+        return [result for result, error in responses]
+
     def _instMap(self, type):
         #@TODO cache this call so it's executed only once per ansible execution
         map = {}
@@ -275,10 +476,16 @@ def main():
             record_value=dict(required=False),
             record_ttl=dict(required=False, default=1800, type='int'),
             validate_certs = dict(default='yes', type='bool'),
+            records=dict(required=False, type='list'),
+            exclusive=dict(default='no', type='bool'),
+            concurrency=dict(required=False, default=4, type='int'),
         ),
         required_together=(
             ['record_value', 'record_ttl', 'record_type']
-        )
+        ),
+        mutually_exclusive=[
+            ['records', 'record_name']
+        ]
     )
 
     if IMPORT_ERROR:
@@ -291,6 +498,14 @@ def main():
     record_type = module.params["record_type"]
     record_value = module.params["record_value"]
 
+    # Reconcile a list of records in one pass
+    if module.params["records"]:
+        if state == 'absent':
+            module.fail_json(msg="records can only be used with state=present, set the state of each record instead")
+        changed, results, deleted = DME.syncRecords(module.params["records"], module.params["record_ttl"],
+                                                    module.params["exclusive"], module.params["concurrency"])
+        module.exit_json(changed=changed, result=results, deleted=deleted)
+
     # Follow Keyword Controlled Behavior
     if record_name is None:
         domain_records = DME.getRecords()
@@ -301,28 +516,12 @@ def main():
 
     # Fetch existing record + Build new one
     current_record = DME.getMatchingRecord(record_name, record_type, record_value)
-    new_record = {'name': record_name}
-    for i in ["record_value", "record_type", "record_ttl"]:
-        if not module.params[i] is None:
-            new_record[i[len("record_"):]] = module.params[i]
-    # Special handling for mx record
-    if new_record["type"] == "MX":
-        new_record["mxLevel"] = new_record["value"].split(" ")[0]
-        new_record["value"] = new_record["value"].split(" ")[1]
-
-    # Special handling for SRV records
-    if new_record["type"] == "SRV":
-        new_record["priority"] = new_record["value"].split(" ")[0]
-        new_record["weight"] = new_record["value"].split(" ")[1]
-        new_record["port"] = new_record["value"].split(" ")[2]
-        new_record["value"] = new_record["value"].split(" ")[3]
+    new_record = DME.buildRecord(record_name, record_type, record_value, module.params["record_ttl"])
 
     # Compare new record against existing one
     changed = False
     if current_record:
-        for i in new_record:
-            if str(current_record[i]) != str(new_record[i]):
-                changed = True
+        changed = DME.recordChanged(current_record, new_record)
         new_record['id'] = str(current_record['id'])
 
     # Follow Keyword Controlled Behavior